@@ -0,0 +1,177 @@
+"""initial schema
+
+建立迁移前由 create_all 生成的基线表结构。已有数据库中存在的表会被跳过，
+因此旧库可以直接执行 upgrade 接入迁移体系。
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_initial_schema'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'users' not in existing:
+        op.create_table(
+            'users',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('username', sa.String(), nullable=True),
+            sa.Column('email', sa.String(), nullable=True),
+            sa.Column('hashed_password', sa.String(), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.Column('is_superuser', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_users_id', 'users', ['id'])
+        op.create_index('ix_users_username', 'users', ['username'], unique=True)
+        op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    if 'projects' not in existing:
+        op.create_table(
+            'projects',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(), nullable=True),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('start_date', sa.DateTime(), nullable=True),
+            sa.Column('end_date', sa.DateTime(), nullable=True),
+            sa.Column('status', sa.String(), nullable=True),
+            sa.Column('fixed_cost_monthly', sa.Float(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_projects_id', 'projects', ['id'])
+        op.create_index('ix_projects_name', 'projects', ['name'])
+
+    if 'team_members' not in existing:
+        op.create_table(
+            'team_members',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(), nullable=True),
+            sa.Column('role', sa.String(), nullable=True),
+            sa.Column('monthly_salary', sa.Float(), nullable=True),
+            sa.Column('join_date', sa.DateTime(), nullable=True),
+            sa.Column('leave_date', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_team_members_id', 'team_members', ['id'])
+
+    if 'sprints' not in existing:
+        op.create_table(
+            'sprints',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('project_id', sa.Integer(), nullable=True),
+            sa.Column('name', sa.String(), nullable=True),
+            sa.Column('start_date', sa.DateTime(), nullable=True),
+            sa.Column('end_date', sa.DateTime(), nullable=True),
+            sa.Column('status', sa.String(), nullable=True),
+            sa.Column('velocity', sa.Float(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_sprints_id', 'sprints', ['id'])
+
+    if 'project_members' not in existing:
+        op.create_table(
+            'project_members',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('project_id', sa.Integer(), nullable=True),
+            sa.Column('member_id', sa.Integer(), nullable=True),
+            sa.Column('allocation_percentage', sa.Float(), nullable=True),
+            sa.Column('start_date', sa.DateTime(), nullable=True),
+            sa.Column('end_date', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+            sa.ForeignKeyConstraint(['member_id'], ['team_members.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_project_members_id', 'project_members', ['id'])
+
+    if 'tasks' not in existing:
+        op.create_table(
+            'tasks',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('project_id', sa.Integer(), nullable=True),
+            sa.Column('sprint_id', sa.Integer(), nullable=True),
+            sa.Column('title', sa.String(), nullable=True),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('status', sa.String(), nullable=True),
+            sa.Column('priority', sa.String(), nullable=True),
+            sa.Column('assignee_id', sa.Integer(), nullable=True),
+            sa.Column('estimated_hours', sa.Float(), nullable=True),
+            sa.Column('actual_hours', sa.Float(), nullable=True),
+            sa.Column('due_date', sa.DateTime(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+            sa.ForeignKeyConstraint(['sprint_id'], ['sprints.id']),
+            sa.ForeignKeyConstraint(['assignee_id'], ['team_members.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_tasks_id', 'tasks', ['id'])
+
+    if 'cost_records' not in existing:
+        op.create_table(
+            'cost_records',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('project_id', sa.Integer(), nullable=True),
+            sa.Column('record_date', sa.DateTime(), nullable=True),
+            sa.Column('cost_type', sa.String(), nullable=True),
+            sa.Column('amount', sa.Float(), nullable=True),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_cost_records_id', 'cost_records', ['id'])
+
+    if 'activities' not in existing:
+        op.create_table(
+            'activities',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=True),
+            sa.Column('type', sa.String(), nullable=True),
+            sa.Column('content', sa.String(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+        )
+        op.create_index('ix_activities_id', 'activities', ['id'])
+
+    if 'project_task_stats' not in existing:
+        op.create_table(
+            'project_task_stats',
+            sa.Column('project_id', sa.Integer(), nullable=False),
+            sa.Column('status', sa.String(), nullable=False),
+            sa.Column('task_count', sa.Integer(), nullable=False),
+            sa.Column('estimated_hours', sa.Float(), nullable=False),
+            sa.Column('actual_hours', sa.Float(), nullable=False),
+            sa.ForeignKeyConstraint(['project_id'], ['projects.id']),
+            sa.PrimaryKeyConstraint('project_id', 'status'),
+        )
+
+
+def downgrade():
+    op.drop_table('project_task_stats')
+    op.drop_table('activities')
+    op.drop_table('cost_records')
+    op.drop_table('tasks')
+    op.drop_table('project_members')
+    op.drop_table('sprints')
+    op.drop_table('team_members')
+    op.drop_table('projects')
+    op.drop_table('users')
@@ -0,0 +1,56 @@
+"""hot filter indexes
+
+为各路由的过滤、排序、关联列补充索引：
+
+- tasks(project_id, id)：按项目分页读取任务
+- tasks(project_id, status)：按项目、状态汇总任务
+- tasks(sprint_id)：迭代任务列表；删除迭代时解除任务关联
+- tasks(assignee_id)：删除团队成员时解除任务关联
+- sprints(project_id)：项目迭代列表
+- project_members(project_id)：项目成员列表
+- project_members(member_id)：删除团队成员时解除成员关联
+- cost_records(project_id, record_date, cost_type)：项目成本、月度成本、成本统计
+- activities(created_at, id)：活动流 keyset 分页
+
+Revision ID: 0002_hot_filter_indexes
+Revises: 0001_initial_schema
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_hot_filter_indexes'
+down_revision = '0001_initial_schema'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_tasks_project_id_id', 'tasks', ['project_id', 'id']),
+    ('ix_tasks_project_id_status', 'tasks', ['project_id', 'status']),
+    ('ix_tasks_sprint_id', 'tasks', ['sprint_id']),
+    ('ix_tasks_assignee_id', 'tasks', ['assignee_id']),
+    ('ix_sprints_project_id', 'sprints', ['project_id']),
+    ('ix_project_members_project_id', 'project_members', ['project_id']),
+    ('ix_project_members_member_id', 'project_members', ['member_id']),
+    ('ix_cost_records_project_id_record_date_cost_type', 'cost_records',
+     ['project_id', 'record_date', 'cost_type']),
+    ('ix_activities_created_at_id', 'activities', ['created_at', 'id']),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for name, table, columns in INDEXES:
+        # 早期由 create_all 建立的库可能已经带有部分索引
+        if name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+    # 让查询规划器获得新索引的统计信息
+    op.execute('ANALYZE')
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
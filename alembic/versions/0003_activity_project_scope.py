@@ -0,0 +1,128 @@
+"""activity project scope
+
+为活动记录增加结构化的 project_id、entity_type、entity_id 列及
+(project_id, created_at) 索引，项目活动流不再按项目名称 LIKE 全表扫描。
+
+已有活动按内容模板解析出对象名称，再按名称回填所属项目与对象；
+名称对应多个对象（重名）或已无对应对象时保持为空，不做猜测。
+
+Revision ID: 0003_activity_project_scope
+Revises: 0002_hot_filter_indexes
+Create Date: 2026-10-18 00:00:00
+
+"""
+import re
+from collections import defaultdict
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_activity_project_scope'
+down_revision = '0002_hot_filter_indexes'
+branch_labels = None
+depends_on = None
+
+# 活动类型 -> (对象类型, 从内容中取出对象当前名称的正则)
+CONTENT_PATTERNS = {
+    'project_created': ('project', re.compile(r'^创建了项目 "(.*)"$')),
+    'project_updated': ('project', re.compile(r'^将项目名称从 ".*" 更新为 "(.*)"$')),
+    'sprint_created': ('sprint', re.compile(r'^创建了迭代 "(.*)"$')),
+    'sprint_updated': ('sprint', re.compile(r'^将迭代名称从 ".*" 更新为 "(.*)"$')),
+    'task_created': ('task', re.compile(r'^创建了任务 "(.*)"$')),
+    'task_updated': ('task', re.compile(r'^将任务 "(.*)" 状态更新为 ".*"$')),
+}
+
+activities = sa.table(
+    'activities',
+    sa.column('id', sa.Integer),
+    sa.column('type', sa.String),
+    sa.column('content', sa.String),
+    sa.column('project_id', sa.Integer),
+    sa.column('entity_type', sa.String),
+    sa.column('entity_id', sa.Integer),
+)
+
+
+def _entities_by_name(bind):
+    """
+    按对象类型建立 名称 -> [(对象ID, 项目ID)] 映射
+    """
+    queries = {
+        'project': 'SELECT name, id, id FROM projects',
+        'sprint': 'SELECT name, id, project_id FROM sprints',
+        'task': 'SELECT title, id, project_id FROM tasks',
+    }
+    entities = {}
+    for entity_type, query in queries.items():
+        by_name = defaultdict(list)
+        for name, entity_id, project_id in bind.execute(sa.text(query)):
+            by_name[name].append((entity_id, project_id))
+        entities[entity_type] = by_name
+    return entities
+
+
+def _backfill(bind):
+    entities = _entities_by_name(bind)
+    rows = bind.execute(
+        sa.select(activities.c.id, activities.c.type, activities.c.content)
+        .where(activities.c.project_id.is_(None))
+    ).all()
+
+    updates = []
+    for activity_id, activity_type, content in rows:
+        if activity_type not in CONTENT_PATTERNS or content is None:
+            continue
+        entity_type, pattern = CONTENT_PATTERNS[activity_type]
+        match = pattern.match(content)
+        if not match:
+            continue
+        candidates = entities[entity_type].get(match.group(1), [])
+        if len(candidates) != 1:
+            continue
+        entity_id, project_id = candidates[0]
+        updates.append({
+            'activity_id': activity_id,
+            'project_id': project_id,
+            'entity_type': entity_type,
+            'entity_id': entity_id,
+        })
+
+    if updates:
+        bind.execute(
+            activities.update()
+            .where(activities.c.id == sa.bindparam('activity_id'))
+            .values(
+                project_id=sa.bindparam('project_id'),
+                entity_type=sa.bindparam('entity_type'),
+                entity_id=sa.bindparam('entity_id'),
+            ),
+            updates,
+        )
+
+
+def upgrade():
+    with op.batch_alter_table('activities') as batch_op:
+        batch_op.add_column(sa.Column('project_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('entity_type', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('entity_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_activities_project_id_projects', 'projects', ['project_id'], ['id']
+        )
+
+    _backfill(op.get_bind())
+
+    op.create_index(
+        'ix_activities_project_id_created_at', 'activities', ['project_id', 'created_at']
+    )
+    op.execute('ANALYZE activities')
+
+
+def downgrade():
+    op.drop_index('ix_activities_project_id_created_at', table_name='activities')
+    with op.batch_alter_table('activities') as batch_op:
+        batch_op.drop_constraint('fk_activities_project_id_projects', type_='foreignkey')
+        batch_op.drop_column('entity_id')
+        batch_op.drop_column('entity_type')
+        batch_op.drop_column('project_id')
@@ -0,0 +1,46 @@
+"""cost imports
+
+成本记录批量导入的批次表，按文件内容哈希去重并记录导入进度。
+
+Revision ID: 0004_cost_imports
+Revises: 0003_activity_project_scope
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_cost_imports'
+down_revision = '0003_activity_project_scope'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'cost_imports',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(), nullable=True),
+        sa.Column('content_hash', sa.String(), nullable=True),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('total_rows', sa.Integer(), nullable=True),
+        sa.Column('processed_rows', sa.Integer(), nullable=True),
+        sa.Column('imported_rows', sa.Integer(), nullable=True),
+        sa.Column('failed_rows', sa.Integer(), nullable=True),
+        sa.Column('errors', sa.Text(), nullable=True),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_cost_imports_id', 'cost_imports', ['id'])
+    op.create_index('ix_cost_imports_content_hash', 'cost_imports', ['content_hash'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_cost_imports_content_hash', table_name='cost_imports')
+    op.drop_index('ix_cost_imports_id', table_name='cost_imports')
+    op.drop_table('cost_imports')
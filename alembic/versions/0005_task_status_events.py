@@ -0,0 +1,53 @@
+"""task status events
+
+任务状态变更事件表，供累积流图与周期时间统计使用。
+
+已有任务没有状态历史，按当前状态在创建时间补一条进入事件，
+使累积流图包含这些任务；迁移前的状态变更不做推断，这些任务没有周期时间。
+
+Revision ID: 0005_task_status_events
+Revises: 0004_cost_imports
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_task_status_events'
+down_revision = '0004_cost_imports'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'task_status_events',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=True),
+        sa.Column('sprint_id', sa.Integer(), nullable=True),
+        sa.Column('from_status', sa.String(), nullable=True),
+        sa.Column('to_status', sa.String(), nullable=True),
+        sa.Column('at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+    op.execute(
+        "INSERT INTO task_status_events (task_id, project_id, sprint_id, from_status, to_status, at) "
+        "SELECT id, project_id, sprint_id, NULL, status, COALESCE(created_at, CURRENT_TIMESTAMP) "
+        "FROM tasks ORDER BY created_at, id"
+    )
+
+    op.create_index('ix_task_status_events_project_id_at', 'task_status_events', ['project_id', 'at'])
+    op.create_index('ix_task_status_events_sprint_id_at', 'task_status_events', ['sprint_id', 'at'])
+    op.create_index('ix_task_status_events_task_id_at', 'task_status_events', ['task_id', 'at'])
+    op.execute('ANALYZE task_status_events')
+
+
+def downgrade():
+    op.drop_index('ix_task_status_events_task_id_at', table_name='task_status_events')
+    op.drop_index('ix_task_status_events_sprint_id_at', table_name='task_status_events')
+    op.drop_index('ix_task_status_events_project_id_at', table_name='task_status_events')
+    op.drop_table('task_status_events')
@@ -0,0 +1,38 @@
+"""data versions
+
+按表记录的数据版本号，写事务提交时递增，用于生成读接口的 ETag。
+
+Revision ID: 0006_data_versions
+Revises: 0005_task_status_events
+Create Date: 2026-10-18 00:00:00
+
+"""
+import secrets
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_data_versions'
+down_revision = '0005_task_status_events'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'data_versions',
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    # 数据库标识：重建数据库后版本号从 0 开始，ETag 仍与旧库不同
+    op.bulk_insert(
+        sa.table('data_versions', sa.column('name', sa.String()), sa.column('version', sa.Integer())),
+        [{'name': '_epoch', 'version': secrets.randbelow(2 ** 31)}]
+    )
+
+
+def downgrade():
+    op.drop_table('data_versions')
@@ -0,0 +1,34 @@
+"""status event hours
+
+任务状态事件记录事件发生时任务的预估工时，燃尽图按此计算，
+任务删除或修改预估工时后历史迭代的燃尽图不再变化。
+
+已有事件按任务当前的预估工时回填；已删除任务的事件无法回填，工时为空（计为 0）。
+
+Revision ID: 0007_status_event_hours
+Revises: 0006_data_versions
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_status_event_hours'
+down_revision = '0006_data_versions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('task_status_events', sa.Column('estimated_hours', sa.Float(), nullable=True))
+    op.execute(
+        "UPDATE task_status_events SET estimated_hours = "
+        "(SELECT tasks.estimated_hours FROM tasks WHERE tasks.id = task_status_events.task_id)"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('task_status_events') as batch_op:
+        batch_op.drop_column('estimated_hours')
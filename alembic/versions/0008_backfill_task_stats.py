@@ -0,0 +1,40 @@
+"""backfill task stats
+
+从任务表重建 project_task_stats 汇总表。汇总表在 0001 中建立时为空，
+而统计接口只读汇总表，已有任务的旧库升级后统计全为 0。
+按 (project_id, COALESCE(status, '')) 分组，与 app.db.rebuild_statistics 的结果一致。
+
+Revision ID: 0008_backfill_task_stats
+Revises: 0007_status_event_hours
+Create Date: 2026-10-18 00:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_backfill_task_stats'
+down_revision = '0007_status_event_hours'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('DELETE FROM project_task_stats')
+    op.execute(
+        "INSERT INTO project_task_stats (project_id, status, task_count, estimated_hours, actual_hours) "
+        "SELECT tasks.project_id, COALESCE(tasks.status, ''), COUNT(tasks.id), "
+        "COALESCE(SUM(tasks.estimated_hours), 0.0), COALESCE(SUM(tasks.actual_hours), 0.0) "
+        "FROM tasks JOIN projects ON projects.id = tasks.project_id "
+        "GROUP BY tasks.project_id, COALESCE(tasks.status, '')"
+    )
+    # 汇总表内容变化，使依赖它的 ETag 失效
+    op.execute(
+        "INSERT INTO data_versions (name, version) VALUES ('project_task_stats', 1) "
+        "ON CONFLICT (name) DO UPDATE SET version = version + 1"
+    )
+
+
+def downgrade():
+    # 只回填数据，汇总表由 0001 建立，无需回退
+    pass
@@ -0,0 +1,67 @@
+from anyio import to_thread
+from fastapi import APIRouter, Response
+
+from app.core.activity_journal import activity_journal
+from app.core.cost_cache import monthly_cost_cache
+from app.core.metrics import CONTENT_TYPE, MetricsWriter, request_metrics
+from app.core.password_executor import password_executor
+from app.core.principal_cache import principal_cache
+from app.core.sprint_cache import sprint_burndown_cache
+from app.db.pool_metrics import write_pool_metrics
+
+router = APIRouter()
+
+def _write_runtime_metrics(writer: MetricsWriter) -> None:
+    """
+    导出线程池、密码哈希线程池、缓存和活动日志队列的当前状态
+    """
+    # anyio 默认线程池（同步路由、run_in_threadpool）的容量限制器，必须在事件循环中读取
+    limiter = to_thread.current_default_thread_limiter()
+    writer.metric("threadpool_threads_busy", "gauge", "Worker threads in use by the anyio default thread pool",
+                  [((), limiter.borrowed_tokens)])
+    writer.metric("threadpool_threads_total", "gauge", "Capacity of the anyio default thread pool",
+                  [((), limiter.total_tokens)])
+    writer.metric("threadpool_tasks_waiting", "gauge", "Tasks waiting for an anyio worker thread",
+                  [((), limiter.statistics().tasks_waiting)])
+
+    writer.metric("password_hash_queue_depth", "gauge", "bcrypt tasks running or queued",
+                  [((), password_executor.queue_depth)])
+    writer.metric("password_hash_workers", "gauge", "bcrypt executor worker threads",
+                  [((), password_executor.max_workers)])
+    writer.metric("password_hash_rejected_total", "counter", "bcrypt tasks rejected because the queue was full",
+                  [((), password_executor.rejected)])
+
+    caches = [
+        ("auth", principal_cache.stats()),
+        ("monthly_cost", monthly_cost_cache.stats()),
+        ("sprint_burndown", sprint_burndown_cache.stats()),
+    ]
+    writer.metric("cache_hits_total", "counter", "Cache hits",
+                  [((("cache", name),), stats["hits"]) for name, stats in caches])
+    writer.metric("cache_misses_total", "counter", "Cache misses",
+                  [((("cache", name),), stats["misses"]) for name, stats in caches])
+    writer.metric("cache_entries", "gauge", "Entries currently cached",
+                  [((("cache", name),), stats["size"]) for name, stats in caches])
+
+    writer.metric("activity_journal_queue_depth", "gauge", "Activity records waiting to be written",
+                  [((), activity_journal.queue_depth)])
+    writer.metric("activity_journal_flushes_total", "counter", "Activity journal flushes",
+                  [((), activity_journal.flushes)])
+    writer.metric("activity_journal_failed_flushes_total", "counter", "Activity journal flushes that failed",
+                  [((), activity_journal.failed_flushes)])
+
+@router.get("/metrics", include_in_schema=False)
+async def read_metrics() -> Response:
+    """
+    以 Prometheus 文本格式导出运行时指标
+
+    指标为进程级，多进程部署时每个工作进程分别抓取。
+
+    Returns:
+        Response: Prometheus 文本格式的指标
+    """
+    writer = MetricsWriter()
+    request_metrics.write(writer)
+    write_pool_metrics(writer)
+    _write_runtime_metrics(writer)
+    return Response(writer.text(), media_type=CONTENT_TYPE)
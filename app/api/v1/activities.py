@@ -1,37 +1,64 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from typing import Any, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_active_user
+from app.core.activity_journal import activity_journal
+from app.core.deps import Principal, get_current_active_superuser, get_current_active_user
+from app.core.etag import conditional_get
+from app.core.responses import fast_json
 from app.db.session import get_db
 from app.models import models
 from app.schemas import schemas
+from app.crud.listing import list_query, row_dicts
+from app.crud.pagination import paginate, set_next_cursor
 
 router = APIRouter()
 
 @router.post("/", response_model=schemas.Activity)
-def create_activity(
+async def create_activity(
     activity: schemas.ActivityCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     db_activity = models.Activity(**activity.dict())
     db.add(db_activity)
-    db.commit()
-    db.refresh(db_activity)
+    await db.commit()
+    await db.refresh(db_activity)
     return db_activity
 
-@router.get("/", response_model=List[schemas.Activity])
-def read_activities(
+@router.get(
+    "/",
+    response_model=List[schemas.Activity],
+    dependencies=[Depends(conditional_get("activities"))]
+)
+async def read_activities(
+    response: Response,
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    activities = db.query(models.Activity)\
-        .order_by(desc(models.Activity.created_at))\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
-    return activities 
\ No newline at end of file
+    # 按 (created_at, id) 倒序，保证同一时间的活动也有稳定顺序
+    order = [models.Activity.created_at, models.Activity.id]
+    result = await db.execute(
+        paginate(list_query(models.Activity, schemas.Activity), order, cursor, skip, limit, descending=True)
+    )
+    rows = result.all()
+    set_next_cursor(response, rows, order, limit)
+    return fast_json(row_dicts(rows), response)
+
+@router.get("/journal-stats")
+def read_activity_journal_stats(
+    current_user: Principal = Depends(get_current_active_superuser)
+) -> Any:
+    """
+    获取活动日志的写入队列深度与刷新耗时
+
+    Args:
+        current_user: 当前超级用户
+
+    Returns:
+        Any: 写入模式、队列深度、刷新次数与耗时统计
+    """
+    return activity_journal.stats()
@@ -0,0 +1,48 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.core.deps import Principal, get_current_active_superuser
+from app.db.sql_profile import sql_profiler
+
+router = APIRouter()
+
+@router.get("/sql-profile")
+def read_sql_profile(
+    top: int = 20,
+    order_by: str = "total",
+    current_user: Principal = Depends(get_current_active_superuser)
+) -> Any:
+    """
+    获取启动（或上次重置）以来的 SQL 剖析结果
+
+    Args:
+        top: 返回的指纹数
+        order_by: 排序统计项：total、calls、mean、p95、max、rows
+        current_user: 当前超级用户
+
+    Returns:
+        Any: 前 N 个语句指纹的调用次数、耗时分位数、返回行数，以及最近的慢查询
+    """
+    if top < 1:
+        raise HTTPException(status_code=400, detail="top must be positive")
+    try:
+        return sql_profiler.top(top, order_by)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@router.delete("/sql-profile")
+def reset_sql_profile(
+    current_user: Principal = Depends(get_current_active_superuser)
+) -> Any:
+    """
+    清空 SQL 剖析统计和慢查询记录
+
+    Args:
+        current_user: 当前超级用户
+
+    Returns:
+        Any: 操作结果
+    """
+    sql_profiler.reset()
+    return {"message": "SQL profile reset"}
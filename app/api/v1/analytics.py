@@ -0,0 +1,55 @@
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import Principal, get_current_active_user
+from app.db.session import get_db
+from app.models import models
+from app.schemas import schemas
+from app.crud import task_events
+
+router = APIRouter()
+
+async def _check_scope(db: AsyncSession, project_id: Optional[int], sprint_id: Optional[int]) -> None:
+    if (project_id is None) == (sprint_id is None):
+        raise HTTPException(status_code=400, detail="Exactly one of project_id and sprint_id is required")
+    if project_id is not None:
+        result = await db.execute(select(models.Project.id).where(models.Project.id == project_id))
+        if result.first() is None:
+            raise HTTPException(status_code=404, detail="Project not found")
+    else:
+        result = await db.execute(select(models.Sprint.id).where(models.Sprint.id == sprint_id))
+        if result.first() is None:
+            raise HTTPException(status_code=404, detail="Sprint not found")
+
+@router.get("/cumulative-flow", response_model=schemas.CumulativeFlow)
+async def read_cumulative_flow(
+    start_date: datetime,
+    end_date: datetime,
+    project_id: Optional[int] = None,
+    sprint_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    await _check_scope(db, project_id, sprint_id)
+    try:
+        return await task_events.cumulative_flow(db, start_date, end_date, project_id, sprint_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@router.get("/cycle-time", response_model=schemas.CycleTimeReport)
+async def read_cycle_time(
+    start_date: datetime,
+    end_date: datetime,
+    project_id: Optional[int] = None,
+    sprint_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    await _check_scope(db, project_id, sprint_id)
+    try:
+        return await task_events.cycle_times(db, start_date, end_date, project_id, sprint_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
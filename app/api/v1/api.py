@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1 import projects, sprints, team_members, tasks, costs, auth, statistics, activities
+from app.api.v1 import projects, sprints, team_members, tasks, costs, auth, statistics, activities, export, analytics, admin
 
 api_router = APIRouter()
 
@@ -11,4 +11,7 @@ api_router.include_router(team_members.router, prefix="/team-members", tags=["te
 api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
 api_router.include_router(costs.router, prefix="/costs", tags=["costs"])
 api_router.include_router(statistics.router, prefix="/statistics", tags=["statistics"])
-api_router.include_router(activities.router, prefix="/activities", tags=["activities"]) 
\ No newline at end of file
+api_router.include_router(activities.router, prefix="/activities", tags=["activities"])
+api_router.include_router(export.router, prefix="/export", tags=["export"])
+api_router.include_router(analytics.router, prefix="/analytics", tags=["analytics"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
@@ -1,13 +1,15 @@
 from datetime import timedelta
-from typing import Any
+from typing import Any, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 from app.core import security
 from app.core.config import settings
-from app.core.deps import get_db
+from app.core.deps import Principal, get_current_active_superuser, get_db
+from app.core.principal_cache import principal_cache
 from app.models import models
 from app.schemas import schemas
 
@@ -17,14 +19,22 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+async def _get_user_by(db: AsyncSession, column, value) -> Optional[models.User]:
+    result = await db.execute(select(models.User).where(column == value))
+    return result.scalars().first()
+
 @router.post("/login", response_model=schemas.Token)
-def login(
-    db: Session = Depends(get_db),
+async def login(
+    db: AsyncSession = Depends(get_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     用户登录
 
+    bcrypt 验证在独立的密码哈希线程池中执行；若存储的哈希成本与当前配置不同，
+    验证成功后透明地按新成本重新哈希。查询用户后即结束事务、归还唯一的写连接，
+    验证期间不阻塞其他写请求；只有需要保存新哈希时才另开一个短写事务。
+
     Args:
         db: 数据库会话
         form_data: 登录表单数据
@@ -33,21 +43,11 @@ def login(
         Any: 访问令牌
 
     Raises:
-        HTTPException: 认证失败
+        HTTPException: 认证失败，或密码哈希线程池已满（503）
     """
     logger.debug(f"Login attempt for username: {form_data.username}")
     
-    # 打印所有用户
-    all_users = db.query(models.User).all()
-    logger.debug(f"All users in database: {[u.username for u in all_users]}")
-    
-    # 尝试直接使用SQL查询
-    from sqlalchemy import text
-    result = db.execute(text("SELECT username FROM users WHERE username = :username"), 
-                       {"username": form_data.username})
-    logger.debug(f"SQL query result: {result.fetchall()}")
-    
-    user = db.query(models.User).filter(models.User.username == form_data.username).first()
+    user = await _get_user_by(db, models.User.username, form_data.username)
     if not user:
         logger.warning(f"User not found: {form_data.username}")
         raise HTTPException(
@@ -55,10 +55,13 @@ def login(
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    db.expunge(user)
+    await db.rollback()
     
-    logger.debug(f"User found: {user.username}, is_active: {user.is_active}")
-    
-    if not security.verify_password(form_data.password, user.hashed_password):
+    verified, new_hash = await security.verify_and_update_password(
+        form_data.password, user.hashed_password
+    )
+    if not verified:
         logger.warning(f"Invalid password for user: {form_data.username}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -70,6 +73,13 @@ def login(
         logger.warning(f"Inactive user: {form_data.username}")
         raise HTTPException(status_code=400, detail="Inactive user")
     
+    if new_hash:
+        # 哈希成本已变化，按当前配置重新哈希
+        logger.info(f"Rehashing password for user: {form_data.username}")
+        db.add(user)
+        user.hashed_password = new_hash
+        await db.commit()
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
         subject=user.username, expires_delta=access_token_expires
@@ -79,14 +89,16 @@ def login(
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/register", response_model=schemas.User)
-def register(
+async def register(
     *,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     user_in: schemas.UserCreate,
 ) -> Any:
     """
     用户注册
 
+    密码在访问数据库之前哈希，bcrypt 计算期间不占用写连接。
+
     Args:
         db: 数据库会话
         user_in: 用户创建数据
@@ -95,15 +107,16 @@ def register(
         Any: 创建的用户
 
     Raises:
-        HTTPException: 用户名或邮箱已存在
+        HTTPException: 用户名或邮箱已存在，或密码哈希线程池已满（503）
     """
-    user = db.query(models.User).filter(models.User.username == user_in.username).first()
+    hashed_password = await security.get_password_hash_async(user_in.password)
+    user = await _get_user_by(db, models.User.username, user_in.username)
     if user:
         raise HTTPException(
             status_code=400,
             detail="The user with this username already exists in the system.",
         )
-    user = db.query(models.User).filter(models.User.email == user_in.email).first()
+    user = await _get_user_by(db, models.User.email, user_in.email)
     if user:
         raise HTTPException(
             status_code=400,
@@ -112,26 +125,46 @@ def register(
     user = models.User(
         username=user_in.username,
         email=user_in.email,
-        hashed_password=security.get_password_hash(user_in.password),
+        hashed_password=hashed_password,
         is_active=user_in.is_active,
         is_superuser=user_in.is_superuser,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 @router.get("/me", response_model=schemas.User)
-def read_users_me(
-    current_user: models.User = Depends(security.get_current_user)
+async def read_users_me(
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(security.get_current_user)
 ) -> Any:
     """
     获取当前用户信息
 
     Args:
+        db: 数据库会话
         current_user: 当前登录用户
 
     Returns:
         Any: 用户信息
     """
-    return current_user 
\ No newline at end of file
+    user = await _get_user_by(db, models.User.id, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+@router.get("/cache-stats")
+def read_auth_cache_stats(
+    current_user: Principal = Depends(get_current_active_superuser)
+) -> Any:
+    """
+    获取认证缓存的命中统计
+
+    Args:
+        current_user: 当前超级用户
+
+    Returns:
+        Any: 命中数、未命中数和条目数
+    """
+    return principal_cache.stats()
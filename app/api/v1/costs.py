@@ -1,65 +1,212 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+import os
+from pathlib import Path
+from typing import List, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, File, HTTPException, Query, Response, UploadFile
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
-from app.core.deps import get_current_active_user
+from app.core.deps import Principal, get_current_active_user
+from app.core.etag import conditional_get
+from app.core.responses import fast_json
 from app.db.session import get_db
 from app.models import models
 from app.schemas import schemas
+from app.crud import accrual, cost_import, cost_series, fixed_cost, labor_cost, project_stats
+from app.crud.listing import list_query, row_dicts
+from app.crud.pagination import paginate, set_next_cursor
 
 router = APIRouter()
 
+async def _get_cost_record(db: AsyncSession, cost_id: int) -> models.CostRecord:
+    result = await db.execute(select(models.CostRecord).where(models.CostRecord.id == cost_id))
+    db_cost = result.scalars().first()
+    if db_cost is None:
+        raise HTTPException(status_code=404, detail="Cost record not found")
+    return db_cost
+
 @router.post("/", response_model=schemas.CostRecord)
-def create_cost_record(
+async def create_cost_record(
     cost: schemas.CostRecordCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     db_cost = models.CostRecord(**cost.dict())
     db.add(db_cost)
-    db.commit()
-    db.refresh(db_cost)
+    await db.commit()
+    await db.refresh(db_cost)
     return db_cost
 
-@router.get("/", response_model=List[schemas.CostRecord])
-def read_cost_records(
+@router.post("/import", response_model=schemas.CostImport, status_code=202)
+async def import_cost_records(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    suffix = Path(file.filename or "").suffix.lower()
+    if suffix not in cost_import.SUPPORTED_SUFFIXES:
+        raise HTTPException(status_code=400, detail="Only .csv and .xlsx files are supported")
+    
+    path, content_hash = await cost_import.save_upload(file)
+    try:
+        cost_import.check_columns(await run_in_threadpool(cost_import.read_columns, path, suffix))
+        job, accepted = await cost_import.create_import(db, file.filename, content_hash, current_user.id)
+    except ValueError as exc:
+        os.remove(path)
+        raise HTTPException(status_code=400, detail=str(exc))
+    except Exception:
+        os.remove(path)
+        raise
+    
+    if not accepted:
+        # 同一文件已导入或正在导入
+        os.remove(path)
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "File already imported", "import_id": job.id, "status": job.status}
+        )
+    
+    # 导入在响应返回后执行，通过 GET /costs/imports/{import_id} 查询进度
+    background_tasks.add_task(cost_import.run_import, job.id, path, remove_file=True)
+    return job
+
+@router.get(
+    "/imports/{import_id}",
+    response_model=schemas.CostImport,
+    dependencies=[Depends(conditional_get("cost_imports"))]
+)
+async def read_cost_import(
+    import_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    job = await cost_import.get_import(db, import_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Cost import not found")
+    return job
+
+@router.get(
+    "/",
+    response_model=List[schemas.CostRecord],
+    dependencies=[Depends(conditional_get("cost_records"))]
+)
+async def read_cost_records(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    order = [models.CostRecord.id]
+    result = await db.execute(paginate(list_query(models.CostRecord, schemas.CostRecord), order, cursor, skip, limit))
+    rows = result.all()
+    set_next_cursor(response, rows, order, limit)
+    return fast_json(row_dicts(rows), response)
+
+@router.get("/monthly-series", response_model=List[schemas.CostMonthlyTotal])
+async def read_monthly_cost_series(
+    start: str,
+    end: str,
+    project_ids: Optional[List[int]] = Query(None),
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    costs = db.query(models.CostRecord).offset(skip).limit(limit).all()
-    return costs
+    try:
+        start_month = cost_series.parse_month(start)
+        end_month = cost_series.parse_month(end)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="start and end must be in YYYY-MM format")
+    try:
+        return await cost_series.monthly_cost_series(db, start_month, end_month, project_ids)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
-@router.get("/{cost_id}", response_model=schemas.CostRecord)
-def read_cost_record(
+async def _accrual_report(
+    accruals: accrual.Accruals,
+    start_date: datetime,
+    end_date: datetime,
+    granularity: str,
+    by_member: bool,
+    project_ids: Optional[List[int]]
+) -> dict:
+    try:
+        # 大范围、大量区间时计算耗时可达数十毫秒，放到线程池执行
+        result = await run_in_threadpool(
+            accrual.compute_accruals, accruals, start_date, end_date,
+            granularity=granularity, by_member=by_member, project_ids=project_ids
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return accrual.to_report(result, granularity)
+
+@router.get("/labor", response_model=schemas.CostAccrualReport)
+async def read_labor_costs(
+    start_date: datetime,
+    end_date: datetime,
+    project_ids: Optional[List[int]] = Query(None),
+    granularity: str = "month",
+    by_member: bool = False,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    allocations = await labor_cost.load_allocations(db, project_ids)
+    return await _accrual_report(allocations, start_date, end_date, granularity, by_member, project_ids)
+
+@router.get("/fixed-accruals", response_model=schemas.CostAccrualReport)
+async def read_fixed_cost_accruals(
+    start_date: datetime,
+    end_date: datetime,
+    project_ids: Optional[List[int]] = Query(None),
+    granularity: str = "month",
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    accruals = await fixed_cost.load_fixed_costs(db, project_ids)
+    return await _accrual_report(accruals, start_date, end_date, granularity, False, project_ids)
+
+@router.get(
+    "/{cost_id}",
+    response_model=schemas.CostRecord,
+    dependencies=[Depends(conditional_get("cost_records"))]
+)
+async def read_cost_record(
     cost_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    db_cost = db.query(models.CostRecord).filter(models.CostRecord.id == cost_id).first()
-    if db_cost is None:
-        raise HTTPException(status_code=404, detail="Cost record not found")
-    return db_cost
+    return await _get_cost_record(db, cost_id)
 
-@router.get("/project/{project_id}", response_model=List[schemas.CostRecord])
-def read_project_costs(
+@router.get(
+    "/project/{project_id}",
+    response_model=List[schemas.CostRecord],
+    dependencies=[Depends(conditional_get("cost_records"))]
+)
+async def read_project_costs(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    costs = db.query(models.CostRecord).filter(models.CostRecord.project_id == project_id).all()
-    return costs
+    result = await db.execute(
+        list_query(models.CostRecord, schemas.CostRecord).where(models.CostRecord.project_id == project_id)
+    )
+    return fast_json(row_dicts(result.all()), response)
 
-@router.get("/project/{project_id}/monthly", response_model=List[schemas.CostRecord])
-def read_project_monthly_costs(
+@router.get(
+    "/project/{project_id}/monthly",
+    response_model=List[schemas.CostRecord],
+    dependencies=[Depends(conditional_get("cost_records"))]
+)
+async def read_project_monthly_costs(
     project_id: int,
     year: int,
     month: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     start_date = datetime(year, month, 1)
     if month == 12:
@@ -67,65 +214,53 @@ def read_project_monthly_costs(
     else:
         end_date = datetime(year, month + 1, 1)
     
-    costs = db.query(models.CostRecord).filter(
-        models.CostRecord.project_id == project_id,
-        models.CostRecord.record_date >= start_date,
-        models.CostRecord.record_date < end_date
-    ).all()
-    return costs
+    result = await db.execute(
+        list_query(models.CostRecord, schemas.CostRecord).where(
+            models.CostRecord.project_id == project_id,
+            models.CostRecord.record_date >= start_date,
+            models.CostRecord.record_date < end_date
+        )
+    )
+    return fast_json(row_dicts(result.all()), response)
 
 @router.put("/{cost_id}", response_model=schemas.CostRecord)
-def update_cost_record(
+async def update_cost_record(
     cost_id: int,
     cost: schemas.CostRecordCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    db_cost = db.query(models.CostRecord).filter(models.CostRecord.id == cost_id).first()
-    if db_cost is None:
-        raise HTTPException(status_code=404, detail="Cost record not found")
+    db_cost = await _get_cost_record(db, cost_id)
     
     for key, value in cost.dict().items():
         setattr(db_cost, key, value)
     
-    db.commit()
-    db.refresh(db_cost)
+    await db.commit()
+    await db.refresh(db_cost)
     return db_cost
 
 @router.delete("/{cost_id}")
-def delete_cost_record(
+async def delete_cost_record(
     cost_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    db_cost = db.query(models.CostRecord).filter(models.CostRecord.id == cost_id).first()
-    if db_cost is None:
-        raise HTTPException(status_code=404, detail="Cost record not found")
+    db_cost = await _get_cost_record(db, cost_id)
     
-    db.delete(db_cost)
-    db.commit()
+    await db.delete(db_cost)
+    await db.commit()
     return {"message": "Cost record deleted successfully"}
 
 @router.get("/project/{project_id}/stats")
-def read_project_cost_stats(
+async def read_project_cost_stats(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     # 检查项目是否存在
-    db_project = db.query(models.Project).filter(models.Project.id == project_id).first()
+    result = await db.execute(select(models.Project).where(models.Project.id == project_id))
+    db_project = result.scalars().first()
     if db_project is None:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # 获取成本统计
-    cost_stats = db.query(
-        func.sum(case((models.CostRecord.cost_type == 'fixed', models.CostRecord.amount), else_=0)).label('fixed'),
-        func.sum(case((models.CostRecord.cost_type == 'human', models.CostRecord.amount), else_=0)).label('human'),
-        func.sum(case((models.CostRecord.cost_type.notin_(['fixed', 'human']), models.CostRecord.amount), else_=0)).label('other')
-    ).filter(models.CostRecord.project_id == project_id).first()
-    
-    return {
-        "fixed": cost_stats.fixed or 0,
-        "human": cost_stats.human or 0,
-        "other": cost_stats.other or 0
-    } 
\ No newline at end of file
+    return await project_stats.project_cost_stats(db, db_project)
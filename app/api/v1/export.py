@@ -0,0 +1,60 @@
+from datetime import datetime
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.deps import Principal, get_current_active_user
+from app.crud import export
+from app.crud.export import ExportTable
+
+router = APIRouter()
+
+MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+}
+
+def _export_response(table: ExportTable, stmt, file_format: str) -> StreamingResponse:
+    if file_format == "xlsx":
+        chunks = export.xlsx_chunks(table, stmt)
+    else:
+        chunks = export.csv_chunks(table, stmt)
+    filename = f"{table.name}_{datetime.now():%Y%m%d%H%M%S}.{file_format}"
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/tasks")
+async def export_tasks(
+    project_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    file_format: Literal["csv", "xlsx"] = Query("csv", alias="format"),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    stmt = export.tasks_query(project_id, start_date, end_date)
+    return _export_response(export.TASKS, stmt, file_format)
+
+@router.get("/costs")
+async def export_costs(
+    project_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    file_format: Literal["csv", "xlsx"] = Query("csv", alias="format"),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    stmt = export.costs_query(project_id, start_date, end_date)
+    return _export_response(export.COSTS, stmt, file_format)
+
+@router.get("/activities")
+async def export_activities(
+    project_id: Optional[int] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    file_format: Literal["csv", "xlsx"] = Query("csv", alias="format"),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    stmt = export.activities_query(project_id, start_date, end_date)
+    return _export_response(export.ACTIVITIES, stmt, file_format)
@@ -1,167 +1,181 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, case
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_active_user
+from app.core.deps import Principal, get_current_active_user
+from app.core.etag import conditional_get
+from app.core.responses import fast_json
 from app.db.session import get_db
 from app.models import models
 from app.schemas import schemas
-from app.crud import activity
+from app.crud import activity, overview, project_stats, statistics
+from app.crud.listing import list_query, row_dicts
+from app.crud.pagination import paginate, set_next_cursor
 
 router = APIRouter()
 
+async def _get_project(db: AsyncSession, project_id: int) -> models.Project:
+    result = await db.execute(select(models.Project).where(models.Project.id == project_id))
+    db_project = result.scalars().first()
+    if db_project is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    return db_project
+
 @router.post("/", response_model=schemas.Project)
-def create_project(
+async def create_project(
     project: schemas.ProjectCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     db_project = models.Project(**project.dict())
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    # 先 flush 取得项目ID，活动记录随项目在同一次提交中写入
+    await db.flush()
     
     # 创建活动记录
-    activity.create_activity(
+    activity.record_activity(
         db=db,
         user_id=current_user.id,
         activity_type="project_created",
-        content=f"创建了项目 \"{db_project.name}\""
+        content=f"创建了项目 \"{db_project.name}\"",
+        project_id=db_project.id,
+        entity_type="project",
+        entity_id=db_project.id
     )
     
+    await db.commit()
+    await db.refresh(db_project)
     return db_project
 
-@router.get("/", response_model=List[schemas.Project])
-def read_projects(
+@router.get("/", response_model=List[schemas.Project], dependencies=[Depends(conditional_get("projects"))])
+async def read_projects(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    projects = db.query(models.Project).offset(skip).limit(limit).all()
-    return projects
+    order = [models.Project.id]
+    result = await db.execute(paginate(list_query(models.Project, schemas.Project), order, cursor, skip, limit))
+    rows = result.all()
+    set_next_cursor(response, rows, order, limit)
+    return fast_json(row_dicts(rows), response)
 
-@router.get("/{project_id}", response_model=schemas.Project)
-def read_project(
+@router.get(
+    "/{project_id}",
+    response_model=schemas.Project,
+    dependencies=[Depends(conditional_get("projects"))]
+)
+async def read_project(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    db_project = db.query(models.Project).filter(models.Project.id == project_id).first()
-    if db_project is None:
-        raise HTTPException(status_code=404, detail="Project not found")
-    return db_project
+    return await _get_project(db, project_id)
 
 @router.put("/{project_id}", response_model=schemas.Project)
-def update_project(
+async def update_project(
     project_id: int,
     project: schemas.ProjectCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    db_project = db.query(models.Project).filter(models.Project.id == project_id).first()
-    if db_project is None:
-        raise HTTPException(status_code=404, detail="Project not found")
+    db_project = await _get_project(db, project_id)
     
     old_name = db_project.name
     for key, value in project.dict().items():
         setattr(db_project, key, value)
     
-    db.commit()
-    db.refresh(db_project)
-    
     # 如果项目名称发生变化，创建活动记录
     if old_name != db_project.name:
-        activity.create_activity(
+        activity.record_activity(
             db=db,
             user_id=current_user.id,
             activity_type="project_updated",
-            content=f"将项目名称从 \"{old_name}\" 更新为 \"{db_project.name}\""
+            content=f"将项目名称从 \"{old_name}\" 更新为 \"{db_project.name}\"",
+            project_id=db_project.id,
+            entity_type="project",
+            entity_id=db_project.id
         )
     
+    await db.commit()
+    await db.refresh(db_project)
     return db_project
 
 @router.delete("/{project_id}")
-def delete_project(
+async def delete_project(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    db_project = db.query(models.Project).filter(models.Project.id == project_id).first()
-    if db_project is None:
-        raise HTTPException(status_code=404, detail="Project not found")
+    db_project = await _get_project(db, project_id)
     
-    db.delete(db_project)
-    db.commit()
+    await statistics.remove_project(db, project_id)
+    await db.delete(db_project)
+    await db.commit()
     return {"message": "Project deleted successfully"}
 
-@router.get("/{project_id}/stats")
-def get_project_stats(
+@router.get(
+    "/{project_id}/stats",
+    dependencies=[Depends(conditional_get("projects", "project_task_stats", "cost_records", "project_members", "team_members", daily=True))]
+)
+async def get_project_stats(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    # 检查项目是否存在
-    db_project = db.query(models.Project).filter(models.Project.id == project_id).first()
-    if db_project is None:
+    db_project = await _get_project(db, project_id)
+    return await project_stats.project_stats(db, db_project)
+
+@router.get(
+    "/{project_id}/overview",
+    dependencies=[Depends(conditional_get(*overview.OVERVIEW_TABLES, daily=True))]
+)
+async def get_project_overview(
+    project_id: int,
+    response: Response,
+    sections: Optional[str] = None,
+    activity_limit: int = overview.OVERVIEW_ACTIVITY_LIMIT,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    try:
+        names = overview.parse_sections(sections)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    db_project = await _get_project(db, project_id)
+    try:
+        content = await overview.project_overview(db, db_project, names, activity_limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if content is None:
         raise HTTPException(status_code=404, detail="Project not found")
-    
-    # 获取任务统计
-    task_stats = db.query(
-        func.count(models.Task.id).label('total'),
-        func.sum(case((models.Task.status == 'in_progress', 1), else_=0)).label('in_progress'),
-        func.sum(case((models.Task.status == 'completed', 1), else_=0)).label('completed')
-    ).filter(models.Task.project_id == project_id).first()
-    
-    # 获取工时统计
-    time_stats = db.query(
-        func.sum(models.Task.estimated_hours).label('estimated'),
-        func.sum(models.Task.actual_hours).label('actual')
-    ).filter(models.Task.project_id == project_id).first()
-    
-    # 获取成本统计
-    cost_stats = db.query(
-        func.sum(case((models.CostRecord.cost_type == 'fixed', models.CostRecord.amount), else_=0)).label('fixed'),
-        func.sum(case((models.CostRecord.cost_type == 'human', models.CostRecord.amount), else_=0)).label('human')
-    ).filter(models.CostRecord.project_id == project_id).first()
-    
-    return {
-        "taskStats": {
-            "total": task_stats.total or 0,
-            "inProgress": task_stats.in_progress or 0,
-            "completed": task_stats.completed or 0
-        },
-        "timeStats": {
-            "estimated": time_stats.estimated or 0,
-            "actual": time_stats.actual or 0
-        },
-        "costStats": {
-            "fixed": cost_stats.fixed or 0,
-            "human": cost_stats.human or 0
-        }
-    }
+    return fast_json(content, response)
 
-@router.get("/{project_id}/activities", response_model=List[schemas.Activity])
-def get_project_activities(
+@router.get(
+    "/{project_id}/activities",
+    response_model=List[schemas.Activity],
+    dependencies=[Depends(conditional_get("activities", "projects"))]
+)
+async def get_project_activities(
     project_id: int,
+    response: Response,
     skip: int = 0,
     limit: int = 10,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     # 检查项目是否存在
-    db_project = db.query(models.Project).filter(models.Project.id == project_id).first()
-    if db_project is None:
-        raise HTTPException(status_code=404, detail="Project not found")
-    
-    # 获取与项目相关的活动
-    # 这里我们假设活动内容中包含项目ID或项目名称
-    activities = db.query(models.Activity)\
-        .filter(models.Activity.content.like(f"%{db_project.name}%"))\
-        .order_by(desc(models.Activity.created_at))\
-        .offset(skip)\
-        .limit(limit)\
-        .all()
+    await _get_project(db, project_id)
     
-    return activities 
\ No newline at end of file
+    # 按 project_id 过滤，走 (project_id, created_at) 索引的范围扫描
+    order = [models.Activity.created_at, models.Activity.id]
+    stmt = list_query(models.Activity, schemas.Activity).where(models.Activity.project_id == project_id)
+    result = await db.execute(paginate(stmt, order, cursor, skip, limit, descending=True))
+    rows = result.all()
+    set_next_cursor(response, rows, order, limit)
+    return fast_json(row_dicts(rows), response)
@@ -1,105 +1,172 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_active_user
+from app.core.deps import Principal, get_current_active_user
+from app.core.etag import conditional_get
+from app.core.responses import fast_json
+from app.core.sprint_cache import sprint_burndown_cache
 from app.db.session import get_db
 from app.models import models
 from app.schemas import schemas
-from app.crud import activity
+from app.crud import activity, sprint_metrics
+from app.crud.listing import list_query, row_dicts
+from app.crud.pagination import paginate, set_next_cursor
 
 router = APIRouter()
 
+async def _get_sprint(db: AsyncSession, sprint_id: int) -> models.Sprint:
+    result = await db.execute(select(models.Sprint).where(models.Sprint.id == sprint_id))
+    db_sprint = result.scalars().first()
+    if db_sprint is None:
+        raise HTTPException(status_code=404, detail="Sprint not found")
+    return db_sprint
+
 @router.post("/", response_model=schemas.Sprint)
-def create_sprint(
+async def create_sprint(
     sprint: schemas.SprintCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     db_sprint = models.Sprint(**sprint.dict())
     db.add(db_sprint)
-    db.commit()
-    db.refresh(db_sprint)
+    # 先 flush 取得迭代ID，活动记录随迭代在同一次提交中写入
+    await db.flush()
     
     # 创建活动记录
-    activity.create_activity(
+    activity.record_activity(
         db=db,
         user_id=current_user.id,
         activity_type="sprint_created",
-        content=f"创建了迭代 \"{db_sprint.name}\""
+        content=f"创建了迭代 \"{db_sprint.name}\"",
+        project_id=db_sprint.project_id,
+        entity_type="sprint",
+        entity_id=db_sprint.id
     )
     
+    await db.commit()
+    await db.refresh(db_sprint)
     return db_sprint
 
-@router.get("/", response_model=List[schemas.Sprint])
-def read_sprints(
+@router.get("/", response_model=List[schemas.Sprint], dependencies=[Depends(conditional_get("sprints"))])
+async def read_sprints(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    sprints = db.query(models.Sprint).offset(skip).limit(limit).all()
-    return sprints
+    order = [models.Sprint.id]
+    result = await db.execute(paginate(list_query(models.Sprint, schemas.Sprint), order, cursor, skip, limit))
+    rows = result.all()
+    set_next_cursor(response, rows, order, limit)
+    return fast_json(row_dicts(rows), response)
 
-@router.get("/{sprint_id}", response_model=schemas.Sprint)
-def read_sprint(
+@router.get(
+    "/{sprint_id}",
+    response_model=schemas.Sprint,
+    dependencies=[Depends(conditional_get("sprints"))]
+)
+async def read_sprint(
     sprint_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    db_sprint = db.query(models.Sprint).filter(models.Sprint.id == sprint_id).first()
-    if db_sprint is None:
-        raise HTTPException(status_code=404, detail="Sprint not found")
-    return db_sprint
+    return await _get_sprint(db, sprint_id)
+
+@router.get(
+    "/project/{project_id}",
+    response_model=List[schemas.Sprint],
+    dependencies=[Depends(conditional_get("sprints"))]
+)
+async def read_project_sprints(
+    project_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    result = await db.execute(
+        list_query(models.Sprint, schemas.Sprint).where(models.Sprint.project_id == project_id)
+    )
+    return fast_json(row_dicts(result.all()), response)
 
-@router.get("/project/{project_id}", response_model=List[schemas.Sprint])
-def read_project_sprints(
+@router.get("/project/{project_id}/velocity", response_model=schemas.SprintVelocityReport)
+async def read_project_velocity(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    last: int = 5,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    # 缓存版本号须在本会话的第一条查询之前读取
+    versions = sprint_burndown_cache.versions()
+    result = await db.execute(select(models.Project.id).where(models.Project.id == project_id))
+    if result.first() is None:
+        raise HTTPException(status_code=404, detail="Project not found")
+    try:
+        return await sprint_metrics.project_velocity(db, project_id, last, versions)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+@router.get("/{sprint_id}/burndown", response_model=schemas.SprintBurndown)
+async def read_sprint_burndown(
+    sprint_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    sprints = db.query(models.Sprint).filter(models.Sprint.project_id == project_id).all()
-    return sprints
+    version = sprint_burndown_cache.version(sprint_id)
+    db_sprint = await _get_sprint(db, sprint_id)
+    try:
+        return await sprint_metrics.sprint_burndown(db, db_sprint, version)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
 
 @router.put("/{sprint_id}", response_model=schemas.Sprint)
-def update_sprint(
+async def update_sprint(
     sprint_id: int,
     sprint: schemas.SprintCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    db_sprint = db.query(models.Sprint).filter(models.Sprint.id == sprint_id).first()
-    if db_sprint is None:
-        raise HTTPException(status_code=404, detail="Sprint not found")
+    db_sprint = await _get_sprint(db, sprint_id)
     
     old_name = db_sprint.name
+    was_closed = sprint_metrics.is_closed(db_sprint)
     for key, value in sprint.dict().items():
         setattr(db_sprint, key, value)
     
-    db.commit()
-    db.refresh(db_sprint)
+    # 迭代关闭时按完成的预估工时自动填写速度
+    if not was_closed and sprint_metrics.is_closed(db_sprint):
+        try:
+            db_sprint.velocity = await sprint_metrics.sprint_velocity(db, db_sprint)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc))
     
     # 如果迭代名称发生变化，创建活动记录
     if old_name != db_sprint.name:
-        activity.create_activity(
+        activity.record_activity(
             db=db,
             user_id=current_user.id,
             activity_type="sprint_updated",
-            content=f"将迭代名称从 \"{old_name}\" 更新为 \"{db_sprint.name}\""
+            content=f"将迭代名称从 \"{old_name}\" 更新为 \"{db_sprint.name}\"",
+            project_id=db_sprint.project_id,
+            entity_type="sprint",
+            entity_id=db_sprint.id
         )
     
+    await db.commit()
+    await db.refresh(db_sprint)
     return db_sprint
 
 @router.delete("/{sprint_id}")
-def delete_sprint(
+async def delete_sprint(
     sprint_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    db_sprint = db.query(models.Sprint).filter(models.Sprint.id == sprint_id).first()
-    if db_sprint is None:
-        raise HTTPException(status_code=404, detail="Sprint not found")
+    db_sprint = await _get_sprint(db, sprint_id)
     
-    db.delete(db_sprint)
-    db.commit()
-    return {"message": "Sprint deleted successfully"} 
\ No newline at end of file
+    await db.delete(db_sprint)
+    await db.commit()
+    return {"message": "Sprint deleted successfully"}
@@ -1,12 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import func, case
+from sqlalchemy import func, case, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any
 import logging
 
-from app.core.deps import get_db
+from app.core.deps import Principal, get_current_user, get_db
 from app.models import models
-from app.core.security import get_current_user
+from app.crud import statistics
 
 # 配置日志
 logging.basicConfig(level=logging.INFO)
@@ -16,8 +16,8 @@ router = APIRouter()
 
 @router.get("")
 async def get_statistics(
-    current_user: models.User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
 ) -> Dict[str, Any]:
     """
     获取统计数据
@@ -34,76 +34,49 @@ async def get_statistics(
         
         # 获取项目统计
         try:
-            # 临时：获取所有项目
-            user_projects = db.query(models.Project).all()
+            result = await db.execute(
+                select(
+                    func.count(models.Project.id).label('total'),
+                    func.sum(case((models.Project.status == 'active', 1), else_=0)).label('active')
+                )
+            )
+            project_stats = result.one()
             
-            project_count = len(user_projects)
-            active_project_count = sum(1 for p in user_projects if p.status == 'active')
+            project_count = project_stats.total or 0
+            active_project_count = project_stats.active or 0
             
             logger.info(f"项目统计获取成功: 总数={project_count}, 进行中={active_project_count}")
         except Exception as e:
             logger.error(f"获取项目统计时出错: {str(e)}")
             raise HTTPException(status_code=500, detail=f"获取项目统计失败: {str(e)}")
         
-        # 获取任务统计
+        # 从统计汇总表读取任务和工时统计
         try:
-            # 只统计用户参与项目中的任务
-            project_ids = [p.id for p in user_projects]
-            total_tasks = db.query(func.count(models.Task.id)).filter(
-                models.Task.project_id.in_(project_ids)
-            ).scalar() or 0
+            status_totals = await statistics.get_status_totals(db)
             
-            completed_tasks = db.query(func.count(models.Task.id)).filter(
-                models.Task.project_id.in_(project_ids),
-                models.Task.status == 'done'
-            ).scalar() or 0
-            
-            in_progress_tasks = db.query(func.count(models.Task.id)).filter(
-                models.Task.project_id.in_(project_ids),
-                models.Task.status == 'in_progress'
-            ).scalar() or 0
+            total_tasks = sum(row.task_count for row in status_totals)
+            status_counts = {row.status: row.task_count for row in status_totals}
+            completed_tasks = status_counts.get('done', 0)
+            in_progress_tasks = status_counts.get('in_progress', 0)
+            total_estimated_hours = sum(row.estimated_hours for row in status_totals)
+            total_actual_hours = sum(row.actual_hours for row in status_totals)
             
             logger.info(f"任务统计获取成功: 总数={total_tasks}, 已完成={completed_tasks}, 进行中={in_progress_tasks}")
+            logger.info(f"工时统计获取成功: 预估={total_estimated_hours}, 实际={total_actual_hours}")
         except Exception as e:
             logger.error(f"获取任务统计时出错: {str(e)}")
             raise HTTPException(status_code=500, detail=f"获取任务统计失败: {str(e)}")
         
-        # 获取工时统计
-        try:
-            total_estimated_hours = db.query(func.sum(models.Task.estimated_hours)).filter(
-                models.Task.project_id.in_(project_ids)
-            ).scalar() or 0
-            
-            total_actual_hours = db.query(func.sum(models.Task.actual_hours)).filter(
-                models.Task.project_id.in_(project_ids)
-            ).scalar() or 0
-            
-            logger.info(f"工时统计获取成功: 预估={total_estimated_hours}, 实际={total_actual_hours}")
-        except Exception as e:
-            logger.error(f"获取工时统计时出错: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"获取工时统计失败: {str(e)}")
-        
         # 获取任务状态分布
-        try:
-            status_distribution = []
-            status_counts = db.query(
-                models.Task.status,
-                func.count(models.Task.id).label('count')
-            ).filter(
-                models.Task.project_id.in_(project_ids)
-            ).group_by(models.Task.status).all()
-            
-            for status, count in status_counts:
-                percentage = round((count / total_tasks) * 100, 2) if total_tasks > 0 else 0
-                status_distribution.append({
-                    'status': status,
-                    'count': count,
-                    'percentage': percentage
-                })
-            logger.info(f"任务状态分布获取成功: {status_distribution}")
-        except Exception as e:
-            logger.error(f"获取任务状态分布时出错: {str(e)}")
-            raise HTTPException(status_code=500, detail=f"获取任务状态分布失败: {str(e)}")
+        status_distribution = []
+        for row in status_totals:
+            percentage = round((row.task_count / total_tasks) * 100, 2) if total_tasks > 0 else 0
+            status_distribution.append({
+                'status': row.status,
+                'count': row.task_count,
+                'percentage': percentage
+            })
+        logger.info(f"任务状态分布获取成功: {status_distribution}")
         
         result = {
             'project_count': project_count,
@@ -1,77 +1,120 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_current_active_user
+from app.core.deps import Principal, get_current_active_user
+from app.core.etag import conditional_get
+from app.core.responses import fast_json
 from app.db.session import get_db
 from app.models import models
 from app.schemas import schemas
 from app.crud import task
+from app.crud.pagination import paginate, set_next_cursor
 
 router = APIRouter()
 
 @router.post("/", response_model=schemas.Task)
-def create_task(
+async def create_task(
     task_in: schemas.TaskCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    return task.create_task(db=db, task=task_in, user_id=current_user.id)
+    return await task.create_task(db=db, task=task_in, user_id=current_user.id)
 
-@router.get("/", response_model=List[schemas.Task])
-def read_tasks(
+@router.post("/bulk", response_model=schemas.TaskBulkResult)
+async def bulk_create_tasks(
+    bulk_in: schemas.TaskBulkCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    return await task.create_tasks(db=db, tasks=bulk_in.items, user_id=current_user.id)
+
+@router.patch("/bulk", response_model=schemas.TaskBulkResult)
+async def bulk_update_tasks(
+    bulk_in: schemas.TaskBulkUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    return await task.update_tasks(db=db, items=bulk_in.items, user_id=current_user.id)
+
+@router.delete("/bulk", response_model=schemas.TaskBulkResult)
+async def bulk_delete_tasks(
+    bulk_in: schemas.TaskBulkDelete,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
+):
+    return await task.delete_tasks(db=db, ids=bulk_in.ids)
+
+@router.get(
+    "/",
+    response_model=List[schemas.Task],
+    dependencies=[Depends(conditional_get("tasks", "projects", "team_members"))]
+)
+async def read_tasks(
+    response: Response,
     project_id: Optional[int] = None,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
+    # 只读列表走快速路径：按列读取元组，直接组装字典并用 orjson 编码
+    stmt = task.task_list_query()
     if project_id:
-        return task.get_tasks_by_project(db=db, project_id=project_id, skip=skip, limit=limit)
-    else:
-        return db.query(models.Task).options(
-            joinedload(models.Task.project),
-            joinedload(models.Task.assignee)
-        ).offset(skip).limit(limit).all()
+        stmt = stmt.where(models.Task.project_id == project_id)
+    result = await db.execute(paginate(stmt, task.TASK_ORDER, cursor, skip, limit))
+    rows = result.all()
+    set_next_cursor(response, rows, task.TASK_ORDER, limit)
+    return fast_json(task.task_list_items(rows), response)
 
-@router.get("/{task_id}", response_model=schemas.Task)
-def read_task(
+@router.get(
+    "/{task_id}",
+    response_model=schemas.Task,
+    dependencies=[Depends(conditional_get("tasks", "projects", "team_members"))]
+)
+async def read_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    db_task = task.get_task(db=db, task_id=task_id)
+    db_task = await task.get_task(db=db, task_id=task_id)
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     return db_task
 
-@router.get("/sprint/{sprint_id}", response_model=List[schemas.Task])
-def read_sprint_tasks(
+@router.get(
+    "/sprint/{sprint_id}",
+    response_model=List[schemas.Task],
+    dependencies=[Depends(conditional_get("tasks", "projects", "team_members"))]
+)
+async def read_sprint_tasks(
     sprint_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    tasks = db.query(models.Task).filter(models.Task.sprint_id == sprint_id).all()
-    return tasks
+    result = await db.execute(task.task_list_query().where(models.Task.sprint_id == sprint_id))
+    return fast_json(task.task_list_items(result.all()), response)
 
 @router.put("/{task_id}", response_model=schemas.Task)
-def update_task(
+async def update_task(
     task_id: int,
     task_in: schemas.TaskCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    db_task = task.update_task(db=db, task_id=task_id, task=task_in, user_id=current_user.id)
+    db_task = await task.update_task(db=db, task_id=task_id, task=task_in, user_id=current_user.id)
     if db_task is None:
         raise HTTPException(status_code=404, detail="Task not found")
     return db_task
 
 @router.delete("/{task_id}")
-def delete_task(
+async def delete_task(
     task_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    if not task.delete_task(db=db, task_id=task_id):
+    if not await task.delete_task(db=db, task_id=task_id):
         raise HTTPException(status_code=404, detail="Task not found")
-    return {"message": "Task deleted successfully"} 
\ No newline at end of file
+    return {"message": "Task deleted successfully"}
@@ -1,20 +1,32 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
-from app.core.deps import get_current_active_user
+from app.core.deps import Principal, get_current_active_user
+from app.core.etag import conditional_get
+from app.core.responses import fast_json
 from app.db.session import get_db
 from app.models import models
 from app.schemas import team_member as team_member_schema
+from app.crud.listing import list_query, row_dicts
+from app.crud.pagination import paginate, set_next_cursor
 
 router = APIRouter()
 
+async def _get_team_member(db: AsyncSession, team_member_id: int) -> models.TeamMember:
+    result = await db.execute(select(models.TeamMember).where(models.TeamMember.id == team_member_id))
+    db_team_member = result.scalars().first()
+    if db_team_member is None:
+        raise HTTPException(status_code=404, detail="Team member not found")
+    return db_team_member
+
 @router.post("/", response_model=team_member_schema.TeamMember, status_code=status.HTTP_201_CREATED)
-def create_team_member(
+async def create_team_member(
     team_member: team_member_schema.TeamMemberCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     创建团队成员
@@ -26,94 +38,108 @@ def create_team_member(
         join_date=team_member.join_date or datetime.utcnow()
     )
     db.add(db_team_member)
-    db.commit()
-    db.refresh(db_team_member)
+    await db.commit()
+    await db.refresh(db_team_member)
     return db_team_member
 
-@router.get("/", response_model=List[team_member_schema.TeamMember])
-def read_team_members(
+@router.get(
+    "/",
+    response_model=List[team_member_schema.TeamMember],
+    dependencies=[Depends(conditional_get("team_members"))]
+)
+async def read_team_members(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     获取团队成员列表
     """
-    team_members = db.query(models.TeamMember).offset(skip).limit(limit).all()
-    return team_members
+    order = [models.TeamMember.id]
+    stmt = list_query(models.TeamMember, team_member_schema.TeamMember)
+    result = await db.execute(paginate(stmt, order, cursor, skip, limit))
+    rows = result.all()
+    set_next_cursor(response, rows, order, limit)
+    return fast_json(row_dicts(rows), response)
 
-@router.get("/{team_member_id}", response_model=team_member_schema.TeamMember)
-def read_team_member(
+@router.get(
+    "/{team_member_id}",
+    response_model=team_member_schema.TeamMember,
+    dependencies=[Depends(conditional_get("team_members"))]
+)
+async def read_team_member(
     team_member_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     获取团队成员详情
     """
-    db_team_member = db.query(models.TeamMember).filter(models.TeamMember.id == team_member_id).first()
-    if db_team_member is None:
-        raise HTTPException(status_code=404, detail="Team member not found")
+    db_team_member = await _get_team_member(db, team_member_id)
     return db_team_member
 
 @router.put("/{team_member_id}", response_model=team_member_schema.TeamMember)
-def update_team_member(
+async def update_team_member(
     team_member_id: int,
     team_member: team_member_schema.TeamMemberUpdate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     更新团队成员信息
     """
-    db_team_member = db.query(models.TeamMember).filter(models.TeamMember.id == team_member_id).first()
-    if db_team_member is None:
-        raise HTTPException(status_code=404, detail="Team member not found")
+    db_team_member = await _get_team_member(db, team_member_id)
     
     for field, value in team_member.dict(exclude_unset=True).items():
         setattr(db_team_member, field, value)
     
-    db.commit()
-    db.refresh(db_team_member)
+    await db.commit()
+    await db.refresh(db_team_member)
     return db_team_member
 
 @router.delete("/{team_member_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_team_member(
+async def delete_team_member(
     team_member_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     """
     删除团队成员
     """
-    db_team_member = db.query(models.TeamMember).filter(models.TeamMember.id == team_member_id).first()
-    if db_team_member is None:
-        raise HTTPException(status_code=404, detail="Team member not found")
+    db_team_member = await _get_team_member(db, team_member_id)
     
-    db.delete(db_team_member)
-    db.commit()
+    await db.delete(db_team_member)
+    await db.commit()
     return None
 
 @router.post("/project-members/", response_model=team_member_schema.ProjectMember)
-def create_project_member(
+async def create_project_member(
     project_member: team_member_schema.ProjectMemberCreate,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
     db_project_member = models.ProjectMember(**project_member.dict())
     db.add(db_project_member)
-    db.commit()
-    db.refresh(db_project_member)
+    await db.commit()
+    await db.refresh(db_project_member)
     return db_project_member
 
-@router.get("/project-members/{project_id}", response_model=List[team_member_schema.ProjectMember])
-def read_project_members(
+@router.get(
+    "/project-members/{project_id}",
+    response_model=List[team_member_schema.ProjectMember],
+    dependencies=[Depends(conditional_get("project_members"))]
+)
+async def read_project_members(
     project_id: int,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(get_current_active_user)
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_active_user)
 ):
-    project_members = db.query(models.ProjectMember).filter(
-        models.ProjectMember.project_id == project_id
-    ).all()
-    return project_members 
\ No newline at end of file
+    result = await db.execute(
+        list_query(models.ProjectMember, team_member_schema.ProjectMember)
+        .where(models.ProjectMember.project_id == project_id)
+    )
+    return fast_json(row_dicts(result.all()), response) 
\ No newline at end of file
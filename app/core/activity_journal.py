@@ -0,0 +1,215 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models import models
+
+logger = logging.getLogger(__name__)
+
+# 会话 info 中暂存本事务活动记录的键（缓冲模式）
+PENDING_KEY = "pending_activities"
+
+class ActivityJournal:
+    """
+    活动记录日志
+
+    两种写入模式：
+
+    - transaction：活动记录加入调用方的会话，随业务数据在同一事务中提交，
+      不额外产生提交和查询。
+    - buffered：调用方事务提交后活动记录进入进程内队列，由后台任务每
+      flush_interval_ms 毫秒或积累 flush_max_rows 条时批量插入（组提交）。
+      活动流会有最多一个刷新周期的延迟；进程关闭时会刷新剩余记录，
+      进程被强制终止时队列中的记录会丢失。
+    """
+
+    def __init__(self, mode: str, flush_interval_ms: int, flush_max_rows: int):
+        self.mode = mode
+        self.flush_interval = flush_interval_ms / 1000
+        self.flush_max_rows = flush_max_rows
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.failed_flushes = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def buffered(self) -> bool:
+        return self.mode == "buffered"
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        等待写入的活动记录数
+        """
+        return len(self._queue)
+
+    def record(self, db: Any, **values: Any) -> None:
+        """
+        记录一条活动，不提交
+
+        transaction 模式下加入会话，随调用方的下一次提交写入；
+        buffered 模式下暂存在会话中，提交后进入队列，回滚则丢弃。
+
+        Args:
+            db: 数据库会话（AsyncSession 或 Session）
+            **values: 活动记录字段
+        """
+        values.setdefault("created_at", datetime.utcnow())
+        if not self.buffered:
+            db.add(models.Activity(**values))
+            return
+        session = getattr(db, "sync_session", db)
+        session.info.setdefault(PENDING_KEY, []).append(values)
+
+    async def record_many(self, db: Any, rows: List[Dict[str, Any]]) -> None:
+        """
+        批量记录活动，不提交
+
+        transaction 模式下在调用方事务中执行一次批量插入；
+        buffered 模式下与 record 相同，提交后整体进入队列。
+
+        Args:
+            db: 异步数据库会话
+            rows: 活动记录字段列表
+        """
+        if not rows:
+            return
+        now = datetime.utcnow()
+        for values in rows:
+            values.setdefault("created_at", now)
+        if not self.buffered:
+            await db.execute(insert(models.Activity), rows)
+            return
+        session = getattr(db, "sync_session", db)
+        session.info.setdefault(PENDING_KEY, []).extend(rows)
+
+    def enqueue(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        将已提交事务的活动记录放入写入队列
+
+        Args:
+            rows: 活动记录字段列表
+        """
+        self._queue.extend(rows)
+        if self._wakeup is not None and len(self._queue) >= self.flush_max_rows:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """
+        将队列中的活动记录批量写入数据库
+
+        Returns:
+            int: 写入的记录数
+        """
+        written = 0
+        while self._queue:
+            batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.flush_max_rows))]
+            started = time.perf_counter()
+            committed = False
+            try:
+                async with AsyncSessionLocal() as session:
+                    await session.execute(insert(models.Activity), batch)
+                    await session.commit()
+                    committed = True
+            except BaseException as exc:
+                # 未提交的批次放回队首，下个周期重试；被取消时同样放回，避免丢失已取出的记录
+                if not committed:
+                    self._queue.extendleft(reversed(batch))
+                if not isinstance(exc, Exception):
+                    raise
+                self.failed_flushes += 1
+                logger.exception(f"Failed to flush {len(batch)} activities")
+                break
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.flushes += 1
+            self.flushed_rows += len(batch)
+            self.last_flush_ms = elapsed_ms
+            self.max_flush_ms = max(self.max_flush_ms, elapsed_ms)
+            self._total_flush_ms += elapsed_ms
+            written += len(batch)
+        return written
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stopping:
+                break
+            await self.flush()
+
+    def start(self) -> None:
+        """
+        启动后台刷新任务（仅 buffered 模式）
+        """
+        if self.buffered and self._task is None:
+            self._stopping = False
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        停止后台刷新任务，并写入队列中剩余的活动记录
+
+        不取消后台任务：通知其退出循环并等待正在进行的刷新完成，
+        以免中断的刷新丢失已取出的记录或占住写连接。
+        """
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await self._task
+            self._task = None
+            self._wakeup = None
+        await self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取队列深度与刷新耗时统计
+
+        Returns:
+            Dict[str, Any]: 写入模式、队列深度、刷新次数、写入条数及耗时（毫秒）
+        """
+        return {
+            "mode": self.mode,
+            "queue_depth": self.queue_depth,
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "max_flush_ms": round(self.max_flush_ms, 3),
+            "avg_flush_ms": round(self._total_flush_ms / self.flushes, 3) if self.flushes else 0.0
+        }
+
+activity_journal = ActivityJournal(
+    mode=settings.ACTIVITY_JOURNAL_MODE,
+    flush_interval_ms=settings.ACTIVITY_FLUSH_INTERVAL_MS,
+    flush_max_rows=settings.ACTIVITY_FLUSH_MAX_ROWS
+)
+
+@event.listens_for(Session, "after_commit")
+def _enqueue_committed(session: Session) -> None:
+    # 业务事务提交成功后，本事务记录的活动才进入写入队列
+    pending = session.info.pop(PENDING_KEY, None)
+    if pending:
+        activity_journal.enqueue(pending)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction) -> None:
+    # 事务回滚时丢弃其中记录的活动
+    session.info.pop(PENDING_KEY, None)
@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import AnyHttpUrl
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Literal
 import secrets
 from functools import lru_cache
 from pathlib import Path
@@ -30,12 +30,67 @@ class Settings(BaseSettings):
             db_path = os.path.join(BASE_DIR, self.SQLITE_URL.replace("sqlite:///./", ""))
             return f"sqlite:///{db_path}"
         return self.SQLITE_URL
+
+    @property
+    def ASYNC_SQLITE_URL(self) -> str:
+        """
+        获取异步驱动（aiosqlite）的数据库URL
+        """
+        return self.SQLITE_URL_WITH_ABS_PATH.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    
+    # SQLite 连接配置（每个连接建立时应用）
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_CACHE_SIZE: int = -65536
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    SQLITE_READER_POOL_SIZE: int = 8
+    # 项目概览每个请求最多同时占用的只读连接数
+    OVERVIEW_MAX_CONCURRENCY: int = 2
+    SQLITE_WRITER_POOL_TIMEOUT: int = 30
     
     # JWT配置
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     
+    # 密码哈希配置
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
+    
+    # 认证缓存配置
+    AUTH_CACHE_MAX_SIZE: int = 1024
+    AUTH_CACHE_TTL_SECONDS: int = 300
+    
+    # 活动记录写入配置
+    ACTIVITY_JOURNAL_MODE: Literal["transaction", "buffered"] = "transaction"
+    ACTIVITY_FLUSH_INTERVAL_MS: int = 200
+    ACTIVITY_FLUSH_MAX_ROWS: int = 500
+    
+    # 成本月度汇总缓存配置（已结束月份的 (项目, 月份) 汇总条目数上限）
+    COST_CACHE_MAX_SIZE: int = 50000
+    
+    # 迭代燃尽图缓存配置（缓存的迭代数上限）
+    SPRINT_CACHE_MAX_SIZE: int = 2000
+    
+    # 请求级 SQL 统计配置
+    SQL_STATEMENT_BUDGET: int = 50  # 单个请求允许执行的语句数
+    SQL_BUDGET_ENFORCE: bool = False  # 测试模式：超出预算的只读请求返回 500
+    SQL_REPEAT_THRESHOLD: int = 5  # 同一语句（参数不同）在一个请求中执行的次数达到此值视为 N+1
+    
+    # SQL 剖析与慢查询日志配置
+    SQL_PROFILE_ENABLED: bool = True
+    SQL_PROFILE_MAX_FINGERPRINTS: int = 1000  # 统计的语句指纹数上限，超出后合并计入 <other>
+    SQL_PROFILE_SAMPLES: int = 512  # 每个指纹保留的耗时样本数，用于计算分位数
+    SQL_SLOW_QUERY_MS: float = 100  # 慢查询阈值（毫秒），0 表示不记录慢查询
+    SQL_SLOW_QUERY_KEEP: int = 100  # 内存中保留的最近慢查询条数
+    SQL_SLOW_QUERY_LOG_FILE: str = ""  # 慢查询日志文件，为空时只写入应用日志
+    
+    # 运行时指标配置（Prometheus 格式的 /metrics）
+    METRICS_ENABLED: bool = True
+    
     # CORS配置
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
     
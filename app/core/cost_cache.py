@@ -0,0 +1,116 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+
+class MonthlyCostCache:
+    """
+    已结束月份成本汇总的有界 LRU 缓存
+
+    以 (项目ID, 月份) 为键，值为该月各成本类型的金额合计（无记录的月份缓存为空字典）。
+    已结束月份通常不再变化，但补录、修改或导入历史成本时需要失效。
+
+    条目对应数据库中持久化的 cost_records 版本号（data_versions，含数据库标识）：
+    任何进程中通过会话提交的成本写入都会递增该版本号，读取时在读快照内取版本号与缓存对齐，
+    版本号变化则清空缓存，因此命令行导入、其他工作进程的写入同样会使缓存失效。
+    绕过会话的写入（如直接执行 SQL 回填）需同时递增 data_versions 中 cost_records 的版本号。
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[int, str], Dict[str, float]]" = OrderedDict()
+        self._data_version: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def sync(self, data_version: Tuple[int, int]) -> bool:
+        """
+        将缓存对齐到读快照中的 cost_records 版本号，在读取缓存之前调用
+
+        版本号比缓存对应的版本新时清空缓存；比缓存对应的版本旧（读快照开始得更早）时
+        本次查询既不应读取也不应写入缓存。
+
+        Args:
+            data_version: (数据库标识, cost_records 版本号)，在调用方的读快照内读取
+
+        Returns:
+            bool: 是否可以使用缓存
+        """
+        with self._lock:
+            current = self._data_version
+            if current == data_version:
+                return True
+            if current is not None and current[0] == data_version[0] and current[1] > data_version[1]:
+                return False
+            self._entries.clear()
+            self._data_version = data_version
+            return True
+
+    def get(self, project_id: int, month: str) -> Optional[Dict[str, float]]:
+        """
+        读取某个项目某月的成本汇总
+
+        Args:
+            project_id: 项目ID
+            month: 月份（YYYY-MM）
+
+        Returns:
+            Optional[Dict[str, float]]: 成本类型 -> 金额，未命中时返回 None
+        """
+        key = (project_id, month)
+        with self._lock:
+            totals = self._entries.get(key)
+            if totals is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return totals
+
+    def put(self, project_id: int, month: str, totals: Dict[str, float], data_version: Tuple[int, int]) -> None:
+        """
+        缓存某个项目某月的成本汇总
+
+        Args:
+            project_id: 项目ID
+            month: 月份（YYYY-MM），必须是已结束的月份
+            totals: 成本类型 -> 金额
+            data_version: 计算所用读快照中的 cost_records 版本号，缓存已对齐到其他版本时丢弃
+        """
+        if self.max_size <= 0:
+            return
+        key = (project_id, month)
+        with self._lock:
+            if self._data_version != data_version:
+                return
+            self._entries[key] = totals
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        清空缓存
+        """
+        with self._lock:
+            self._entries.clear()
+            self._data_version = None
+
+    def stats(self) -> Dict[str, int]:
+        """
+        获取缓存命中统计
+
+        Returns:
+            Dict[str, int]: 命中数、未命中数和当前条目数
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self.max_size
+            }
+
+monthly_cost_cache = MonthlyCostCache(max_size=settings.COST_CACHE_MAX_SIZE)
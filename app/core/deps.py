@@ -1,43 +1,44 @@
-from typing import Generator, List
+from typing import List
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.principal_cache import Principal, principal_cache
+# 与路由共用同一个依赖，保证每个请求只打开一个数据库会话
+from app.db.session import get_db
 from app.models import models
 from app.schemas import schemas
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
-def get_db() -> Generator:
-    """
-    获取数据库会话
-    """
-    try:
-        db = SessionLocal()
-        yield db
-    finally:
-        db.close()
-
-def get_current_user(
-    db: Session = Depends(get_db),
+async def get_current_user(
+    db: AsyncSession = Depends(get_db),
     token: str = Depends(oauth2_scheme)
-) -> models.User:
+) -> Principal:
     """
     获取当前用户
 
+    已验证的令牌会被缓存，命中时既不重复解码令牌也不查询用户表。
+    未命中时查询用户表后即结束该事务，路由的查询从新的读快照开始，
+    路由在第一条查询前读取的缓存版本号不会早于快照。
+
     Args:
         db: 数据库会话
         token: JWT令牌
 
     Returns:
-        models.User: 当前用户
+        Principal: 当前用户快照
 
     Raises:
         HTTPException: 认证失败
     """
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -53,14 +54,26 @@ def get_current_user(
         token_data = schemas.TokenData(username=username)
     except JWTError:
         raise credentials_exception
-    user = db.query(models.User).filter(models.User.username == token_data.username).first()
+    generation = principal_cache.generation(token_data.username)
+    result = await db.execute(
+        select(models.User).where(models.User.username == token_data.username)
+    )
+    user = result.scalars().first()
     if user is None:
         raise credentials_exception
-    return user
+    principal = Principal(
+        id=user.id,
+        username=user.username,
+        is_active=user.is_active,
+        is_superuser=user.is_superuser
+    )
+    await db.rollback()
+    principal_cache.put(token, principal, expires_at=payload.get("exp", 0), generation=generation)
+    return principal
 
 def get_current_active_user(
-    current_user: models.User = Depends(get_current_user),
-) -> models.User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """
     获取当前活跃用户
 
@@ -68,7 +81,7 @@ def get_current_active_user(
         current_user: 当前用户
 
     Returns:
-        models.User: 当前活跃用户
+        Principal: 当前活跃用户
 
     Raises:
         HTTPException: 用户未激活
@@ -81,8 +94,8 @@ def get_current_active_user(
     return current_user
 
 def get_current_active_superuser(
-    current_user: models.User = Depends(get_current_user),
-) -> models.User:
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """
     获取当前超级用户
 
@@ -90,7 +103,7 @@ def get_current_active_superuser(
         current_user: 当前用户
 
     Returns:
-        models.User: 当前超级用户
+        Principal: 当前超级用户
 
     Raises:
         HTTPException: 用户不是超级用户
@@ -104,9 +117,9 @@ def get_current_active_superuser(
 
 def get_current_user_with_scopes(
     required_scopes: List[str],
-    current_user: models.User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     token: str = Depends(oauth2_scheme)
-) -> models.User:
+) -> Principal:
     """
     获取具有特定权限范围的当前用户
 
@@ -116,7 +129,7 @@ def get_current_user_with_scopes(
         token: JWT令牌
 
     Returns:
-        models.User: 具有所需权限的用户
+        Principal: 具有所需权限的用户
 
     Raises:
         HTTPException: 用户没有所需权限
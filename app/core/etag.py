@@ -0,0 +1,77 @@
+import hashlib
+from datetime import datetime
+from typing import Callable, Dict
+
+from fastapi import Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.deps import Principal, get_current_active_user
+from app.db.data_versions import table_versions
+from app.db.session import get_db
+
+# 条件请求响应的缓存策略：浏览器可缓存，但每次使用前必须用 ETag 重新验证
+CACHE_CONTROL = "private, no-cache"
+
+class NotModified(Exception):
+    """
+    请求的 If-None-Match 与当前 ETag 一致，应返回 304
+    """
+    def __init__(self, etag: str):
+        self.etag = etag
+
+async def not_modified_handler(request: Request, exc: NotModified) -> Response:
+    """
+    返回不带响应体的 304
+    """
+    return Response(status_code=304, headers={"ETag": exc.etag, "Cache-Control": CACHE_CONTROL})
+
+def make_etag(request: Request, versions: Dict[str, int], daily: bool = False) -> str:
+    """
+    由请求路径、查询参数和表版本号生成强 ETag
+
+    Args:
+        request: 请求
+        versions: 表名 -> 版本号
+        daily: 响应是否随日期变化（如按天计提的成本），为 True 时加入当前 UTC 日期
+
+    Returns:
+        str: 带引号的 ETag
+    """
+    parts = [request.url.path, str(sorted(request.query_params.multi_items()))]
+    parts += [f"{name}={version}" for name, version in sorted(versions.items())]
+    if daily:
+        parts.append(datetime.utcnow().date().isoformat())
+    return '"%s"' % hashlib.sha256("\n".join(parts).encode()).hexdigest()[:32]
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match 使用弱比较：忽略 W/ 前缀
+    tags = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in tags or etag in {tag[2:] if tag.startswith("W/") else tag for tag in tags}
+
+def conditional_get(*tables: str, daily: bool = False) -> Callable:
+    """
+    生成条件请求依赖：设置 ETag，If-None-Match 一致时直接返回 304
+
+    依赖在认证之后、读取数据行之前执行，304 不会加载或序列化任何数据行。
+
+    Args:
+        tables: 响应内容依赖的表名
+        daily: 响应是否随日期变化
+
+    Returns:
+        Callable: FastAPI 依赖
+    """
+    async def dependency(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(get_db),
+        current_user: Principal = Depends(get_current_active_user)
+    ) -> str:
+        etag = make_etag(request, await table_versions(db, tables), daily)
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise NotModified(etag)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+        return etag
+    return dependency
@@ -0,0 +1,217 @@
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# 请求耗时直方图的桶上限（秒），与 Prometheus 客户端的默认值一致
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# 未匹配到路由的请求（404 等）统一使用此标签，避免任意路径导致标签基数膨胀
+UNMATCHED_ROUTE = "<unmatched>"
+
+# 作为标签值的请求方法，其余方法记为 OTHER
+KNOWN_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+
+# Prometheus 文本格式的 Content-Type
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def route_template(scope) -> str:
+    """
+    由请求路径和路径参数还原路由模板，如 /api/v1/projects/5 -> /api/v1/projects/{project_id}
+
+    路由参数通常位于路径末尾，从右向左按参数倒序替换与参数值相同的路径段。
+    不直接使用 scope["route"].path：新版 FastAPI 中挂载的子路由不包含前缀。
+
+    Args:
+        scope: 路由匹配后的 ASGI scope
+
+    Returns:
+        str: 路由模板；未匹配到路由时为 UNMATCHED_ROUTE
+    """
+    if scope.get("route") is None:
+        return UNMATCHED_ROUTE
+    path = scope["path"]
+    params = list(scope.get("path_params", {}).items())
+    if not params:
+        return path
+    segments = path.split("/")
+    for index in range(len(segments) - 1, -1, -1):
+        if not params:
+            break
+        name, value = params[-1]
+        if segments[index] == str(value):
+            segments[index] = "{" + name + "}"
+            params.pop()
+    return "/".join(segments)
+
+class Histogram:
+    """
+    预先分桶的直方图
+
+    每个桶只保存落入该桶的次数，记录一次只做一次二分查找和三次加法，不分配对象；
+    导出时再累加为 Prometheus 要求的累计计数。
+    """
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        # 桶上限包含等于上限的值（le），最后一个桶为 +Inf
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels) + "}"
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class MetricsWriter:
+    """
+    生成 Prometheus 文本格式（0.0.4）的指标
+    """
+
+    def __init__(self):
+        self._lines: List[str] = []
+
+    def metric(self, name: str, kind: str, help_text: str, samples: Iterable[Tuple[Labels, float]]) -> None:
+        """
+        写入一个 counter 或 gauge 指标
+
+        Args:
+            name: 指标名
+            kind: 类型，counter 或 gauge
+            help_text: 说明
+            samples: (标签, 值)
+        """
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            self._lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    def histogram(self, name: str, help_text: str, series: Iterable[Tuple[Labels, Histogram]]) -> None:
+        """
+        写入一个直方图指标
+
+        Args:
+            name: 指标名
+            help_text: 说明
+            series: (标签, 直方图)
+        """
+        self._lines.append(f"# HELP {name} {help_text}")
+        self._lines.append(f"# TYPE {name} histogram")
+        for labels, histogram in series:
+            cumulative = 0
+            for bound, count in zip(histogram.bounds + (float("inf"),), histogram.counts):
+                cumulative += count
+                bucket_labels = labels + (("le", _format_value(float(bound))),)
+                self._lines.append(f"{name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+            self._lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+            self._lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+    def text(self) -> str:
+        return "\n".join(self._lines) + "\n"
+
+class RequestMetrics:
+    """
+    按 (方法, 路由模板) 统计的请求耗时与状态码
+
+    直方图和计数器在每个 (方法, 路由) 第一次出现时创建，之后的请求只更新已有对象。
+    只在事件循环线程中更新，不需要加锁。
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.in_flight = 0
+        self._latency: Dict[Tuple[str, str], Histogram] = {}
+        self._statuses: Dict[Tuple[str, str, int], int] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        """
+        记录一个已完成的请求
+
+        Args:
+            method: 请求方法
+            route: 路由模板（如 /api/v1/projects/{project_id}）
+            status: 响应状态码
+            seconds: 耗时（秒）
+        """
+        if method not in KNOWN_METHODS:
+            method = "OTHER"
+        key = (method, route)
+        histogram = self._latency.get(key)
+        if histogram is None:
+            histogram = self._latency[key] = Histogram(self.buckets)
+        histogram.observe(seconds)
+        status_key = (method, route, status)
+        self._statuses[status_key] = self._statuses.get(status_key, 0) + 1
+
+    def write(self, writer: MetricsWriter) -> None:
+        """
+        导出请求指标
+        """
+        writer.metric(
+            "http_requests_in_flight", "gauge", "Requests currently being processed",
+            [((), self.in_flight)]
+        )
+        writer.histogram(
+            "http_request_duration_seconds", "Request latency by route template",
+            [((("method", method), ("route", route)), histogram)
+             for (method, route), histogram in sorted(self._latency.items())]
+        )
+        writer.metric(
+            "http_requests_total", "counter", "Completed requests by route template and status code",
+            [((("method", method), ("route", route), ("status", str(status))), count)
+             for (method, route, status), count in sorted(self._statuses.items())]
+        )
+
+request_metrics = RequestMetrics()
+
+class MetricsMiddleware:
+    """
+    记录请求耗时、状态码和处理中请求数的 ASGI 中间件
+
+    直接实现 ASGI 接口而不是基于 BaseHTTPMiddleware，不为每个请求创建额外的任务和流；
+    路由模板在请求处理完成后由 scope 中的路径参数还原，耗时包含响应体发送完成的时间。
+    """
+
+    def __init__(self, app, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # 应用抛出异常时不会发送响应头，记为 500
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics = self.metrics
+        metrics.in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_flight -= 1
+            metrics.observe(scope["method"], route_template(scope), status, time.perf_counter() - started)
@@ -1,14 +1,29 @@
+import logging
+import time
+
 from fastapi import Request
+from fastapi.responses import JSONResponse
+
 from app.core.config import settings
+from app.db.query_counter import RequestQueries, current_queries
+
+logger = logging.getLogger(__name__)
 
 # 定义不需要认证的路由
 PUBLIC_ROUTES = [
     f"{settings.API_V1_STR}/auth/login",
     f"{settings.API_V1_STR}/auth/register",
     f"{settings.API_V1_STR}/openapi.json",
+    "/metrics",
     "/"
 ]
 
+# 只读方法：处理过程中没有提交写入，超出语句预算时可以替换响应
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# 超出语句预算时附加的响应头，值为 "<语句数>/<预算>"
+SQL_BUDGET_HEADER = "X-SQL-Budget-Exceeded"
+
 async def public_routes_middleware(request: Request, call_next):
     """
     公开路由中间件
@@ -27,4 +42,53 @@ async def public_routes_middleware(request: Request, call_next):
         return response
     
     # 对于非公开路由，让 OAuth2 处理认证
-    return await call_next(request) 
\ No newline at end of file
+    return await call_next(request)
+
+
+async def sql_timing_middleware(request: Request, call_next):
+    """
+    请求级 SQL 统计中间件
+
+    统计请求内执行的语句数和数据库耗时，写入 Server-Timing 响应头；同一语句（参数不同）
+    重复执行达到 SQL_REPEAT_THRESHOLD 次时记录 N+1 警告。语句数超出 SQL_STATEMENT_BUDGET 时
+    记录警告并附加 X-SQL-Budget-Exceeded 响应头；SQL_BUDGET_ENFORCE 开启时（测试模式），
+    超出预算的只读请求改为返回 500。写请求的处理函数此时已经提交，响应保持不变，只以响应头标记。
+
+    Args:
+        request: 请求对象
+        call_next: 下一个处理函数
+
+    Returns:
+        Response: 响应对象
+    """
+    route = f"{request.method} {request.url.path}"
+    queries = RequestQueries(route)
+    token = current_queries.set(queries)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        current_queries.reset(token)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    repeated = queries.repeated(settings.SQL_REPEAT_THRESHOLD)
+    for statement, count in repeated:
+        logger.warning(f"疑似 N+1 查询: {route} 执行同一语句 {count} 次: {' '.join(statement.split())[:200]}")
+    over_budget = queries.count > settings.SQL_STATEMENT_BUDGET
+    if over_budget:
+        logger.warning(f"SQL 语句数超出预算: {route} 执行 {queries.count} 条，预算 {settings.SQL_STATEMENT_BUDGET}")
+        if settings.SQL_BUDGET_ENFORCE and request.method in SAFE_METHODS:
+            response = JSONResponse(status_code=500, content={
+                "detail": f"SQL statement budget exceeded: {queries.count} > {settings.SQL_STATEMENT_BUDGET}"
+            })
+
+    timings = [
+        f'db;dur={queries.seconds * 1000:.2f};desc="{queries.count} queries"',
+        f"app;dur={elapsed_ms:.2f}"
+    ]
+    if repeated:
+        timings.append(f'db-repeat;desc="{len(repeated)} repeated, max {repeated[0][1]}x"')
+    response.headers["Server-Timing"] = ", ".join(timings)
+    if over_budget:
+        response.headers[SQL_BUDGET_HEADER] = f"{queries.count}/{settings.SQL_STATEMENT_BUDGET}"
+    return response
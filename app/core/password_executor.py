@@ -0,0 +1,82 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+class PasswordHashExecutor:
+    """
+    专用于 bcrypt 计算的有界线程池
+
+    bcrypt 在计算时释放 GIL，放到独立线程池中执行既不阻塞事件循环，也不占用
+    处理普通请求的 anyio 工作线程。排队任务数超过上限时直接返回 503，
+    避免登录风暴拖垮其他接口。
+    """
+
+    def __init__(self, max_workers: int, queue_limit: int):
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self.rejected = 0
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hash"
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        正在执行和排队等待的任务数
+        """
+        return self._in_flight
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        在线程池中执行 func 并等待结果
+
+        Args:
+            func: 要执行的函数
+            *args: 函数参数
+
+        Returns:
+            Any: 函数返回值
+
+        Raises:
+            HTTPException: 排队任务已满
+        """
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.queue_limit:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many concurrent authentication requests, please retry later",
+                    headers={"Retry-After": "1"},
+                )
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(func, *args)
+        except BaseException:
+            self._release()
+            raise
+        # 在线程中的任务结束时才计数减一：请求被取消后任务仍占用线程，不能提前让出名额
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future: Any = None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def shutdown(self) -> None:
+        """
+        关闭线程池，等待已提交的任务完成
+        """
+        self._executor.shutdown(wait=True)
+
+password_executor = PasswordHashExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT
+)
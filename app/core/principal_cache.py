@@ -0,0 +1,182 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models import models
+
+# 会话 info 中暂存本事务修改过的用户的键，值为 用户ID -> 用户名集合
+CHANGED_USERS_KEY = "changed_principal_users"
+
+class Principal(NamedTuple):
+    """
+    已认证用户的快照，缓存于令牌缓存中，避免每个请求都查询用户表
+    """
+    id: int
+    username: str
+    is_active: bool
+    is_superuser: bool
+
+class PrincipalCache:
+    """
+    已验证令牌到用户快照的有界 LRU 缓存
+
+    以令牌的 SHA-256 摘要为键，条目在令牌过期时间与 TTL 上限中较早者失效；
+    用户记录被更新或删除时，事务提交后按用户ID失效。
+
+    每个用户名带一个代数，失效时递增；查询用户表前取代数，写入缓存时代数已变化则丢弃，
+    避免与写事务并发的认证把旧快照写回缓存。
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[Principal, float]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def generation(self, username: str) -> int:
+        """
+        读取用户的缓存代数，在查询用户表之前调用
+
+        Args:
+            username: 令牌中的用户名
+
+        Returns:
+            int: 代数
+        """
+        with self._lock:
+            return self._generations.get(username, 0)
+
+    def get(self, token: str) -> Optional[Principal]:
+        """
+        读取令牌对应的用户快照
+
+        Args:
+            token: JWT令牌
+
+        Returns:
+            Optional[Principal]: 未命中或已过期时返回 None
+        """
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, token: str, principal: Principal, expires_at: float, generation: int) -> None:
+        """
+        缓存令牌对应的用户快照
+
+        Args:
+            token: 已验证的JWT令牌
+            principal: 用户快照
+            expires_at: 令牌过期时间（Unix时间戳）
+            generation: 查询用户表前读取的代数
+        """
+        if self.max_size <= 0:
+            return
+        expires_at = min(expires_at, time.time() + self.ttl_seconds)
+        key = self._key(token)
+        with self._lock:
+            if self._generations.get(principal.username, 0) != generation:
+                return
+            self._entries[key] = (principal, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: int, usernames: Iterable[str] = ()) -> None:
+        """
+        使某个用户的所有缓存条目失效
+
+        Args:
+            user_id: 用户ID
+            usernames: 用户的用户名（改名时包括旧用户名），递增其代数
+        """
+        with self._lock:
+            for username in set(usernames):
+                self._generations[username] = self._generations.get(username, 0) + 1
+            stale = [key for key, (principal, _) in self._entries.items() if principal.id == user_id]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """
+        清空缓存
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        获取缓存命中统计
+
+        Returns:
+            Dict[str, int]: 命中数、未命中数和当前条目数
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self.max_size
+            }
+
+principal_cache = PrincipalCache(
+    max_size=settings.AUTH_CACHE_MAX_SIZE,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+def mark_user_changed(db: Any, user_id: int, usernames: Iterable[Optional[str]]) -> None:
+    """
+    登记本事务中修改或删除的用户，事务提交后使其缓存的快照失效
+
+    Args:
+        db: 数据库会话（AsyncSession 或 Session）
+        user_id: 用户ID
+        usernames: 用户名（改名时包括旧用户名）
+    """
+    session = getattr(db, "sync_session", db)
+    session.info.setdefault(CHANGED_USERS_KEY, {}).setdefault(user_id, set()).update(
+        username for username in usernames if username is not None
+    )
+
+@event.listens_for(models.User, "after_update")
+@event.listens_for(models.User, "after_delete")
+def _mark_user(mapper, connection, target: models.User) -> None:
+    # 用户被修改（如停用、权限变更）或删除时，丢弃其缓存的快照
+    session = object_session(target)
+    if session is None:
+        principal_cache.invalidate_user(target.id, [target.username])
+        return
+    previous = inspect(target).attrs.username.history.deleted or ()
+    mark_user_changed(session, target.id, [target.username, *previous])
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    # 提交后才失效：提交前失效的话，并发认证可能在提交前读到旧数据并重新缓存
+    changed = session.info.pop(CHANGED_USERS_KEY, None)
+    for user_id, usernames in (changed or {}).items():
+        principal_cache.invalidate_user(user_id, usernames)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction) -> None:
+    session.info.pop(CHANGED_USERS_KEY, None)
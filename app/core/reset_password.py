@@ -1,12 +1,11 @@
 from sqlalchemy.orm import Session
 from app.core.security import get_password_hash
 from app.models.models import User
-from app.core.deps import get_db
-from app.db.session import engine
+from app.db.session import SessionLocal
 
 def reset_admin_password():
     # 获取数据库会话
-    db = next(get_db())
+    db = SessionLocal()
     
     # 获取管理员用户
     admin = db.query(User).filter(User.username == "admin").first()
@@ -1,15 +1,19 @@
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Optional, Tuple, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.password_executor import password_executor
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from app.core.deps import get_db
-from app.models import models
+# 认证依赖统一由 deps 提供（带令牌缓存），此处保留导出以兼容现有引用
+from app.core.deps import get_current_user
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/v1/auth/login")
 
@@ -71,6 +75,42 @@ def get_password_hash(password: str) -> str:
     """
     return pwd_context.hash(password)
 
+async def verify_and_update_password(
+    plain_password: str,
+    hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    在密码哈希线程池中验证密码，并在哈希成本变化时给出新哈希
+
+    Args:
+        plain_password: 明文密码
+        hashed_password: 哈希后的密码
+
+    Returns:
+        Tuple[bool, Optional[str]]: 密码是否匹配，以及需要替换的新哈希（无需更新时为 None）
+
+    Raises:
+        HTTPException: 密码哈希线程池已满
+    """
+    return await password_executor.run(
+        pwd_context.verify_and_update, plain_password, hashed_password
+    )
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    在密码哈希线程池中计算密码哈希值
+
+    Args:
+        password: 明文密码
+
+    Returns:
+        str: 哈希后的密码
+
+    Raises:
+        HTTPException: 密码哈希线程池已满
+    """
+    return await password_executor.run(pwd_context.hash, password)
+
 def verify_token(token: str) -> bool:
     """
     验证令牌是否有效
@@ -116,38 +156,3 @@ def get_token_payload(token: str) -> dict:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
         )
-
-async def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> models.User:
-    """
-    获取当前用户
-    
-    Args:
-        token: JWT令牌
-        db: 数据库会话
-        
-    Returns:
-        models.User: 当前用户
-        
-    Raises:
-        HTTPException: 令牌无效或用户不存在
-    """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = get_token_payload(token)
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-    except Exception:
-        raise credentials_exception
-    
-    user = db.query(models.User).filter(models.User.username == username).first()
-    if user is None:
-        raise credentials_exception
-    return user 
\ No newline at end of file
@@ -0,0 +1,164 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.core.config import settings
+from app.models import models
+
+# 会话 info 中暂存本事务需要失效燃尽图缓存的迭代ID的键
+CHANGED_SPRINTS_KEY = "changed_burndown_sprints"
+
+class SprintBurndownCache:
+    """
+    迭代燃尽图计算状态的有界 LRU 缓存
+
+    以迭代ID为键，值为燃尽图的累加状态（已处理到的事件ID、按天的增量及每个任务当前计入的工时）。
+    已关闭迭代的状态不再更新；进行中迭代的状态只需读取新增的状态事件。
+    迭代的日期或状态变化时，事务提交后按迭代失效；任务预估工时的变化以状态事件增量处理。
+
+    每个迭代带一个版本号，失效时递增；写入缓存时版本号已变化则丢弃，
+    避免与写事务并发的查询把旧状态写回缓存。
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, Any]" = OrderedDict()
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def version(self, sprint_id: int) -> int:
+        """
+        读取迭代的缓存版本号，在查询数据库之前调用
+
+        Args:
+            sprint_id: 迭代ID
+
+        Returns:
+            int: 版本号
+        """
+        with self._lock:
+            return self._versions.get(sprint_id, 0)
+
+    def versions(self) -> Dict[int, int]:
+        """
+        读取所有失效过的迭代的缓存版本号，在查询数据库之前调用
+
+        用于查询前尚不知道涉及哪些迭代的场景，其余迭代的版本号为 0（用 .get(sprint_id, 0) 读取）。
+
+        Returns:
+            Dict[int, int]: 迭代ID -> 版本号
+        """
+        with self._lock:
+            return dict(self._versions)
+
+    def get(self, sprint_id: int) -> Optional[Any]:
+        """
+        读取迭代的燃尽图状态
+
+        Args:
+            sprint_id: 迭代ID
+
+        Returns:
+            Optional[Any]: 燃尽图状态，未命中时返回 None
+        """
+        with self._lock:
+            state = self._entries.get(sprint_id)
+            if state is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(sprint_id)
+            self.hits += 1
+            return state
+
+    def put(self, sprint_id: int, state: Any, version: int) -> None:
+        """
+        缓存迭代的燃尽图状态
+
+        Args:
+            sprint_id: 迭代ID
+            state: 燃尽图状态，缓存后不应再修改
+            version: 查询前读取的迭代版本号
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if self._versions.get(sprint_id, 0) != version:
+                return
+            self._entries[sprint_id] = state
+            self._entries.move_to_end(sprint_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate_sprints(self, sprint_ids: Iterable[int]) -> None:
+        """
+        使迭代的缓存失效
+
+        Args:
+            sprint_ids: 迭代ID
+        """
+        with self._lock:
+            for sprint_id in set(sprint_ids):
+                self._versions[sprint_id] = self._versions.get(sprint_id, 0) + 1
+                self._entries.pop(sprint_id, None)
+
+    def clear(self) -> None:
+        """
+        清空缓存
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        获取缓存命中统计
+
+        Returns:
+            Dict[str, int]: 命中数、未命中数和当前条目数
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "max_size": self.max_size
+            }
+
+sprint_burndown_cache = SprintBurndownCache(max_size=settings.SPRINT_CACHE_MAX_SIZE)
+
+def mark_sprints_changed(db: Any, sprint_ids: Iterable[Optional[int]]) -> None:
+    """
+    登记本事务中需要重新计算燃尽图的迭代，事务提交后使其缓存失效
+
+    迭代的修改、删除会自动登记；任务状态、预估工时和所属迭代的变化
+    通过状态事件增量处理，不需要登记。
+
+    Args:
+        db: 数据库会话（AsyncSession 或 Session）
+        sprint_ids: 迭代ID
+    """
+    session = getattr(db, "sync_session", db)
+    session.info.setdefault(CHANGED_SPRINTS_KEY, set()).update(
+        sprint_id for sprint_id in sprint_ids if sprint_id is not None
+    )
+
+@event.listens_for(models.Sprint, "after_update")
+@event.listens_for(models.Sprint, "after_delete")
+def _mark_sprint(mapper, connection, target: models.Sprint) -> None:
+    session = object_session(target)
+    if session is not None:
+        mark_sprints_changed(session, [target.id])
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    changed = session.info.pop(CHANGED_SPRINTS_KEY, None)
+    if changed:
+        sprint_burndown_cache.invalidate_sprints(changed)
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction) -> None:
+    session.info.pop(CHANGED_SPRINTS_KEY, None)
@@ -0,0 +1,178 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 单次计算允许的最大天数（按天汇总时结果按天展开，范围更小）
+ACCRUAL_MAX_DAYS = {"day": 366, "month": 3700}
+
+GRANULARITIES = ("day", "month")
+
+# 日期为空时的占位：开始日期为空视为很早开始，结束日期为空视为仍在进行
+EARLIEST = np.datetime64("1900-01-01", "D")
+LATEST = np.datetime64("9999-12-31", "D")
+
+class Accruals(NamedTuple):
+    """
+    按月计费的区间，每个字段是长度相同的数组，一个元素对应一个区间
+
+    区间内每天计入 monthly_amount ÷ 当月天数；start 为生效首日，end 为失效首日（不含）。
+    member_id 用于按成员分列，与成员无关的区间（如项目固定成本）为 0。
+    """
+    project_id: np.ndarray
+    member_id: np.ndarray
+    monthly_amount: np.ndarray
+    start: np.ndarray  # datetime64[D]
+    end: np.ndarray  # datetime64[D]
+
+class AccrualResult(NamedTuple):
+    """
+    按时段汇总的计算结果
+
+    amounts[i, j] 为第 i 组（项目，或项目与成员）在第 j 个时段的金额。
+    """
+    periods: List[str]
+    project_ids: np.ndarray
+    member_ids: Optional[np.ndarray]
+    amounts: np.ndarray
+
+def to_days(values: Sequence[Optional[datetime]], fill: np.datetime64) -> np.ndarray:
+    """
+    将日期列转换为 datetime64[D] 数组，空值以 fill 代替
+    """
+    days = np.array(values, dtype="datetime64[D]").reshape(-1)
+    return np.where(np.isnat(days), fill, days)
+
+def inclusive_end(values: Sequence[Optional[datetime]]) -> np.ndarray:
+    """
+    将“最后一天”（含）转换为区间右端（不含），空值视为仍在进行
+    """
+    one_day = np.timedelta64(1, "D")
+    return to_days(values, LATEST - one_day) + one_day
+
+def _periods(first: np.datetime64, n_days: int, granularity: str) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    # 时段边界（相对起始日的下标，共 K+1 个）及每个时段所在月份的天数；时段不跨月
+    days = first + np.arange(n_days)
+    months = days.astype("datetime64[M]")
+    days_in_month = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(float)
+    if granularity == "day":
+        starts = np.arange(n_days)
+        labels = [str(day) for day in days]
+    else:
+        starts = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+        labels = [str(month) for month in months[starts]]
+    return labels, np.r_[starts, n_days], days_in_month[starts]
+
+def compute_accruals(
+    accruals: Accruals,
+    start: datetime,
+    end: datetime,
+    granularity: str = "month",
+    by_member: bool = False,
+    project_ids: Optional[Sequence[int]] = None
+) -> AccrualResult:
+    """
+    按天折算月度金额并按时段汇总
+
+    某天的金额为月度金额 ÷ 当月天数。各区间与各时段的重叠天数以数组广播一次算出
+    （区间数 × 时段数），再按分组排序后分段求和，不按天循环。
+
+    Args:
+        accruals: 计费区间
+        start: 起始日期（含）
+        end: 结束日期（不含）
+        granularity: 汇总时段，day 或 month
+        by_member: 是否按项目与成员分组，否则按项目分组
+        project_ids: 按项目分组时结果中必须包含的项目（没有区间时金额为 0）
+
+    Returns:
+        AccrualResult: 计算结果
+
+    Raises:
+        ValueError: 日期范围或时段无效
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}")
+    first = np.datetime64(start.date(), "D")
+    n_days = int((np.datetime64(end.date(), "D") - first).astype(int))
+    if n_days <= 0:
+        raise ValueError("start_date must be earlier than end_date")
+    max_days = ACCRUAL_MAX_DAYS[granularity]
+    if n_days > max_days:
+        raise ValueError(f"Range must not exceed {max_days} days for granularity {granularity}")
+
+    # 分组键；按项目分组时补入没有区间的项目
+    if by_member:
+        keys = np.stack([accruals.project_id, accruals.member_id], axis=1)
+        groups, inverse = np.unique(keys, axis=0, return_inverse=True)
+    else:
+        extra = np.array(project_ids if project_ids is not None else [], dtype=np.int64)
+        groups, inverse = np.unique(np.concatenate([accruals.project_id, extra]), return_inverse=True)
+    inverse = inverse.reshape(-1)[:len(accruals.project_id)]
+
+    labels, bounds, days_in_month = _periods(first, n_days, granularity)
+    amounts = np.zeros((len(groups), len(labels)))
+
+    # 只保留与 [start, end) 相交的区间，转换为相对起始日的下标
+    begin = (accruals.start - first).astype(np.int64)
+    stop = (accruals.end - first).astype(np.int64)
+    active = (stop > 0) & (begin < n_days) & (stop > begin) & (accruals.monthly_amount != 0)
+    if active.any():
+        begin, stop, inverse = begin[active], stop[active], inverse[active]
+        overlap = np.clip(
+            np.minimum(stop[:, None], bounds[None, 1:]) - np.maximum(begin[:, None], bounds[None, :-1]), 0, None
+        )
+        cost = overlap * (accruals.monthly_amount[active][:, None] / days_in_month[None, :])
+        # 按分组排序后分段求和
+        order = np.argsort(inverse, kind="stable")
+        sorted_groups = inverse[order]
+        segments = np.flatnonzero(np.r_[True, sorted_groups[1:] != sorted_groups[:-1]])
+        amounts[sorted_groups[segments]] = np.add.reduceat(cost[order], segments, axis=0)
+
+    amounts = np.round(amounts, 2)
+    if by_member:
+        return AccrualResult(labels, groups[:, 0], groups[:, 1], amounts)
+    return AccrualResult(labels, groups, None, amounts)
+
+def total_between(accruals: Accruals, start: datetime, end: datetime) -> float:
+    """
+    计算 [start, end) 内的金额合计，范围超过单次计算上限时分段计算
+
+    Args:
+        accruals: 计费区间
+        start: 起始日期（含）
+        end: 结束日期（不含）
+
+    Returns:
+        float: 金额合计
+    """
+    total = 0.0
+    while start < end:
+        chunk_end = min(end, start + timedelta(days=ACCRUAL_MAX_DAYS["month"]))
+        total += float(compute_accruals(accruals, start, chunk_end).amounts.sum())
+        start = chunk_end
+    return round(total, 2)
+
+def to_report(result: AccrualResult, granularity: str) -> Dict[str, Any]:
+    """
+    将计算结果转换为接口响应
+
+    Args:
+        result: 计算结果
+        granularity: 汇总时段
+
+    Returns:
+        Dict[str, Any]: 时段标签及每组的各时段金额与合计
+    """
+    totals = np.round(result.amounts.sum(axis=1), 2)
+    member_ids = result.member_ids.tolist() if result.member_ids is not None else [None] * len(totals)
+    return {
+        "granularity": granularity,
+        "periods": result.periods,
+        "items": [
+            {"project_id": project_id, "member_id": member_id, "total": total, "amounts": amounts}
+            for project_id, member_id, total, amounts in zip(
+                result.project_ids.tolist(), member_ids, totals.tolist(), result.amounts.tolist()
+            )
+        ]
+    }
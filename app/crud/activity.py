@@ -1,31 +1,47 @@
-from sqlalchemy.orm import Session
-from app.models import models
-from app.schemas import schemas
+from typing import Any, Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.activity_journal import activity_journal
 
-def create_activity(
-    db: Session,
+def record_activity(
+    db: AsyncSession,
     user_id: int,
     activity_type: str,
-    content: str
-) -> models.Activity:
+    content: str,
+    project_id: Optional[int] = None,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[int] = None
+) -> None:
     """
-    创建活动记录
-    
+    在调用方的事务中记录活动，不提交
+
+    活动随调用方的下一次提交写入：transaction 模式下与业务数据同一事务提交，
+    buffered 模式下在提交后由活动日志批量写入，见 ActivityJournal。
+
     Args:
         db: 数据库会话
         user_id: 用户ID
         activity_type: 活动类型
         content: 活动内容
-    
-    Returns:
-        Activity: 创建的活动记录
+        project_id: 活动所属项目ID，项目活动流按此过滤
+        entity_type: 活动对象类型，如 project、sprint、task
+        entity_id: 活动对象ID
     """
-    activity = models.Activity(
+    activity_journal.record(
+        db,
         user_id=user_id,
         type=activity_type,
-        content=content
+        content=content,
+        project_id=project_id,
+        entity_type=entity_type,
+        entity_id=entity_id
     )
-    db.add(activity)
-    db.commit()
-    db.refresh(activity)
-    return activity 
\ No newline at end of file
+
+async def record_activities(db: AsyncSession, activities: List[Dict[str, Any]]) -> None:
+    """
+    在调用方的事务中批量记录活动，不提交
+
+    Args:
+        db: 数据库会话
+        activities: 活动记录字段列表（user_id、type、content、project_id、entity_type、entity_id）
+    """
+    await activity_journal.record_many(db, activities)
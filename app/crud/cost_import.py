@@ -0,0 +1,339 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from fastapi import UploadFile
+from openpyxl import load_workbook
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.db.session import AsyncSessionLocal
+from app.models import models
+
+logger = logging.getLogger(__name__)
+
+COST_TYPES = ("fixed", "human", "other")
+REQUIRED_COLUMNS = ("project_id", "record_date", "cost_type", "amount")
+SUPPORTED_SUFFIXES = (".csv", ".xlsx")
+
+# 每个事务导入的行数
+IMPORT_CHUNK_SIZE = 5000
+
+# 导入批次中最多保留的行级错误数
+IMPORT_MAX_ERRORS = 1000
+
+# 进行中的导入状态，同一文件处于这些状态时不能再次导入
+IN_PROGRESS_STATUSES = ("pending", "running")
+
+def _normalize_columns(columns) -> List[str]:
+    return [str(column).strip().lower() for column in columns]
+
+def check_columns(columns) -> None:
+    """
+    检查表头是否包含必需的列
+
+    Raises:
+        ValueError: 缺少必需的列
+    """
+    missing = [column for column in REQUIRED_COLUMNS if column not in _normalize_columns(columns)]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+def read_columns(path: str, suffix: str) -> List[str]:
+    """
+    读取文件表头
+
+    Args:
+        path: 文件路径
+        suffix: 文件扩展名（.csv 或 .xlsx）
+
+    Returns:
+        List[str]: 列名
+    """
+    if suffix == ".csv":
+        return list(pd.read_csv(path, nrows=0, encoding="utf-8-sig").columns)
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        return list(next(workbook.active.iter_rows(max_row=1, values_only=True), ()))
+    finally:
+        workbook.close()
+
+def iter_chunks(path: str, suffix: str, chunk_size: int = IMPORT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    分块读取 CSV/XLSX 文件
+
+    每块附带 row 列（数据行序号，从 1 开始，不含表头和空行），用于错误报告和断点续传。
+
+    Args:
+        path: 文件路径
+        suffix: 文件扩展名（.csv 或 .xlsx）
+        chunk_size: 每块行数
+
+    Yields:
+        pd.DataFrame: 数据块
+    """
+    offset = 0
+    if suffix == ".csv":
+        reader = pd.read_csv(
+            path, chunksize=chunk_size, dtype=str, keep_default_na=False, encoding="utf-8-sig"
+        )
+        for chunk in reader:
+            chunk.columns = _normalize_columns(chunk.columns)
+            chunk["row"] = np.arange(offset + 1, offset + len(chunk) + 1)
+            offset += len(chunk)
+            yield chunk
+        return
+
+    # openpyxl 只读模式按行读取，不把整个工作表载入内存
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = _normalize_columns(next(rows, ()))
+        batch = []
+        for values in rows:
+            if all(value is None for value in values):
+                continue
+            batch.append(values)
+            if len(batch) == chunk_size:
+                chunk = pd.DataFrame(batch, columns=header)
+                chunk["row"] = np.arange(offset + 1, offset + len(chunk) + 1)
+                offset += len(chunk)
+                batch = []
+                yield chunk
+        if batch:
+            chunk = pd.DataFrame(batch, columns=header)
+            chunk["row"] = np.arange(offset + 1, offset + len(chunk) + 1)
+            yield chunk
+    finally:
+        workbook.close()
+
+def _parse_dates(values: pd.Series) -> pd.Series:
+    try:
+        # pandas 2 默认按首个值推断格式，显式声明 ISO 8601 以允许日期与日期时间混用
+        return pd.to_datetime(values, errors="coerce", format="ISO8601")
+    except (TypeError, ValueError):
+        return pd.to_datetime(values, errors="coerce")
+
+def validate_chunk(chunk: pd.DataFrame, project_ids: Set[int]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    向量化校验一个数据块
+
+    Args:
+        chunk: 数据块
+        project_ids: 数据块中引用且存在的项目ID
+
+    Returns:
+        Tuple[List[Dict], List[Dict]]: (可插入的成本记录, 行级错误)
+    """
+    project_id = pd.to_numeric(chunk["project_id"], errors="coerce")
+    record_date = _parse_dates(chunk["record_date"])
+    cost_type = chunk["cost_type"].fillna("").astype(str).str.strip().str.lower()
+    amount = pd.to_numeric(chunk["amount"], errors="coerce")
+    if "description" in chunk.columns:
+        description = chunk["description"].where(chunk["description"].notna(), None)
+    else:
+        description = pd.Series(None, index=chunk.index, dtype=object)
+
+    valid_project_id = project_id.notna() & (project_id % 1 == 0)
+    checks = [
+        (~valid_project_id, "invalid project_id"),
+        (valid_project_id & ~project_id.isin(project_ids), "project not found"),
+        (record_date.isna(), "invalid record_date"),
+        (~cost_type.isin(COST_TYPES), f"cost_type must be one of {', '.join(COST_TYPES)}"),
+        (~np.isfinite(amount.astype(float)), "invalid amount"),
+    ]
+    messages = pd.Series("", index=chunk.index)
+    for mask, message in checks:
+        messages = messages.where(~mask, messages + "; " + message)
+    failed = messages != ""
+
+    errors = [
+        {"row": int(row), "error": message.lstrip("; ")}
+        for row, message in zip(chunk["row"][failed], messages[failed])
+    ]
+    ok = ~failed
+    records = [
+        {
+            "project_id": int(pid),
+            "record_date": date.to_pydatetime(),
+            "cost_type": ctype,
+            "amount": float(value),
+            "description": desc
+        }
+        for pid, date, ctype, value, desc in zip(
+            project_id[ok], record_date[ok], cost_type[ok], amount[ok], description[ok]
+        )
+    ]
+    return records, errors
+
+async def save_upload(upload: UploadFile) -> Tuple[str, str]:
+    """
+    将上传文件写入临时文件，同时计算内容的 SHA-256
+
+    Args:
+        upload: 上传文件
+
+    Returns:
+        Tuple[str, str]: (临时文件路径, 内容哈希)
+    """
+    digest = hashlib.sha256()
+    suffix = Path(upload.filename or "").suffix.lower()
+    with tempfile.NamedTemporaryFile(prefix="cost_import_", suffix=suffix, delete=False) as output:
+        while True:
+            data = await upload.read(1024 * 1024)
+            if not data:
+                break
+            digest.update(data)
+            output.write(data)
+    return output.name, digest.hexdigest()
+
+def file_hash(path: str) -> str:
+    """
+    计算文件内容的 SHA-256
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for data in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(data)
+    return digest.hexdigest()
+
+async def get_import(db: AsyncSession, import_id: int) -> Optional[models.CostImport]:
+    result = await db.execute(select(models.CostImport).where(models.CostImport.id == import_id))
+    return result.scalars().first()
+
+async def create_import(
+    db: AsyncSession,
+    filename: str,
+    content_hash: str,
+    user_id: Optional[int],
+    resume_in_progress: bool = False
+) -> Tuple[models.CostImport, bool]:
+    """
+    登记导入批次，按内容哈希去重
+
+    同一文件已导入完成或正在导入时不再导入；上次导入失败时复用原批次，
+    从已提交的行之后继续。
+
+    Args:
+        db: 数据库会话
+        filename: 文件名
+        content_hash: 文件内容哈希
+        user_id: 操作用户ID
+        resume_in_progress: 是否接管处于进行中状态的批次（进程被强制终止后由命令行恢复）
+
+    Returns:
+        Tuple[CostImport, bool]: (导入批次, 是否需要执行导入)
+    """
+    result = await db.execute(
+        select(models.CostImport).where(models.CostImport.content_hash == content_hash)
+    )
+    job = result.scalars().first()
+    if job is not None:
+        resumable = job.status == "failed" or (resume_in_progress and job.status in IN_PROGRESS_STATUSES)
+        if not resumable:
+            return job, False
+        job.status = "pending"
+        job.finished_at = None
+    else:
+        job = models.CostImport(
+            filename=filename,
+            content_hash=content_hash,
+            status="pending",
+            total_rows=0,
+            processed_rows=0,
+            imported_rows=0,
+            failed_rows=0,
+            errors="[]",
+            created_by=user_id
+        )
+        db.add(job)
+    await db.commit()
+    return job, True
+
+async def _existing_project_ids(db: AsyncSession, chunk: pd.DataFrame) -> Set[int]:
+    project_id = pd.to_numeric(chunk["project_id"], errors="coerce")
+    wanted = {int(v) for v in project_id.dropna().unique() if v % 1 == 0}
+    if not wanted:
+        return set()
+    result = await db.execute(select(models.Project.id).where(models.Project.id.in_(wanted)))
+    return set(result.scalars().all())
+
+async def run_import(
+    import_id: int,
+    path: str,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    progress: Optional[Callable[[models.CostImport], None]] = None,
+    remove_file: bool = False
+) -> Optional[models.CostImport]:
+    """
+    执行导入
+
+    文件分块解析（在线程池中进行），每块一次 IN 查询校验项目，向量化校验其余字段，
+    有效行以一次批量插入写入；每块的数据与批次进度在同一事务中提交，
+    因此中断后可从 processed_rows 之后继续。
+
+    Args:
+        import_id: 导入批次ID
+        path: 文件路径
+        chunk_size: 每个事务导入的行数
+        progress: 每块提交后的回调
+        remove_file: 结束后是否删除文件（上传的临时文件）
+
+    Returns:
+        Optional[CostImport]: 导入批次，不存在时返回 None
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            job = await get_import(db, import_id)
+            if job is None:
+                return None
+            skip = job.processed_rows or 0
+            errors = json.loads(job.errors or "[]")
+            job.status = "running"
+            await db.commit()
+
+            chunks = iter_chunks(path, Path(path).suffix.lower(), chunk_size)
+            try:
+                while True:
+                    chunk = await run_in_threadpool(next, chunks, None)
+                    if chunk is None:
+                        break
+                    job.total_rows = int(chunk["row"].iloc[-1])
+                    chunk = chunk[chunk["row"] > skip]
+                    if chunk.empty:
+                        continue
+
+                    records, chunk_errors = validate_chunk(chunk, await _existing_project_ids(db, chunk))
+                    if records:
+                        await db.execute(insert(models.CostRecord), records)
+                    errors.extend(chunk_errors[:max(IMPORT_MAX_ERRORS - len(errors), 0)])
+                    job.processed_rows = int(chunk["row"].iloc[-1])
+                    job.imported_rows += len(records)
+                    job.failed_rows += len(chunk_errors)
+                    job.errors = json.dumps(errors, ensure_ascii=False)
+                    await db.commit()
+                    if progress:
+                        progress(job)
+                job.status = "completed"
+            except Exception as exc:
+                logger.exception(f"Cost import {import_id} failed")
+                await db.rollback()
+                await db.refresh(job)
+                job.status = "failed"
+                job.errors = json.dumps(
+                    json.loads(job.errors or "[]") + [{"row": None, "error": str(exc)}], ensure_ascii=False
+                )
+            job.finished_at = datetime.utcnow()
+            await db.commit()
+            return job
+    finally:
+        if remove_file and os.path.exists(path):
+            os.remove(path)
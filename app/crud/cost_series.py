@@ -0,0 +1,141 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cost_cache import monthly_cost_cache
+from app.crud.accrual import compute_accruals
+from app.crud.fixed_cost import accrued_to_date, load_fixed_costs
+from app.db.data_versions import EPOCH_KEY, table_versions
+from app.models import models
+
+# 时间序列中的成本类型，fixed、human 之外的类型都归入 other
+SERIES_COST_TYPES = ("fixed", "human", "other")
+
+# 单次查询允许的最大月数
+SERIES_MAX_MONTHS = 120
+
+def parse_month(value: str) -> datetime:
+    """
+    解析 YYYY-MM 格式的月份
+
+    Raises:
+        ValueError: 格式错误
+    """
+    return datetime.strptime(value, "%Y-%m")
+
+def _shift_month(month: datetime, count: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1)
+
+def month_range(start: datetime, end: datetime) -> List[datetime]:
+    """
+    列出 [start, end] 之间（含两端）每个月的第一天
+
+    Raises:
+        ValueError: 起始月份晚于结束月份，或超过 SERIES_MAX_MONTHS 个月
+    """
+    count = (end.year - start.year) * 12 + end.month - start.month + 1
+    if count <= 0:
+        raise ValueError("start must not be later than end")
+    if count > SERIES_MAX_MONTHS:
+        raise ValueError(f"Range must not exceed {SERIES_MAX_MONTHS} months")
+    return [_shift_month(start, i) for i in range(count)]
+
+async def monthly_cost_series(
+    db: AsyncSession,
+    start: datetime,
+    end: datetime,
+    project_ids: Optional[Sequence[int]] = None,
+    now: Optional[datetime] = None
+) -> List[Dict[str, object]]:
+    """
+    按月汇总成本，按成本类型分列
+
+    一次 GROUP BY (项目, 月份, 成本类型) 查询，走 (project_id, record_date, cost_type) 索引。
+    已结束月份的结果按 (项目, 月份) 缓存：所有已结束月份都已缓存的项目只查询当月及以后。
+    缓存对应读快照中持久化的 cost_records 版本号，任何进程写入成本记录后都会失效。
+    fixed 包含已录入的固定成本记录和按项目 fixed_cost_monthly 计提到今天（含）的固定成本，
+    未来月份不计提。
+
+    Args:
+        db: 数据库会话
+        start: 起始月份（含）
+        end: 结束月份（含）
+        project_ids: 项目ID，为空时汇总所有项目
+        now: 当前时间（UTC），用于判断月份是否已结束
+
+    Returns:
+        List[Dict]: 每月一项，包含 month、各成本类型金额、计提的固定成本 fixed_accrued 及 total，
+            无记录的月份金额为 0
+    """
+    months = month_range(start, end)
+    keys = [month.strftime("%Y-%m") for month in months]
+    range_end = _shift_month(months[-1], 1)
+    current = (now or datetime.utcnow()).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    closed = [key for month, key in zip(months, keys) if month < current]
+
+    # 版本号在读快照内读取，与本次查询看到的成本记录一致
+    versions = await table_versions(db, ["cost_records"])
+    data_version = (versions[EPOCH_KEY], versions["cost_records"])
+    use_cache = monthly_cost_cache.sync(data_version)
+    # 固定成本计提到今天为止，与项目成本统计的 fixed_accrued 一致
+    fixed_accruals = accrued_to_date(await load_fixed_costs(db, project_ids), now)
+    if project_ids is None:
+        project_ids = fixed_accruals.project_id.tolist()
+    project_ids = sorted(set(project_ids))
+
+    totals = {key: defaultdict(float) for key in keys}
+    cached, uncached = [], []
+    for project_id in project_ids:
+        cells = [monthly_cost_cache.get(project_id, key) for key in closed] if use_cache else [None]
+        if all(cell is not None for cell in cells):
+            cached.append(project_id)
+            for key, cell in zip(closed, cells):
+                for cost_type, amount in cell.items():
+                    totals[key][cost_type] += amount
+        else:
+            uncached.append(project_id)
+
+    cost = models.CostRecord
+    conditions = []
+    if uncached:
+        conditions.append(and_(
+            cost.project_id.in_(uncached), cost.record_date >= months[0], cost.record_date < range_end
+        ))
+    if cached and current < range_end:
+        conditions.append(and_(
+            cost.project_id.in_(cached), cost.record_date >= max(current, months[0]), cost.record_date < range_end
+        ))
+
+    if conditions:
+        month = func.strftime("%Y-%m", cost.record_date).label("month")
+        result = await db.execute(
+            select(cost.project_id, month, cost.cost_type, func.sum(cost.amount))
+            .where(or_(*conditions))
+            .group_by(cost.project_id, month, cost.cost_type)
+        )
+        fresh = defaultdict(lambda: defaultdict(float))
+        for project_id, key, cost_type, amount in result.all():
+            cost_type = cost_type if cost_type in SERIES_COST_TYPES else "other"
+            totals[key][cost_type] += amount or 0.0
+            fresh[project_id, key][cost_type] += amount or 0.0
+        # 无记录的已结束月份也缓存（空字典），下次不必再查
+        for project_id in uncached:
+            for key in closed:
+                monthly_cost_cache.put(project_id, key, dict(fresh.get((project_id, key), {})), data_version)
+
+    # 按 fixed_cost_monthly 计提的固定成本随项目日期和当前日期变化，不缓存，每次计算
+    accrued = compute_accruals(fixed_accruals, months[0], range_end).amounts.sum(axis=0)
+
+    series = []
+    for key, fixed_accrued in zip(keys, accrued.tolist()):
+        row = {"month": key}
+        row.update({cost_type: totals[key][cost_type] for cost_type in SERIES_COST_TYPES})
+        row["fixed"] += fixed_accrued
+        row["fixed_accrued"] = round(fixed_accrued, 2)
+        row["total"] = sum(row[cost_type] for cost_type in SERIES_COST_TYPES)
+        series.append(row)
+    return series
@@ -0,0 +1,174 @@
+import csv
+import io
+import tempfile
+from datetime import datetime
+from typing import Any, AsyncIterator, Iterator, List, NamedTuple, Optional, Sequence
+
+from openpyxl import Workbook
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+from starlette.concurrency import run_in_threadpool
+
+from app.db.session import AsyncReadSessionLocal
+from app.models import models
+
+# 每次从游标读取的行数，导出内存占用只与此相关，与总行数无关
+EXPORT_BATCH_SIZE = 1000
+
+# XLSX 临时文件超过此大小后落盘
+XLSX_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# 从临时文件向客户端发送 XLSX 的块大小
+XLSX_CHUNK_SIZE = 64 * 1024
+
+class ExportTable(NamedTuple):
+    """
+    一种可导出数据的定义：表头及各列
+    """
+    name: str
+    columns: List[Any]
+
+    @property
+    def header(self) -> List[str]:
+        return [column.key for column in self.columns]
+
+TASKS = ExportTable("tasks", [
+    models.Task.id, models.Task.project_id, models.Task.sprint_id, models.Task.title,
+    models.Task.status, models.Task.priority, models.Task.assignee_id,
+    models.Task.estimated_hours, models.Task.actual_hours, models.Task.due_date,
+    models.Task.created_at, models.Task.updated_at
+])
+
+COSTS = ExportTable("costs", [
+    models.CostRecord.id, models.CostRecord.project_id, models.CostRecord.record_date,
+    models.CostRecord.cost_type, models.CostRecord.amount, models.CostRecord.description,
+    models.CostRecord.created_at
+])
+
+ACTIVITIES = ExportTable("activities", [
+    models.Activity.id, models.Activity.created_at, models.Activity.user_id,
+    models.Activity.project_id, models.Activity.type, models.Activity.entity_type,
+    models.Activity.entity_id, models.Activity.content
+])
+
+def _date_range(stmt: Select, column, start_date: Optional[datetime], end_date: Optional[datetime]) -> Select:
+    if start_date is not None:
+        stmt = stmt.where(column >= start_date)
+    if end_date is not None:
+        stmt = stmt.where(column < end_date)
+    return stmt
+
+# 各查询的排序都与所用索引（或 rowid）的顺序一致，SQLite 边扫描边返回，不需要临时排序
+
+def tasks_query(project_id: Optional[int], start_date: Optional[datetime], end_date: Optional[datetime]) -> Select:
+    """
+    任务导出查询，按创建时间过滤
+    """
+    task = models.Task
+    stmt = select(*TASKS.columns)
+    if project_id is not None:
+        stmt = stmt.where(task.project_id == project_id)
+    return _date_range(stmt, task.created_at, start_date, end_date).order_by(task.id)
+
+def costs_query(project_id: Optional[int], start_date: Optional[datetime], end_date: Optional[datetime]) -> Select:
+    """
+    成本记录导出查询，按记录日期过滤
+    """
+    cost = models.CostRecord
+    stmt = _date_range(select(*COSTS.columns), cost.record_date, start_date, end_date)
+    if project_id is None:
+        return stmt.order_by(cost.id)
+    # 走 (project_id, record_date, cost_type) 索引，索引隐含 rowid
+    return stmt.where(cost.project_id == project_id).order_by(cost.record_date, cost.cost_type, cost.id)
+
+def activities_query(project_id: Optional[int], start_date: Optional[datetime], end_date: Optional[datetime]) -> Select:
+    """
+    活动记录导出查询，按活动时间过滤
+    """
+    activity = models.Activity
+    stmt = select(*ACTIVITIES.columns)
+    if project_id is not None:
+        stmt = stmt.where(activity.project_id == project_id)
+    return _date_range(stmt, activity.created_at, start_date, end_date).order_by(activity.created_at, activity.id)
+
+async def stream_rows(stmt: Select) -> AsyncIterator[Sequence[tuple]]:
+    """
+    以服务端游标分批读取查询结果
+
+    使用独立的只读会话，使流式响应不依赖请求依赖项中会话的生命周期。
+
+    Args:
+        stmt: 查询语句
+
+    Yields:
+        Sequence[tuple]: 每批最多 EXPORT_BATCH_SIZE 行
+    """
+    async with AsyncReadSessionLocal() as session:
+        result = await session.stream(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions(EXPORT_BATCH_SIZE):
+            yield rows
+
+def _cell(value: Any) -> Any:
+    return value.isoformat(sep=" ") if isinstance(value, datetime) else value
+
+async def csv_chunks(table: ExportTable, stmt: Select) -> AsyncIterator[bytes]:
+    """
+    逐批生成 CSV 内容，首块在读到第一批数据前即发送
+
+    Args:
+        table: 导出定义
+        stmt: 查询语句
+
+    Yields:
+        bytes: UTF-8 编码的 CSV 片段（带 BOM，便于 Excel 识别中文）
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(table.header)
+    yield ("\ufeff" + buffer.getvalue()).encode("utf-8")
+    async for rows in stream_rows(stmt):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_cell(value) for value in row] for row in rows)
+        yield buffer.getvalue().encode("utf-8")
+
+def _read_chunks(file) -> Iterator[bytes]:
+    try:
+        file.seek(0)
+        while True:
+            chunk = file.read(XLSX_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        file.close()
+
+def _append_rows(sheet, rows: Sequence[tuple]) -> None:
+    for row in rows:
+        sheet.append(list(row))
+
+async def xlsx_chunks(table: ExportTable, stmt: Select) -> AsyncIterator[bytes]:
+    """
+    以 openpyxl 只写模式生成 XLSX
+
+    只写模式下行数据直接写入工作表的临时文件，内存占用不随行数增长；
+    XLSX 是 zip 包，需在全部行写完后才能封包，因此在封包完成后开始发送。
+
+    Args:
+        table: 导出定义
+        stmt: 查询语句
+
+    Yields:
+        bytes: XLSX 文件片段
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(table.name)
+    sheet.append(table.header)
+    async for rows in stream_rows(stmt):
+        # openpyxl 逐行序列化较慢，放到线程池执行，避免阻塞事件循环
+        await run_in_threadpool(_append_rows, sheet, rows)
+
+    output = tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_MAX_SIZE)
+    await run_in_threadpool(workbook.save, output)
+    for chunk in _read_chunks(output):
+        yield chunk
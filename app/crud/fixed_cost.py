@@ -0,0 +1,77 @@
+from datetime import datetime
+from typing import Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.accrual import LATEST, Accruals, inclusive_end, to_days, total_between
+from app.models import models
+
+def _accruals(rows: Sequence[tuple]) -> Accruals:
+    columns = list(zip(*rows)) if rows else [()] * 4
+    project_id, monthly, start, end = columns
+    return Accruals(
+        project_id=np.array(project_id, dtype=np.int64),
+        member_id=np.zeros(len(project_id), dtype=np.int64),
+        monthly_amount=np.nan_to_num(np.array(monthly, dtype=float)),
+        # 没有开始日期的项目不计提
+        start=to_days(start, LATEST),
+        end=inclusive_end(end)
+    )
+
+async def load_fixed_costs(db: AsyncSession, project_ids: Optional[Sequence[int]] = None) -> Accruals:
+    """
+    读取项目的月度固定成本，转换为计提区间
+
+    项目从开始日期到结束日期（含）按 fixed_cost_monthly 逐日计提，
+    不需要为每个月插入 fixed 类型的成本记录。
+
+    Args:
+        db: 数据库会话
+        project_ids: 项目ID，为空时读取所有项目
+
+    Returns:
+        Accruals: 计提区间
+    """
+    project = models.Project
+    stmt = select(project.id, project.fixed_cost_monthly, project.start_date, project.end_date)
+    if project_ids is not None:
+        stmt = stmt.where(project.id.in_(project_ids))
+    return _accruals((await db.execute(stmt)).all())
+
+def accrued_to_date(accruals: Accruals, now: Optional[datetime] = None) -> Accruals:
+    """
+    将计提区间截止到今天（含）
+
+    固定成本只计提已经过去的天数，项目统计与按月序列使用同一截止日期，
+    未来月份的计提为 0。
+
+    Args:
+        accruals: 计提区间
+        now: 当前时间（UTC）
+
+    Returns:
+        Accruals: 截止到今天的计提区间
+    """
+    tomorrow = np.datetime64((now or datetime.utcnow()).date(), "D") + np.timedelta64(1, "D")
+    return accruals._replace(end=np.minimum(accruals.end, tomorrow))
+
+def project_fixed_cost_to_date(project: models.Project, now: Optional[datetime] = None) -> float:
+    """
+    计算项目从开始日期到今天（项目已结束时到结束日期）计提的固定成本
+
+    Args:
+        project: 项目
+        now: 当前时间（UTC）
+
+    Returns:
+        float: 计提的固定成本
+    """
+    if project.start_date is None or not project.fixed_cost_monthly:
+        return 0.0
+    accruals = accrued_to_date(
+        _accruals([(project.id, project.fixed_cost_monthly, project.start_date, project.end_date)]), now
+    )
+    end = datetime.combine(accruals.end[0].astype(datetime), datetime.min.time())
+    return total_between(accruals, project.start_date, end)
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+from typing import Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.accrual import EARLIEST, Accruals, inclusive_end, to_days, total_between
+from app.models import models
+
+async def load_allocations(db: AsyncSession, project_ids: Optional[Sequence[int]] = None) -> Accruals:
+    """
+    读取成员分配记录，转换为人力成本计费区间
+
+    月度金额为月薪 × 分配比例（为空时计为 0）；区间为分配日期与成员入职、离职日期的交集，
+    结束日期与离职日期当天计入。
+
+    Args:
+        db: 数据库会话
+        project_ids: 项目ID，为空时读取所有项目
+
+    Returns:
+        Accruals: 计费区间
+    """
+    pm = models.ProjectMember
+    member = models.TeamMember
+    stmt = select(
+        pm.project_id, pm.member_id, pm.allocation_percentage, pm.start_date, pm.end_date,
+        member.monthly_salary, member.join_date, member.leave_date
+    ).join(member, member.id == pm.member_id)
+    if project_ids is not None:
+        stmt = stmt.where(pm.project_id.in_(project_ids))
+    rows = (await db.execute(stmt)).all()
+
+    columns = list(zip(*rows)) if rows else [()] * 8
+    project_id, member_id, allocation, start, end, salary, join_date, leave_date = columns
+    # 月薪或分配比例为空时计为 0，否则 NaN 会使整个项目的人力成本变为 NaN
+    salary = np.nan_to_num(np.array(salary, dtype=float))
+    allocation = np.nan_to_num(np.array(allocation, dtype=float))
+    return Accruals(
+        project_id=np.array(project_id, dtype=np.int64),
+        member_id=np.array(member_id, dtype=np.int64),
+        monthly_amount=salary * allocation / 100,
+        start=np.maximum(to_days(start, EARLIEST), to_days(join_date, EARLIEST)),
+        end=np.minimum(inclusive_end(end), inclusive_end(leave_date))
+    )
+
+async def project_labor_cost_to_date(db: AsyncSession, project: models.Project, now: Optional[datetime] = None) -> float:
+    """
+    计算项目从开始日期到今天（项目已结束时到结束日期）的人力成本
+
+    Args:
+        db: 数据库会话
+        project: 项目
+        now: 当前时间（UTC）
+
+    Returns:
+        float: 人力成本
+    """
+    allocations = await load_allocations(db, [project.id])
+    if len(allocations.project_id) == 0:
+        return 0.0
+    end = (now or datetime.utcnow()) + timedelta(days=1)
+    if project.end_date is not None:
+        end = min(end, project.end_date + timedelta(days=1))
+    start = datetime.combine(allocations.start.min().astype(datetime), datetime.min.time())
+    if project.start_date is not None:
+        start = max(start, project.start_date)
+    return total_between(allocations, start, end)
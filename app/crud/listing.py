@@ -0,0 +1,47 @@
+from typing import Any, Dict, List, Sequence, Type
+
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+
+def schema_columns(model: Any, schema: Type[BaseModel], exclude: Sequence[str] = ()) -> List[Any]:
+    """
+    按响应模型的字段顺序取 ORM 模型上的同名列
+
+    Args:
+        model: ORM 模型
+        schema: 响应模型，字段均为模型的列
+        exclude: 不读取的字段（如嵌套对象）
+
+    Returns:
+        List: 列
+    """
+    return [getattr(model, name) for name in schema.model_fields if name not in exclude]
+
+def list_query(model: Any, schema: Type[BaseModel]) -> Select:
+    """
+    列表快速路径的查询：只选取响应模型需要的列，结果为元组而不是 ORM 对象
+
+    Args:
+        model: ORM 模型
+        schema: 响应模型
+
+    Returns:
+        Select: 查询语句
+    """
+    return select(*schema_columns(model, schema))
+
+def row_dicts(rows: Sequence[Any]) -> List[Dict[str, Any]]:
+    """
+    将查询结果行转换为字典，不经过 pydantic 校验
+
+    Args:
+        rows: 查询结果行
+
+    Returns:
+        List[Dict]: 以列名为键的字典
+    """
+    if not rows:
+        return []
+    keys = rows[0]._fields
+    return [dict(zip(keys, row)) for row in rows]
@@ -0,0 +1,161 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud.listing import list_query, row_dicts
+from app.crud.pagination import paginate
+from app.crud.project_stats import project_cost_stats, project_stats
+from app.db.data_versions import table_versions
+from app.db.session import AsyncReadSessionLocal
+from app.models import models
+from app.schemas import schemas
+from app.schemas import team_member as team_member_schema
+
+# 概览中最近动态的默认条数与上限
+OVERVIEW_ACTIVITY_LIMIT = 10
+OVERVIEW_ACTIVITY_MAX_LIMIT = 100
+
+Loader = Callable[[AsyncSession, models.Project, int], Awaitable[Any]]
+
+async def _project(db: AsyncSession, project: models.Project, activity_limit: int) -> Dict[str, Any]:
+    result = await db.execute(list_query(models.Project, schemas.Project).where(models.Project.id == project.id))
+    return row_dicts(result.all())[0]
+
+async def _stats(db: AsyncSession, project: models.Project, activity_limit: int) -> Dict[str, Any]:
+    return await project_stats(db, project)
+
+async def _activities(db: AsyncSession, project: models.Project, activity_limit: int) -> List[Dict[str, Any]]:
+    order = [models.Activity.created_at, models.Activity.id]
+    stmt = list_query(models.Activity, schemas.Activity).where(models.Activity.project_id == project.id)
+    result = await db.execute(paginate(stmt, order, None, 0, activity_limit, descending=True))
+    return row_dicts(result.all())
+
+async def _sprints(db: AsyncSession, project: models.Project, activity_limit: int) -> List[Dict[str, Any]]:
+    result = await db.execute(
+        list_query(models.Sprint, schemas.Sprint).where(models.Sprint.project_id == project.id)
+    )
+    return row_dicts(result.all())
+
+async def _members(db: AsyncSession, project: models.Project, activity_limit: int) -> List[Dict[str, Any]]:
+    result = await db.execute(
+        list_query(models.ProjectMember, team_member_schema.ProjectMember)
+        .where(models.ProjectMember.project_id == project.id)
+    )
+    return row_dicts(result.all())
+
+async def _cost_stats(db: AsyncSession, project: models.Project, activity_limit: int) -> Dict[str, Any]:
+    return await project_cost_stats(db, project)
+
+# 概览的各部分：名称 -> (读取函数, 依赖的表)，与对应的单独接口返回相同的内容
+OVERVIEW_SECTIONS: Dict[str, Tuple[Loader, Tuple[str, ...]]] = {
+    "project": (_project, ("projects",)),
+    "stats": (_stats, ("projects", "project_task_stats", "cost_records", "project_members", "team_members")),
+    "activities": (_activities, ("activities",)),
+    "sprints": (_sprints, ("sprints",)),
+    "members": (_members, ("project_members",)),
+    "cost_stats": (_cost_stats, ("projects", "cost_records", "project_members", "team_members")),
+}
+
+# 所有部分依赖的表，用于概览接口的 ETag
+OVERVIEW_TABLES = tuple(sorted({table for _, tables in OVERVIEW_SECTIONS.values() for table in tables}))
+
+def parse_sections(value: Optional[str]) -> List[str]:
+    """
+    解析逗号分隔的部分名称，未指定时返回全部部分
+
+    Args:
+        value: 查询参数 sections
+
+    Returns:
+        List[str]: 去重后的部分名称，保持 OVERVIEW_SECTIONS 中的顺序
+
+    Raises:
+        ValueError: 包含未知的部分名称或为空
+    """
+    if value is None:
+        return list(OVERVIEW_SECTIONS)
+    names = {name.strip() for name in value.split(",") if name.strip()}
+    unknown = names - set(OVERVIEW_SECTIONS)
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(sorted(unknown))}")
+    if not names:
+        raise ValueError("At least one section is required")
+    return [name for name in OVERVIEW_SECTIONS if name in names]
+
+async def _load_isolated(
+    name: str,
+    project: models.Project,
+    baseline: Dict[str, int],
+    activity_limit: int,
+    limit: asyncio.Semaphore
+) -> Tuple[bool, Any]:
+    """
+    在独立的只读会话中读取一个部分
+
+    会话的快照从读取版本号开始；版本号与请求会话中读取的不一致，说明期间有写事务提交，
+    快照不同，不再读取数据。
+
+    Args:
+        limit: 本次请求的并发上限，取得后才从只读连接池获取连接
+
+    Returns:
+        Tuple[bool, Any]: (快照是否一致, 数据)
+    """
+    load, _ = OVERVIEW_SECTIONS[name]
+    async with limit, AsyncReadSessionLocal() as db:
+        if await table_versions(db, baseline) != baseline:
+            return False, None
+        return True, await load(db, project, activity_limit)
+
+async def project_overview(
+    db: AsyncSession,
+    project: models.Project,
+    sections: Sequence[str],
+    activity_limit: int = OVERVIEW_ACTIVITY_LIMIT
+) -> Optional[Dict[str, Any]]:
+    """
+    读取项目概览：在一次请求中返回项目详情页需要的多个部分
+
+    各部分互不依赖，分别在只读连接池的独立连接上并发读取，同时占用的连接数不超过
+    OVERVIEW_MAX_CONCURRENCY，多个概览请求并发时也给其它请求留出连接。请求会话读取项目后记下相关表的版本号，
+    随即结束事务、归还连接（等待并发部分时不占用连接，避免与其它请求互相等待连接池）；
+    每个部分的会话先核对版本号，全部一致即说明所有部分读自同一个数据快照。
+    期间若有写事务提交，则退回在请求会话的一个新事务中顺序重新读取全部部分。
+
+    Args:
+        db: 只读数据库会话，已完成认证并读取了项目
+        project: 项目
+        sections: 部分名称，见 OVERVIEW_SECTIONS
+        activity_limit: 最近动态的条数
+
+    Returns:
+        Optional[Dict[str, Any]]: 部分名称 -> 内容；退回顺序读取时项目已被删除则为 None
+
+    Raises:
+        ValueError: 动态条数无效
+    """
+    if not 1 <= activity_limit <= OVERVIEW_ACTIVITY_MAX_LIMIT:
+        raise ValueError(f"activity_limit must be between 1 and {OVERVIEW_ACTIVITY_MAX_LIMIT}")
+
+    if len(sections) > 1:
+        tables = {table for name in sections for table in OVERVIEW_SECTIONS[name][1]}
+        baseline = await table_versions(db, tables)
+        db.expunge(project)
+        await db.rollback()
+
+        limit = asyncio.Semaphore(max(1, settings.OVERVIEW_MAX_CONCURRENCY))
+        results = await asyncio.gather(*(
+            _load_isolated(name, project, baseline, activity_limit, limit) for name in sections
+        ))
+        if all(consistent for consistent, _ in results):
+            return {name: data for name, (_, data) in zip(sections, results)}
+
+        result = await db.execute(select(models.Project).where(models.Project.id == project.id))
+        project = result.scalars().first()
+        if project is None:
+            return None
+
+    return {name: await OVERVIEW_SECTIONS[name][0](db, project, activity_limit) for name in sections}
@@ -0,0 +1,105 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Response
+from sqlalchemy import literal, tuple_
+from sqlalchemy.sql import Select
+
+# 下一页游标通过响应头返回，响应体保持列表格式以兼容旧客户端
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    将排序键编码为不透明的游标字符串
+
+    Args:
+        values: 最后一行的排序键取值
+
+    Returns:
+        str: URL 安全的 base64 游标
+    """
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, columns: Sequence) -> List[Any]:
+    """
+    解码游标并按排序列的类型还原取值
+
+    Args:
+        cursor: 游标字符串
+        columns: 排序列
+
+    Returns:
+        List[Any]: 排序键取值
+
+    Raises:
+        HTTPException: 游标无效
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor length mismatch")
+        return [
+            datetime.fromisoformat(v) if column.type.python_type is datetime else column.type.python_type(v)
+            for v, column in zip(values, columns)
+        ]
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def paginate(
+    stmt: Select,
+    order_columns: Sequence,
+    cursor: Optional[str],
+    skip: int,
+    limit: int,
+    descending: bool = False
+) -> Select:
+    """
+    为查询加上排序与分页条件
+
+    传入游标时按排序键做 keyset 分页（索引范围扫描，与页深无关）；
+    否则退回到兼容旧接口的 skip/limit 偏移分页。
+
+    Args:
+        stmt: 查询语句
+        order_columns: 排序列，最后一列必须唯一（通常为 id）
+        cursor: 上一页返回的游标
+        skip: 偏移量（仅在未传游标时生效）
+        limit: 每页数量
+        descending: 是否倒序
+
+    Returns:
+        Select: 分页后的查询语句
+    """
+    if cursor:
+        values = decode_cursor(cursor, order_columns)
+        bounds = [literal(v, column.type) for v, column in zip(values, order_columns)]
+        if len(order_columns) == 1:
+            key, bound = order_columns[0], bounds[0]
+        else:
+            key, bound = tuple_(*order_columns), tuple_(*bounds)
+        stmt = stmt.where(key < bound if descending else key > bound)
+    elif skip:
+        stmt = stmt.offset(skip)
+    order_by = [column.desc() if descending else column.asc() for column in order_columns]
+    return stmt.order_by(*order_by).limit(limit)
+
+def set_next_cursor(response: Response, rows: Sequence, order_columns: Sequence, limit: int) -> None:
+    """
+    当本页已满时，在响应头中写入下一页游标
+
+    Args:
+        response: 响应对象
+        rows: 本页数据
+        order_columns: 排序列
+        limit: 每页数量
+    """
+    if limit > 0 and len(rows) == limit:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            [getattr(last, column.key) for column in order_columns]
+        )
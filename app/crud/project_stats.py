@@ -0,0 +1,83 @@
+from typing import Any, Dict
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud import fixed_cost, labor_cost, statistics
+from app.models import models
+
+async def project_stats(db: AsyncSession, project: models.Project) -> Dict[str, Any]:
+    """
+    项目概况统计：任务数、工时和成本
+
+    Args:
+        db: 数据库会话
+        project: 项目
+
+    Returns:
+        Dict[str, Any]: taskStats、timeStats、costStats
+    """
+    # 从统计汇总表获取任务和工时统计
+    status_totals = await statistics.get_status_totals(db, project.id)
+    status_counts = {row.status: row.task_count for row in status_totals}
+
+    # 获取成本统计
+    result = await db.execute(
+        select(
+            func.sum(case((models.CostRecord.cost_type == 'fixed', models.CostRecord.amount), else_=0)).label('fixed'),
+            func.sum(case((models.CostRecord.cost_type == 'human', models.CostRecord.amount), else_=0)).label('human')
+        ).where(models.CostRecord.project_id == project.id)
+    )
+    cost_stats = result.first()
+    fixed_accrued = fixed_cost.project_fixed_cost_to_date(project)
+
+    return {
+        "taskStats": {
+            "total": sum(status_counts.values()),
+            "inProgress": status_counts.get('in_progress', 0),
+            "completed": status_counts.get('completed', 0)
+        },
+        "timeStats": {
+            "estimated": sum(row.estimated_hours for row in status_totals),
+            "actual": sum(row.actual_hours for row in status_totals)
+        },
+        "costStats": {
+            "fixed": (cost_stats.fixed or 0) + fixed_accrued,
+            "fixedRecorded": cost_stats.fixed or 0,
+            "fixedAccrued": fixed_accrued,
+            "human": cost_stats.human or 0,
+            "labor": await labor_cost.project_labor_cost_to_date(db, project)
+        }
+    }
+
+async def project_cost_stats(db: AsyncSession, project: models.Project) -> Dict[str, Any]:
+    """
+    按成本类型汇总项目成本
+
+    Args:
+        db: 数据库会话
+        project: 项目
+
+    Returns:
+        Dict[str, Any]: fixed、fixed_recorded、fixed_accrued、human、other、labor
+    """
+    result = await db.execute(
+        select(
+            func.sum(case((models.CostRecord.cost_type == 'fixed', models.CostRecord.amount), else_=0)).label('fixed'),
+            func.sum(case((models.CostRecord.cost_type == 'human', models.CostRecord.amount), else_=0)).label('human'),
+            func.sum(case((models.CostRecord.cost_type.notin_(['fixed', 'human']), models.CostRecord.amount), else_=0)).label('other')
+        ).where(models.CostRecord.project_id == project.id)
+    )
+    cost_stats = result.first()
+    fixed_accrued = fixed_cost.project_fixed_cost_to_date(project)
+
+    return {
+        # 已录入的 fixed 成本记录加上按 fixed_cost_monthly 计提到今天的固定成本，两部分分别列出
+        "fixed": (cost_stats.fixed or 0) + fixed_accrued,
+        "fixed_recorded": cost_stats.fixed or 0,
+        "fixed_accrued": fixed_accrued,
+        "human": cost_stats.human or 0,
+        "other": cost_stats.other or 0,
+        # 按成员月薪与分配比例折算的人力成本（截至今天）
+        "labor": await labor_cost.project_labor_cost_to_date(db, project)
+    }
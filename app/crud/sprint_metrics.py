@@ -0,0 +1,235 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.sprint_cache import sprint_burndown_cache
+from app.crud.task_events import ANALYTICS_MAX_DAYS, is_done
+from app.models import TaskStatusEvent, models
+
+# 已关闭的迭代状态（不区分大小写）；关闭后燃尽图不再变化
+CLOSED_SPRINT_STATUSES = ("completed", "closed", "cancelled")
+
+# 速度统计允许的最大迭代数
+VELOCITY_MAX_SPRINTS = 50
+
+class BurndownState(NamedTuple):
+    """
+    燃尽图的累加状态
+
+    remaining、completed 长度为天数 + 1：下标 0 为迭代开始前的变化，下标 d + 1 为第 d 天的变化；
+    tasks 为每个任务当前计入的 (剩余工时, 完成工时)，用于增量处理新事件。
+    """
+    first: np.datetime64
+    n_days: int
+    closed: bool
+    last_event_id: int
+    remaining: np.ndarray
+    completed: np.ndarray
+    tasks: Dict[int, Tuple[float, float]]
+
+def is_closed(sprint: models.Sprint) -> bool:
+    """
+    判断迭代是否已关闭
+    """
+    return (sprint.status or "").lower() in CLOSED_SPRINT_STATUSES
+
+def _sprint_days(sprint: models.Sprint) -> Tuple[np.datetime64, int]:
+    first = np.datetime64(sprint.start_date.date(), "D")
+    n_days = int((np.datetime64(sprint.end_date.date(), "D") - first).astype(int)) + 1
+    if n_days <= 0:
+        raise ValueError("Sprint end_date must not be earlier than start_date")
+    if n_days > ANALYTICS_MAX_DAYS:
+        raise ValueError(f"Sprint must not exceed {ANALYTICS_MAX_DAYS} days")
+    return first, n_days
+
+def _apply_events(state: BurndownState, rows: List[tuple]) -> BurndownState:
+    """
+    把新的状态事件累加到燃尽图状态上，返回新状态（不修改原状态）
+
+    按 (任务, 事件ID) 排序后，每条事件的变化量为任务在该事件后计入的工时减去之前计入的工时，
+    每个任务之前计入的工时取上一条事件，第一条取缓存中的值。
+    """
+    remaining, completed = state.remaining.copy(), state.completed.copy()
+    tasks = dict(state.tasks)
+    if not rows:
+        return state._replace(remaining=remaining, completed=completed, tasks=tasks)
+
+    event_id, task_id, to_status, at, hours = (np.array(column, dtype=object) for column in zip(*rows))
+    order = np.lexsort((event_id.astype(np.int64), task_id.astype(np.int64)))
+    event_id, task_id, to_status, at, hours = (column[order] for column in (event_id, task_id, to_status, at, hours))
+    task_id = task_id.astype(np.int64)
+    hours = np.nan_to_num(hours.astype(float))
+
+    done = np.array([is_done(status) for status in to_status.tolist()])
+    is_open = np.array([status is not None for status in to_status.tolist()]) & ~done
+    new_remaining = np.where(is_open, hours, 0.0)
+    new_completed = np.where(done, hours, 0.0)
+
+    group_first = np.ones(len(task_id), dtype=bool)
+    group_first[1:] = task_id[1:] != task_id[:-1]
+    cached = [tasks.get(task, (0.0, 0.0)) for task in task_id[group_first].tolist()]
+    prev_remaining = np.empty_like(new_remaining)
+    prev_completed = np.empty_like(new_completed)
+    prev_remaining[1:], prev_completed[1:] = new_remaining[:-1], new_completed[:-1]
+    prev_remaining[group_first] = [value[0] for value in cached]
+    prev_completed[group_first] = [value[1] for value in cached]
+
+    day = (np.array(at.tolist(), dtype="datetime64[us]") - state.first) // np.timedelta64(1, "D")
+    bucket = np.clip(day.astype(np.int64) + 1, 0, state.n_days)
+    np.add.at(remaining, bucket, new_remaining - prev_remaining)
+    np.add.at(completed, bucket, new_completed - prev_completed)
+
+    group_last = np.ones(len(task_id), dtype=bool)
+    group_last[:-1] = group_first[1:]
+    tasks.update(zip(
+        task_id[group_last].tolist(),
+        zip(new_remaining[group_last].tolist(), new_completed[group_last].tolist())
+    ))
+    return state._replace(
+        last_event_id=max(state.last_event_id, int(event_id.max())),
+        remaining=remaining, completed=completed, tasks=tasks
+    )
+
+async def _burndown_state(db: AsyncSession, sprint: models.Sprint, version: Optional[int]) -> BurndownState:
+    # version 为空时只读缓存、不写入：调用方的事务尚未提交（如关闭迭代时计算速度），
+    # 提交失败时缓存中不应留下按未提交状态计算的结果
+    first, n_days = _sprint_days(sprint)
+    closed = is_closed(sprint)
+    cached = sprint_burndown_cache.get(sprint.id)
+    if cached is not None and cached.first == first and cached.n_days == n_days:
+        if cached.closed:
+            return cached
+        state = cached._replace(closed=closed)
+    else:
+        state = BurndownState(
+            first=first, n_days=n_days, closed=closed, last_event_id=0,
+            remaining=np.zeros(n_days + 1), completed=np.zeros(n_days + 1), tasks={}
+        )
+
+    # 每个迭代一次查询：按 (sprint_id, at) 索引读取迭代结束前、上次处理之后的状态事件
+    e = TaskStatusEvent
+    end = datetime.combine(sprint.end_date.date(), datetime.min.time()) + timedelta(days=1)
+    rows = (await db.execute(
+        select(e.id, e.task_id, e.to_status, e.at, e.estimated_hours)
+        .where(e.sprint_id == sprint.id, e.at < end, e.id > state.last_event_id)
+    )).all()
+    state = _apply_events(state, rows)
+    if version is not None:
+        sprint_burndown_cache.put(sprint.id, state, version)
+    return state
+
+async def sprint_burndown(
+    db: AsyncSession,
+    sprint: models.Sprint,
+    version: int,
+    now: Optional[datetime] = None
+) -> Dict[str, Any]:
+    """
+    计算迭代燃尽图：每天结束时的剩余预估工时和已完成预估工时
+
+    由任务状态事件推导：任务在迭代内且未完成时计入剩余工时，进入完成状态时计入完成工时，
+    移出迭代或删除时不再计入。工时取事件发生时任务的预估工时，预估工时的修改计入修改当天。
+    已关闭迭代的结果永久缓存；进行中的迭代缓存累加状态，每次只读取新增的事件。
+
+    Args:
+        db: 数据库会话
+        sprint: 迭代
+        version: 会话第一条查询之前读取的迭代缓存版本号（sprint_burndown_cache.version）
+        now: 当前时间（UTC），之后的日期剩余工时为空
+
+    Returns:
+        Dict[str, Any]: dates、每天的剩余工时 remaining、完成工时 completed、理想线 ideal，
+            迭代开始时的承诺工时 committed，以及迭代关闭时的速度 velocity
+
+    Raises:
+        ValueError: 迭代日期无效
+    """
+    state = await _burndown_state(db, sprint, version)
+    remaining = np.cumsum(state.remaining)
+    completed = np.cumsum(state.completed)
+    committed = float(remaining[0])
+
+    days = state.first + np.arange(state.n_days)
+    today = np.datetime64((now or datetime.utcnow()).date(), "D")
+    past = days <= today if not state.closed else np.ones(state.n_days, dtype=bool)
+
+    def series(values: np.ndarray) -> List[Optional[float]]:
+        return [round(value, 2) if known else None for value, known in zip(values[1:].tolist(), past.tolist())]
+
+    ideal = committed * (1 - np.arange(1, state.n_days + 1) / state.n_days)
+    return {
+        "sprint_id": sprint.id,
+        "dates": [str(day) for day in days],
+        "remaining": series(remaining),
+        "completed": series(completed),
+        "ideal": [round(value, 2) for value in ideal.tolist()],
+        "committed": round(committed, 2),
+        "velocity": round(float(completed[-1]), 2) if state.closed else None
+    }
+
+async def sprint_velocity(db: AsyncSession, sprint: models.Sprint) -> float:
+    """
+    计算迭代的速度：迭代结束时处于完成状态的任务预估工时合计
+
+    用于在修改迭代的事务中（提交前）计算，结果不写入燃尽图缓存；
+    事务提交后迭代缓存失效，下次读取燃尽图时重新计算并缓存。
+
+    Args:
+        db: 数据库会话
+        sprint: 迭代
+
+    Returns:
+        float: 完成的预估工时
+    """
+    state = await _burndown_state(db, sprint, None)
+    return round(float(state.completed.sum()), 2)
+
+async def project_velocity(
+    db: AsyncSession,
+    project_id: int,
+    last: int = 5,
+    versions: Optional[Dict[int, int]] = None
+) -> Dict[str, Any]:
+    """
+    统计项目最近 N 个已关闭迭代的速度
+
+    Args:
+        db: 数据库会话
+        project_id: 项目ID
+        last: 迭代数，按开始日期取最近的迭代
+        versions: 会话第一条查询之前读取的迭代缓存版本号（sprint_burndown_cache.versions），
+            为空时在本函数查询之前读取
+
+    Returns:
+        Dict[str, Any]: 每个迭代的承诺工时与完成工时 sprints（按开始日期升序），以及平均速度 average
+
+    Raises:
+        ValueError: 迭代数无效
+    """
+    if not 1 <= last <= VELOCITY_MAX_SPRINTS:
+        raise ValueError(f"last must be between 1 and {VELOCITY_MAX_SPRINTS}")
+    if versions is None:
+        versions = sprint_burndown_cache.versions()
+    sprint = models.Sprint
+    result = await db.execute(select(sprint).where(sprint.project_id == project_id))
+    closed = sorted(
+        (item for item in result.scalars().all() if is_closed(item)),
+        key=lambda item: (item.start_date, item.id)
+    )[-last:]
+
+    sprints = []
+    for item in closed:
+        state = await _burndown_state(db, item, versions.get(item.id, 0))
+        sprints.append({
+            "sprint_id": item.id,
+            "name": item.name,
+            "start_date": item.start_date,
+            "end_date": item.end_date,
+            "committed": round(float(state.remaining[0]), 2),
+            "completed": round(float(state.completed.sum()), 2)
+        })
+    average = round(sum(item["completed"] for item in sprints) / len(sprints), 2) if sprints else None
+    return {"project_id": project_id, "sprints": sprints, "average": average}
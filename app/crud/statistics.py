@@ -0,0 +1,202 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import models
+
+class TaskStatsKey(NamedTuple):
+    """
+    任务在统计汇总中的贡献：所属项目、状态及工时
+    """
+    project_id: Optional[int]
+    status: str
+    estimated_hours: float
+    actual_hours: float
+
+def task_stats_key(task: models.Task) -> TaskStatsKey:
+    """
+    提取任务对统计汇总的贡献，用于在修改前后做差
+
+    Args:
+        task: 任务对象
+
+    Returns:
+        TaskStatsKey: 任务的统计贡献
+    """
+    return TaskStatsKey(
+        project_id=task.project_id,
+        status=task.status or "",
+        estimated_hours=task.estimated_hours or 0.0,
+        actual_hours=task.actual_hours or 0.0
+    )
+
+async def apply_task_delta(
+    db: AsyncSession,
+    project_id: Optional[int],
+    status: str,
+    count: int,
+    estimated_hours: float,
+    actual_hours: float
+) -> None:
+    """
+    在当前事务中累加某个 (项目, 状态) 的统计增量，不提交
+
+    Args:
+        db: 数据库会话
+        project_id: 项目ID
+        status: 任务状态
+        count: 任务数量增量
+        estimated_hours: 预估工时增量
+        actual_hours: 实际工时增量
+    """
+    if project_id is None:
+        return
+    stats = models.ProjectTaskStats
+    stmt = insert(stats).values(
+        project_id=project_id,
+        status=status,
+        task_count=count,
+        estimated_hours=estimated_hours,
+        actual_hours=actual_hours
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[stats.project_id, stats.status],
+        set_={
+            "task_count": stats.task_count + stmt.excluded.task_count,
+            "estimated_hours": stats.estimated_hours + stmt.excluded.estimated_hours,
+            "actual_hours": stats.actual_hours + stmt.excluded.actual_hours
+        }
+    )
+    await db.execute(stmt)
+
+async def record_task_change(
+    db: AsyncSession,
+    before: Optional[TaskStatsKey],
+    after: Optional[TaskStatsKey]
+) -> None:
+    """
+    根据任务修改前后的贡献更新统计汇总，不提交
+
+    创建任务时 before 为 None，删除任务时 after 为 None。
+
+    Args:
+        db: 数据库会话
+        before: 修改前的统计贡献
+        after: 修改后的统计贡献
+    """
+    if before == after:
+        return
+    if before and after and (before.project_id, before.status) == (after.project_id, after.status):
+        await apply_task_delta(
+            db, after.project_id, after.status, 0,
+            after.estimated_hours - before.estimated_hours,
+            after.actual_hours - before.actual_hours
+        )
+        return
+    if before:
+        await apply_task_delta(
+            db, before.project_id, before.status, -1,
+            -before.estimated_hours, -before.actual_hours
+        )
+    if after:
+        await apply_task_delta(
+            db, after.project_id, after.status, 1,
+            after.estimated_hours, after.actual_hours
+        )
+
+async def record_task_changes(
+    db: AsyncSession,
+    changes: Iterable[Tuple[Optional[TaskStatsKey], Optional[TaskStatsKey]]]
+) -> None:
+    """
+    批量更新统计汇总，不提交
+
+    先在内存中按 (项目, 状态) 合并所有增量，每个分组只执行一次 upsert，
+    用于批量创建、修改、删除任务。
+
+    Args:
+        db: 数据库会话
+        changes: (修改前, 修改后) 统计贡献列表，含义同 record_task_change
+    """
+    deltas: Dict[Tuple[Optional[int], str], List] = defaultdict(lambda: [0, 0.0, 0.0])
+    for before, after in changes:
+        if before == after:
+            continue
+        for key, sign in ((before, -1), (after, 1)):
+            if key is None:
+                continue
+            delta = deltas[(key.project_id, key.status)]
+            delta[0] += sign
+            delta[1] += sign * key.estimated_hours
+            delta[2] += sign * key.actual_hours
+    for (project_id, status), (count, estimated_hours, actual_hours) in deltas.items():
+        if count or estimated_hours or actual_hours:
+            await apply_task_delta(db, project_id, status, count, estimated_hours, actual_hours)
+
+async def remove_project(db: AsyncSession, project_id: int) -> None:
+    """
+    删除项目的统计汇总，不提交
+
+    Args:
+        db: 数据库会话
+        project_id: 项目ID
+    """
+    await db.execute(
+        delete(models.ProjectTaskStats).where(models.ProjectTaskStats.project_id == project_id)
+    )
+
+async def get_status_totals(db: AsyncSession, project_id: Optional[int] = None) -> List:
+    """
+    按任务状态读取汇总数据
+
+    Args:
+        db: 数据库会话
+        project_id: 项目ID，为空时返回全局汇总
+
+    Returns:
+        List: (status, task_count, estimated_hours, actual_hours) 列表
+    """
+    stats = models.ProjectTaskStats
+    query = select(
+        stats.status,
+        func.sum(stats.task_count).label("task_count"),
+        func.sum(stats.estimated_hours).label("estimated_hours"),
+        func.sum(stats.actual_hours).label("actual_hours")
+    )
+    if project_id is not None:
+        query = query.where(stats.project_id == project_id)
+    result = await db.execute(
+        query.group_by(stats.status).having(func.sum(stats.task_count) > 0)
+    )
+    return result.all()
+
+async def rebuild(db: AsyncSession) -> int:
+    """
+    从任务表全量重建统计汇总，用于修复偏差
+
+    Args:
+        db: 数据库会话
+
+    Returns:
+        int: 重建后的汇总行数
+    """
+    task = models.Task
+    status = func.coalesce(task.status, "")
+    result = await db.execute(
+        select(
+            task.project_id,
+            status.label("status"),
+            func.count(task.id).label("task_count"),
+            func.coalesce(func.sum(task.estimated_hours), 0.0).label("estimated_hours"),
+            func.coalesce(func.sum(task.actual_hours), 0.0).label("actual_hours")
+        ).join(models.Project, models.Project.id == task.project_id)
+        .group_by(task.project_id, status)
+    )
+    rows = result.all()
+
+    await db.execute(delete(models.ProjectTaskStats))
+    if rows:
+        await db.execute(insert(models.ProjectTaskStats), [row._asdict() for row in rows])
+    await db.commit()
+    return len(rows)
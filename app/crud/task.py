@@ -1,10 +1,19 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
-from app.models import Task
-from app.schemas import TaskCreate
-from app.crud import activity
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+from sqlalchemy.sql import Select
+from app.models import Project, Sprint, Task, TeamMember
+from app.schemas import Task as TaskSchema, TaskBulkItemResult, TaskBulkResult, TaskBulkUpdateItem, TaskCreate
+from app.crud import activity, statistics, task_events
 
-def create_task(db: Session, task: TaskCreate, user_id: int) -> Task:
+# 任务列表的排序键，keyset 分页按此顺序取页
+TASK_ORDER = [Task.id]
+
+# 任务列表快速路径直接读取的列，顺序与 schemas.Task 一致（嵌套的 project、assignee 另行组装）
+TASK_LIST_FIELDS = [name for name in TaskSchema.model_fields if name not in ("project", "assignee")]
+
+async def create_task(db: AsyncSession, task: TaskCreate, user_id: int) -> Task:
     db_task = Task(
         title=task.title,
         description=task.description,
@@ -18,55 +27,315 @@ def create_task(db: Session, task: TaskCreate, user_id: int) -> Task:
         sprint_id=task.sprint_id
     )
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    # 先 flush 取得任务ID；统计汇总、状态事件与活动记录随任务在同一次提交中写入
+    await db.flush()
+    await statistics.record_task_change(db, None, statistics.task_stats_key(db_task))
+    await task_events.record_status_events(db, [(None, task_events.task_scope(db_task))])
     
     # 创建活动记录
-    activity.create_activity(
+    activity.record_activity(
         db=db,
         user_id=user_id,
         activity_type="task_created",
-        content=f"创建了任务 \"{db_task.title}\""
+        content=f"创建了任务 \"{db_task.title}\"",
+        project_id=db_task.project_id,
+        entity_type="task",
+        entity_id=db_task.id
     )
+    await db.commit()
     
-    return db_task
+    # 异步会话不支持懒加载，重新查询以带出关联的项目和负责人
+    return await get_task(db, db_task.id)
+
+async def get_task(db: AsyncSession, task_id: int) -> Optional[Task]:
+    result = await db.execute(
+        select(Task).options(
+            joinedload(Task.project),
+            joinedload(Task.assignee)
+        ).where(Task.id == task_id).execution_options(populate_existing=True)
+    )
+    return result.scalars().first()
 
-def get_task(db: Session, task_id: int) -> Optional[Task]:
-    return db.query(Task).options(
-        joinedload(Task.project),
-        joinedload(Task.assignee)
-    ).filter(Task.id == task_id).first()
+def task_list_query() -> Select:
+    """
+    任务列表快速路径的查询：只选取响应需要的列，项目和负责人名称通过外连接取得
 
-def get_tasks_by_project(db: Session, project_id: int, skip: int = 0, limit: int = 100) -> List[Task]:
-    return db.query(Task).options(
-        joinedload(Task.project),
-        joinedload(Task.assignee)
-    ).filter(Task.project_id == project_id).offset(skip).limit(limit).all()
+    Returns:
+        Select: 查询语句，结果行依次为 TASK_LIST_FIELDS、项目ID、项目名称、负责人ID、负责人名称
+    """
+    return select(
+        *[getattr(Task, name) for name in TASK_LIST_FIELDS],
+        Project.id.label("project_ref"), Project.name.label("project_name"),
+        TeamMember.id.label("assignee_ref"), TeamMember.name.label("assignee_name")
+    ).outerjoin(Project, Project.id == Task.project_id).outerjoin(TeamMember, TeamMember.id == Task.assignee_id)
 
-def update_task(db: Session, task_id: int, task: TaskCreate, user_id: int) -> Optional[Task]:
-    db_task = get_task(db, task_id)
+def task_list_items(rows: Sequence[Any]) -> List[Dict[str, Any]]:
+    """
+    将 task_list_query 的结果行组装为与 schemas.Task 相同结构的字典，不经过 pydantic 校验
+
+    Args:
+        rows: 查询结果行
+
+    Returns:
+        List[Dict]: 任务字典，project、assignee 为 {id, name}，关联不存在时为 None
+    """
+    width = len(TASK_LIST_FIELDS)
+    items = []
+    for row in rows:
+        item = dict(zip(TASK_LIST_FIELDS, row))
+        project_ref, project_name, assignee_ref, assignee_name = row[width:]
+        item["project"] = None if project_ref is None else {"id": project_ref, "name": project_name}
+        item["assignee"] = None if assignee_ref is None else {"id": assignee_ref, "name": assignee_name}
+        items.append(item)
+    return items
+
+async def update_task(db: AsyncSession, task_id: int, task: TaskCreate, user_id: int) -> Optional[Task]:
+    db_task = await get_task(db, task_id)
     if db_task:
         old_status = db_task.status
+        old_stats = statistics.task_stats_key(db_task)
+        old_scope = task_events.task_scope(db_task)
         for key, value in task.model_dump().items():
             setattr(db_task, key, value)
-        db.commit()
-        db.refresh(db_task)
+        await statistics.record_task_change(db, old_stats, statistics.task_stats_key(db_task))
+        await task_events.record_status_events(db, [(old_scope, task_events.task_scope(db_task))])
         
         # 如果任务状态发生变化，创建活动记录
         if old_status != db_task.status:
-            activity.create_activity(
+            activity.record_activity(
                 db=db,
                 user_id=user_id,
                 activity_type="task_updated",
-                content=f"将任务 \"{db_task.title}\" 状态更新为 \"{db_task.status}\""
+                content=f"将任务 \"{db_task.title}\" 状态更新为 \"{db_task.status}\"",
+                project_id=db_task.project_id,
+                entity_type="task",
+                entity_id=db_task.id
             )
+        await db.commit()
+        
+        # 项目或负责人可能已变更，重新加载关联对象
+        db_task = await get_task(db, task_id)
     
     return db_task
 
-def delete_task(db: Session, task_id: int) -> bool:
-    db_task = get_task(db, task_id)
+async def delete_task(db: AsyncSession, task_id: int) -> bool:
+    db_task = await get_task(db, task_id)
     if db_task:
-        db.delete(db_task)
-        db.commit()
+        await statistics.record_task_change(db, statistics.task_stats_key(db_task), None)
+        await task_events.record_status_events(db, [(task_events.task_scope(db_task), None)])
+        await db.delete(db_task)
+        await db.commit()
         return True
-    return False 
\ No newline at end of file
+    return False
+
+# 批量修改时不允许置空的字段（sprint_id 可置空，表示移出迭代）
+NON_NULLABLE_BULK_FIELDS = ("status", "priority", "assignee_id")
+
+async def _existing_ids(db: AsyncSession, column, ids: Iterable[Optional[int]]) -> Set[int]:
+    wanted = {i for i in ids if i is not None}
+    if not wanted:
+        return set()
+    result = await db.execute(select(column).where(column.in_(wanted)))
+    return set(result.scalars().all())
+
+async def _reference_checker(db: AsyncSession, items: List[Dict[str, Any]]):
+    """
+    一次性查询批量条目引用的项目、负责人、迭代是否存在，返回逐条检查函数
+    """
+    project_ids = await _existing_ids(db, Project.id, (item.get("project_id") for item in items))
+    assignee_ids = await _existing_ids(db, TeamMember.id, (item.get("assignee_id") for item in items))
+    sprint_ids = await _existing_ids(db, Sprint.id, (item.get("sprint_id") for item in items))
+
+    def check(item: Dict[str, Any]) -> Optional[str]:
+        if "project_id" in item and item["project_id"] not in project_ids:
+            return "Project not found"
+        if item.get("assignee_id") is not None and item["assignee_id"] not in assignee_ids:
+            return "Assignee not found"
+        if item.get("sprint_id") is not None and item["sprint_id"] not in sprint_ids:
+            return "Sprint not found"
+        return None
+
+    return check
+
+async def _load_stats_rows(db: AsyncSession, ids: Iterable[int]) -> Dict[int, Any]:
+    result = await db.execute(
+        select(
+            Task.id, Task.title, Task.project_id, Task.sprint_id, Task.status,
+            Task.estimated_hours, Task.actual_hours
+        ).where(Task.id.in_(set(ids)))
+    )
+    return {row.id: row for row in result.all()}
+
+def _bulk_result(results: List[TaskBulkItemResult]) -> TaskBulkResult:
+    results.sort(key=lambda r: r.index)
+    failed = sum(1 for r in results if r.status == "failed")
+    return TaskBulkResult(succeeded=len(results) - failed, failed=failed, results=results)
+
+async def create_tasks(db: AsyncSession, tasks: List[TaskCreate], user_id: int) -> TaskBulkResult:
+    """
+    批量创建任务
+
+    所有有效条目在一个事务中批量插入，以 RETURNING 取回各条的 id，统计汇总按 (项目, 状态)
+    合并后更新，活动记录批量写入。引用不存在的项目、负责人或迭代的条目跳过并
+    在结果中标记为失败。
+
+    Args:
+        db: 数据库会话
+        tasks: 待创建的任务
+        user_id: 操作用户ID
+
+    Returns:
+        TaskBulkResult: 逐条结果
+    """
+    items = [task.model_dump() for task in tasks]
+    check = await _reference_checker(db, items)
+    results = []
+    valid = []
+    for index, values in enumerate(items):
+        error = check(values)
+        if error:
+            results.append(TaskBulkItemResult(index=index, status="failed", detail=error))
+        else:
+            valid.append((index, values))
+
+    if valid:
+        # RETURNING 按参数顺序返回每条的 id（SQLite 3.35+），仍以少量多行 INSERT 批量执行
+        result = await db.execute(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True),
+            [values for _, values in valid]
+        )
+        ids = result.scalars().all()
+
+        new_tasks = [Task(id=task_id, **values) for task_id, (_, values) in zip(ids, valid)]
+        await statistics.record_task_changes(
+            db, [(None, statistics.task_stats_key(db_task)) for db_task in new_tasks]
+        )
+        await task_events.record_status_events(
+            db, [(None, task_events.task_scope(db_task)) for db_task in new_tasks]
+        )
+        await activity.record_activities(db, [
+            {
+                "user_id": user_id,
+                "type": "task_created",
+                "content": f"创建了任务 \"{db_task.title}\"",
+                "project_id": db_task.project_id,
+                "entity_type": "task",
+                "entity_id": db_task.id
+            }
+            for db_task in new_tasks
+        ])
+        results.extend(
+            TaskBulkItemResult(index=index, id=db_task.id, status="created")
+            for (index, _), db_task in zip(valid, new_tasks)
+        )
+    await db.commit()
+    return _bulk_result(results)
+
+async def update_tasks(db: AsyncSession, items: List[TaskBulkUpdateItem], user_id: int) -> TaskBulkResult:
+    """
+    批量修改任务的状态、优先级、迭代、负责人
+
+    只修改条目中出现的字段。修改内容相同的任务合并为一条
+    UPDATE ... WHERE id IN (...)，全部在一个事务中提交。
+
+    Args:
+        db: 数据库会话
+        items: 修改条目
+        user_id: 操作用户ID
+
+    Returns:
+        TaskBulkResult: 逐条结果
+    """
+    changes = [item.model_dump(exclude_unset=True, exclude={"id"}) for item in items]
+    current = await _load_stats_rows(db, (item.id for item in items))
+    check = await _reference_checker(db, changes)
+
+    results = []
+    seen: Set[int] = set()
+    groups: Dict[Tuple[Tuple[str, Any], ...], List[int]] = {}
+    stats_changes = []
+    scope_changes = []
+    activities = []
+    for index, (item, values) in enumerate(zip(items, changes)):
+        null_fields = [field for field in NON_NULLABLE_BULK_FIELDS if field in values and values[field] is None]
+        if item.id in seen:
+            error = "Duplicate task id"
+        elif item.id not in current:
+            error = "Task not found"
+        elif null_fields:
+            error = f"{null_fields[0]} cannot be null"
+        else:
+            error = check(values)
+        if error:
+            results.append(TaskBulkItemResult(index=index, id=item.id, status="failed", detail=error))
+            continue
+        seen.add(item.id)
+        results.append(TaskBulkItemResult(index=index, id=item.id, status="updated"))
+        if not values:
+            continue
+        groups.setdefault(tuple(sorted(values.items())), []).append(item.id)
+
+        row = current[item.id]
+        if "status" in values or "sprint_id" in values:
+            before = task_events.task_scope(row)
+            scope_changes.append((before, before._replace(
+                status=values.get("status", row.status), sprint_id=values.get("sprint_id", row.sprint_id)
+            )))
+        if "status" in values and values["status"] != row.status:
+            before = statistics.task_stats_key(row)
+            stats_changes.append((before, before._replace(status=values["status"])))
+            activities.append({
+                "user_id": user_id,
+                "type": "task_updated",
+                "content": f"将任务 \"{row.title}\" 状态更新为 \"{values['status']}\"",
+                "project_id": row.project_id,
+                "entity_type": "task",
+                "entity_id": row.id
+            })
+
+    for values, ids in groups.items():
+        await db.execute(
+            update(Task).where(Task.id.in_(ids)).values(**dict(values))
+            .execution_options(synchronize_session=False)
+        )
+    await statistics.record_task_changes(db, stats_changes)
+    await task_events.record_status_events(db, scope_changes)
+    await activity.record_activities(db, activities)
+    await db.commit()
+    return _bulk_result(results)
+
+async def delete_tasks(db: AsyncSession, ids: List[int]) -> TaskBulkResult:
+    """
+    批量删除任务，在一个事务中以一条 DELETE ... WHERE id IN (...) 完成
+
+    Args:
+        db: 数据库会话
+        ids: 任务ID列表
+
+    Returns:
+        TaskBulkResult: 逐条结果
+    """
+    current = await _load_stats_rows(db, ids)
+    results = []
+    deleted: Set[int] = set()
+    for index, task_id in enumerate(ids):
+        if task_id in deleted:
+            results.append(TaskBulkItemResult(index=index, id=task_id, status="failed", detail="Duplicate task id"))
+        elif task_id not in current:
+            results.append(TaskBulkItemResult(index=index, id=task_id, status="failed", detail="Task not found"))
+        else:
+            deleted.add(task_id)
+            results.append(TaskBulkItemResult(index=index, id=task_id, status="deleted"))
+
+    if deleted:
+        await statistics.record_task_changes(
+            db, [(statistics.task_stats_key(current[task_id]), None) for task_id in deleted]
+        )
+        await task_events.record_status_events(
+            db, [(task_events.task_scope(current[task_id]), None) for task_id in deleted]
+        )
+        await db.execute(
+            delete(Task).where(Task.id.in_(deleted)).execution_options(synchronize_session=False)
+        )
+    await db.commit()
+    return _bulk_result(results)
@@ -0,0 +1,292 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import TaskStatusEvent
+
+# 以下状态均为小写，比较前用 normalize_status 统一大小写（前端写入 'TODO'、'IN_PROGRESS'、'DONE'）
+
+# 未开始处理的状态；任务第一次进入其他状态的时间为开始处理时间
+TODO_STATUSES = ("todo",)
+
+# 已完成的状态；进入这些状态的时间为完成时间
+DONE_STATUSES = ("done", "completed")
+
+# 累积流图中状态的排列顺序，未列出的状态按名称排在后面
+STATUS_ORDER = ("todo", "in_progress", "review", "done", "completed")
+
+# 周期时间统计的百分位
+CYCLE_TIME_PERCENTILES = (50, 75, 85, 95)
+
+# 单次统计允许的最大天数
+ANALYTICS_MAX_DAYS = 731
+
+def normalize_status(status: Optional[str]) -> str:
+    """
+    统一任务状态的大小写，空状态返回空字符串
+    """
+    return (status or "").lower()
+
+def is_done(status: Optional[str]) -> bool:
+    """
+    判断任务状态是否为已完成（不区分大小写）
+    """
+    return normalize_status(status) in DONE_STATUSES
+
+class TaskScope(NamedTuple):
+    """
+    任务在状态事件中的归属：所属项目、迭代、状态及预估工时
+    """
+    task_id: int
+    project_id: Optional[int]
+    sprint_id: Optional[int]
+    status: Optional[str]
+    estimated_hours: Optional[float]
+
+def task_scope(task: Any) -> TaskScope:
+    """
+    提取任务的状态归属，用于在修改前后比较
+
+    Args:
+        task: 任务对象或包含 id、project_id、sprint_id、status、estimated_hours 的查询行
+
+    Returns:
+        TaskScope: 任务的状态归属
+    """
+    return TaskScope(task.id, task.project_id, task.sprint_id, task.status, task.estimated_hours)
+
+def _event(scope: TaskScope, from_status: Optional[str], to_status: Optional[str], at: datetime) -> Dict[str, Any]:
+    return {
+        "task_id": scope.task_id,
+        "project_id": scope.project_id,
+        "sprint_id": scope.sprint_id,
+        "from_status": from_status,
+        "to_status": to_status,
+        "estimated_hours": scope.estimated_hours,
+        "at": at
+    }
+
+def status_events(
+    before: Optional[TaskScope],
+    after: Optional[TaskScope],
+    at: Optional[datetime] = None
+) -> List[Dict[str, Any]]:
+    """
+    根据任务修改前后的归属生成状态事件
+
+    项目和迭代不变时只在状态或预估工时变化时生成一条事件（只改工时时前后状态相同）；
+    项目或迭代变化时，在原范围生成离开事件、在新范围生成进入事件。
+
+    Args:
+        before: 修改前的归属，创建时为 None
+        after: 修改后的归属，删除时为 None
+        at: 事件时间，默认为当前时间（UTC）
+
+    Returns:
+        List[Dict]: 事件字段列表
+    """
+    at = at or datetime.utcnow()
+    if before is not None and after is not None and before[1:3] == after[1:3]:
+        if before[3:] == after[3:]:
+            return []
+        return [_event(after, before.status, after.status, at)]
+    events = []
+    if before is not None:
+        events.append(_event(before, before.status, None, at))
+    if after is not None:
+        events.append(_event(after, None, after.status, at))
+    return events
+
+async def record_status_events(
+    db: AsyncSession,
+    changes: Iterable[Tuple[Optional[TaskScope], Optional[TaskScope]]]
+) -> None:
+    """
+    在当前事务中批量写入任务状态事件，不提交
+
+    Args:
+        db: 数据库会话
+        changes: (修改前归属, 修改后归属) 列表
+    """
+    at = datetime.utcnow()
+    events = [event for before, after in changes for event in status_events(before, after, at)]
+    if events:
+        await db.execute(insert(TaskStatusEvent), events)
+
+def _scope_column(project_id: Optional[int], sprint_id: Optional[int]):
+    if (project_id is None) == (sprint_id is None):
+        raise ValueError("Exactly one of project_id and sprint_id is required")
+    if project_id is not None:
+        return TaskStatusEvent.project_id == project_id
+    return TaskStatusEvent.sprint_id == sprint_id
+
+def _day_range(start: datetime, end: datetime) -> Tuple[np.datetime64, int]:
+    first = np.datetime64(start.date(), "D")
+    n_days = int((np.datetime64(end.date(), "D") - first).astype(int))
+    if n_days <= 0:
+        raise ValueError("start_date must be earlier than end_date")
+    if n_days > ANALYTICS_MAX_DAYS:
+        raise ValueError(f"Range must not exceed {ANALYTICS_MAX_DAYS} days")
+    return first, n_days
+
+def _order_statuses(statuses: Iterable[str]) -> List[str]:
+    # 状态保留原始写法，按小写形式在 STATUS_ORDER 中的位置排序
+    rank = {status: i for i, status in enumerate(STATUS_ORDER)}
+    return sorted(set(statuses), key=lambda status: (rank.get(normalize_status(status), len(rank)), status))
+
+def _timestamps(values: Sequence[datetime]) -> np.ndarray:
+    return np.array(values, dtype="datetime64[us]").reshape(-1)
+
+async def cumulative_flow(
+    db: AsyncSession,
+    start: datetime,
+    end: datetime,
+    project_id: Optional[int] = None,
+    sprint_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    计算累积流图：每天结束时各状态的任务数
+
+    起始日之前的任务数由两次 GROUP BY（进入次数、离开次数）得出；范围内的事件
+    以 (project_id, at) 或 (sprint_id, at) 索引范围扫描读取，按天向量化累加。
+
+    Args:
+        db: 数据库会话
+        start: 起始日期（含）
+        end: 结束日期（不含）
+        project_id: 项目ID
+        sprint_id: 迭代ID，与 project_id 二选一
+
+    Returns:
+        Dict[str, Any]: dates、statuses 及每个状态按天的任务数 counts
+
+    Raises:
+        ValueError: 范围参数无效
+    """
+    scope = _scope_column(project_id, sprint_id)
+    first, n_days = _day_range(start, end)
+    # 按整天统计
+    start = datetime.combine(start.date(), datetime.min.time())
+    end = start + timedelta(days=n_days)
+
+    e = TaskStatusEvent
+    entered = await db.execute(
+        select(e.to_status, func.count()).where(scope, e.at < start, e.to_status.isnot(None)).group_by(e.to_status)
+    )
+    left = await db.execute(
+        select(e.from_status, func.count()).where(scope, e.at < start, e.from_status.isnot(None)).group_by(e.from_status)
+    )
+    initial: Dict[str, int] = {}
+    for status, count in entered.all():
+        initial[status] = initial.get(status, 0) + count
+    for status, count in left.all():
+        initial[status] = initial.get(status, 0) - count
+
+    rows = (await db.execute(
+        select(e.from_status, e.to_status, e.at).where(scope, e.at >= start, e.at < end)
+    )).all()
+    from_status, to_status, at = list(zip(*rows)) if rows else ((), (), ())
+
+    statuses = _order_statuses(
+        [status for status, count in initial.items() if count] +
+        [status for status in from_status + to_status if status is not None]
+    )
+    index = {status: i for i, status in enumerate(statuses)}
+    delta = np.zeros((len(statuses), n_days), dtype=np.int64)
+    if rows:
+        day = ((_timestamps(at) - first) // np.timedelta64(1, "D")).astype(np.int64)
+        to_index = np.array([index.get(status, -1) for status in to_status])
+        from_index = np.array([index.get(status, -1) for status in from_status])
+        np.add.at(delta, (to_index[to_index >= 0], day[to_index >= 0]), 1)
+        np.add.at(delta, (from_index[from_index >= 0], day[from_index >= 0]), -1)
+    counts = np.cumsum(delta, axis=1) + np.array([initial.get(status, 0) for status in statuses])[:, None]
+
+    return {
+        "dates": [str(day) for day in first + np.arange(n_days)],
+        "statuses": statuses,
+        "counts": {status: row for status, row in zip(statuses, counts.tolist())}
+    }
+
+def _summary(days: np.ndarray) -> Dict[str, Optional[float]]:
+    if len(days) == 0:
+        return {"mean": None, **{f"p{p}": None for p in CYCLE_TIME_PERCENTILES}}
+    values = np.percentile(days, CYCLE_TIME_PERCENTILES)
+    return {
+        "mean": round(float(days.mean()), 2),
+        **{f"p{p}": round(float(value), 2) for p, value in zip(CYCLE_TIME_PERCENTILES, values)}
+    }
+
+async def cycle_times(
+    db: AsyncSession,
+    start: datetime,
+    end: datetime,
+    project_id: Optional[int] = None,
+    sprint_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    统计范围内完成的任务的周期时间与前置时间（天）
+
+    周期时间为第一次离开未开始状态到完成的时间，前置时间为任务进入看板（创建）到完成的时间。
+    完成事件以范围索引读取，完成任务的历史按 (task_id, at) 索引读取，按任务向量化求最早时间。
+
+    Args:
+        db: 数据库会话
+        start: 起始日期（含）
+        end: 结束日期（不含）
+        project_id: 项目ID
+        sprint_id: 迭代ID，与 project_id 二选一
+
+    Returns:
+        Dict[str, Any]: 完成任务数 count，以及 cycle_time、lead_time 的均值和百分位
+
+    Raises:
+        ValueError: 范围参数无效
+    """
+    scope = _scope_column(project_id, sprint_id)
+    _day_range(start, end)
+
+    e = TaskStatusEvent
+    done = (await db.execute(
+        select(e.task_id, e.at).where(
+            scope, e.at >= start, e.at < end, func.lower(e.to_status).in_(DONE_STATUSES),
+            # 完成后只修改预估工时的事件不是新的完成
+            e.from_status.is_distinct_from(e.to_status)
+        )
+    )).all()
+    if not done:
+        return {"count": 0, "cycle_time": _summary(np.array([])), "lead_time": _summary(np.array([]))}
+
+    done_task, done_at = (np.array(column) for column in zip(*done))
+    task_ids, done_index = np.unique(done_task, return_inverse=True)
+    never = np.datetime64("NaT", "us")
+    # 任务在范围内多次完成（重新打开后再完成）时取最后一次
+    completed = np.full(len(task_ids), np.datetime64("1970-01-01", "us"))
+    np.maximum.at(completed, done_index.reshape(-1), _timestamps(done_at))
+
+    history = (await db.execute(
+        select(e.task_id, e.to_status, e.at).where(e.task_id.in_(task_ids.tolist()), e.at < end)
+    )).all()
+    history_task, history_status, history_at = (list(column) for column in zip(*history))
+    history_index = np.searchsorted(task_ids, np.array(history_task))
+    history_at = _timestamps(history_at)
+    status = np.array([normalize_status(value) for value in history_status], dtype=object)
+    is_started = ~np.isin(status, list(TODO_STATUSES) + [""])
+
+    far = np.datetime64("9999-12-31", "us")
+    created = np.full(len(task_ids), far)
+    started = np.full(len(task_ids), far)
+    np.minimum.at(created, history_index, history_at)
+    np.minimum.at(started, history_index[is_started], history_at[is_started])
+    started = np.where(started == far, never, started)
+
+    one_day = np.timedelta64(1, "D")
+    cycle = (completed - started) / one_day
+    lead = (completed - created) / one_day
+    return {
+        "count": len(task_ids),
+        "cycle_time": _summary(cycle[~np.isnan(cycle)]),
+        "lead_time": _summary(lead)
+    }
@@ -0,0 +1,80 @@
+from itertools import chain
+from typing import Any, Dict, Iterable
+
+from sqlalchemy import event, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.query_counter import EXPECTED_REPEAT
+from app.models import DataVersion
+
+# 会话 info 中暂存本事务修改过的表名的键
+CHANGED_TABLES_KEY = "changed_tables"
+
+# 数据库标识在 data_versions 中的键，迁移时写入随机值
+EPOCH_KEY = "_epoch"
+
+def mark_tables_changed(db: Any, tables: Iterable[str]) -> None:
+    """
+    登记本事务中修改过的表，提交前递增其版本号
+
+    ORM 增删改和通过会话执行的 insert/update/delete 会自动登记。
+
+    Args:
+        db: 数据库会话（AsyncSession 或 Session）
+        tables: 表名
+    """
+    tables = {table for table in tables if table != DataVersion.__tablename__}
+    if tables:
+        session = getattr(db, "sync_session", db)
+        session.info.setdefault(CHANGED_TABLES_KEY, set()).update(tables)
+
+@event.listens_for(Session, "after_flush")
+def _collect_flushed(session: Session, flush_context) -> None:
+    dirty = (obj for obj in session.dirty if session.is_modified(obj))
+    mark_tables_changed(session, [obj.__table__.name for obj in chain(session.new, dirty, session.deleted)])
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_statement(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None:
+            mark_tables_changed(orm_execute_state.session, [table.name])
+
+@event.listens_for(Session, "before_commit")
+def _bump_versions(session: Session) -> None:
+    # 先写入未 flush 的修改，版本号与修改在同一事务中提交
+    session.flush()
+    changed = session.info.pop(CHANGED_TABLES_KEY, None)
+    if not changed:
+        return
+    stmt = insert(DataVersion).values([{"name": table, "version": 1} for table in sorted(changed)])
+    session.execute(stmt.on_conflict_do_update(
+        index_elements=[DataVersion.name], set_={"version": DataVersion.version + 1}
+    ))
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session: Session, previous_transaction) -> None:
+    session.info.pop(CHANGED_TABLES_KEY, None)
+
+async def table_versions(db: AsyncSession, tables: Iterable[str]) -> Dict[str, int]:
+    """
+    读取表的版本号及数据库标识，没有写入过的表版本号为 0
+
+    Args:
+        db: 数据库会话
+        tables: 表名
+
+    Returns:
+        Dict[str, int]: 表名 -> 版本号
+    """
+    names = sorted(set(tables) | {EPOCH_KEY})
+    result = await db.execute(
+        select(DataVersion.name, DataVersion.version)
+        .where(DataVersion.name.in_(names))
+        .execution_options(**{EXPECTED_REPEAT: True})
+    )
+    versions = {name: 0 for name in names}
+    versions.update(result.all())
+    return versions
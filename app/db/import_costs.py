@@ -0,0 +1,59 @@
+import argparse
+import json
+import asyncio
+import sys
+from pathlib import Path
+
+from app.crud import cost_import
+from app.db.migrate import upgrade_database
+from app.db.session import AsyncSessionLocal
+
+def print_progress(job) -> None:
+    print(f"  rows {job.processed_rows}: imported {job.imported_rows}, failed {job.failed_rows}")
+
+async def import_costs(path: str, chunk_size: int, resume: bool) -> int:
+    """
+    从 CSV/XLSX 文件导入成本记录
+
+    Args:
+        path: 文件路径
+        chunk_size: 每个事务导入的行数
+        resume: 是否接管仍处于进行中状态的同一文件的导入
+
+    Returns:
+        int: 退出码
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in cost_import.SUPPORTED_SUFFIXES:
+        print("Only .csv and .xlsx files are supported")
+        return 1
+    try:
+        cost_import.check_columns(cost_import.read_columns(path, suffix))
+    except ValueError as exc:
+        print(exc)
+        return 1
+
+    upgrade_database()
+
+    async with AsyncSessionLocal() as db:
+        job, accepted = await cost_import.create_import(
+            db, Path(path).name, cost_import.file_hash(path), None, resume_in_progress=resume
+        )
+    if not accepted:
+        print(f"File already imported (import {job.id}, status {job.status})")
+        return 1
+
+    print(f"Importing {path} as import {job.id}...")
+    job = await cost_import.run_import(job.id, path, chunk_size=chunk_size, progress=print_progress)
+    print(f"Import {job.status}: {job.imported_rows} imported, {job.failed_rows} failed")
+    for error in json.loads(job.errors or "[]")[:20]:
+        print(f"  row {error['row']}: {error['error']}")
+    return 0 if job.status == "completed" else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import cost records from a CSV or XLSX file")
+    parser.add_argument("path", help="CSV or XLSX file with project_id, record_date, cost_type, amount[, description]")
+    parser.add_argument("--chunk-size", type=int, default=cost_import.IMPORT_CHUNK_SIZE)
+    parser.add_argument("--resume", action="store_true", help="take over an import of the same file left running by a killed process")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(import_costs(args.path, args.chunk_size, args.resume)))
@@ -2,12 +2,13 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.security import get_password_hash
-from app.db.session import SessionLocal, engine
+from app.db.migrate import upgrade_database
+from app.db.session import SessionLocal
 from app.models import models
 
 def init_db() -> None:
-    # 创建所有表
-    models.Base.metadata.create_all(bind=engine)
+    # 迁移数据库结构到最新版本
+    upgrade_database()
     
     db = SessionLocal()
     
@@ -0,0 +1,33 @@
+from alembic import command
+from alembic.config import Config
+
+from app.core.config import BASE_DIR
+
+def get_alembic_config(configure_logger: bool = False) -> Config:
+    """
+    获取 Alembic 配置
+
+    Args:
+        configure_logger: 是否按 alembic.ini 重新配置日志（应用内调用时应保留应用自身的日志配置）
+
+    Returns:
+        Config: Alembic 配置
+    """
+    config = Config(str(BASE_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BASE_DIR / "alembic"))
+    config.attributes["configure_logger"] = configure_logger
+    return config
+
+def upgrade_database(revision: str = "head") -> None:
+    """
+    将数据库迁移到指定版本（默认最新）
+
+    Args:
+        revision: 目标版本
+    """
+    command.upgrade(get_alembic_config(), revision)
+
+if __name__ == "__main__":
+    print("Upgrading database schema...")
+    upgrade_database()
+    print("Database schema is up to date")
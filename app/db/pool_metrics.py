@@ -0,0 +1,99 @@
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import Histogram, MetricsWriter
+
+# 连接池等待时间直方图的桶上限（秒）
+POOL_WAIT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+class PoolStats:
+    """
+    单个连接池的取连接统计
+    """
+
+    def __init__(self, name: str, engine: Engine):
+        self.name = name
+        self.engine = engine
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait = Histogram(POOL_WAIT_BUCKETS)
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    记录取连接等待时间的异步连接池
+
+    等待时间包含排队等待空闲连接，以及池未满时新建连接的时间。
+    """
+
+    stats: Optional[PoolStats] = None
+
+    def _do_get(self) -> Any:
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            if self.stats is not None:
+                self.stats.timeouts += 1
+            raise
+        if self.stats is not None:
+            self.stats.checkouts += 1
+            self.stats.wait.observe(time.perf_counter() - started)
+        return connection
+
+    def recreate(self) -> "TimedAsyncAdaptedQueuePool":
+        # engine.dispose() 用新池替换旧池，统计延续到新池
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+# 池名称 -> 统计
+pool_stats: Dict[str, PoolStats] = {}
+
+def register_pool(name: str, engine: Engine) -> None:
+    """
+    登记需要导出指标的连接池
+
+    Args:
+        name: 池名称，作为指标的 pool 标签
+        engine: 同步引擎（异步引擎传入其 sync_engine）
+    """
+    stats = pool_stats[name] = PoolStats(name, engine)
+    if isinstance(engine.pool, TimedAsyncAdaptedQueuePool):
+        engine.pool.stats = stats
+
+def write_pool_metrics(writer: MetricsWriter) -> None:
+    """
+    导出各连接池的容量、占用和等待时间
+    """
+    pools = sorted(pool_stats.items())
+
+    def gauge(method: str):
+        # 池类型不支持时（如 SingletonThreadPool）跳过
+        return [
+            ((("pool", name),), getattr(stats.engine.pool, method)())
+            for name, stats in pools if hasattr(stats.engine.pool, method)
+        ]
+
+    writer.metric("db_pool_size", "gauge", "Configured pool size", gauge("size"))
+    writer.metric("db_pool_checked_out", "gauge", "Connections currently checked out", gauge("checkedout"))
+    # QueuePool 在连接尚未建满时 overflow() 为负数
+    writer.metric(
+        "db_pool_overflow", "gauge", "Overflow connections currently open",
+        [(labels, max(value, 0)) for labels, value in gauge("overflow")]
+    )
+    writer.metric(
+        "db_pool_checkouts_total", "counter", "Connections checked out from the pool",
+        [((("pool", name),), stats.checkouts) for name, stats in pools]
+    )
+    writer.metric(
+        "db_pool_timeouts_total", "counter", "Checkouts that timed out waiting for a connection",
+        [((("pool", name),), stats.timeouts) for name, stats in pools]
+    )
+    writer.histogram(
+        "db_pool_wait_seconds", "Time spent waiting for a pooled connection",
+        [((("pool", name),), stats.wait) for name, stats in pools]
+    )
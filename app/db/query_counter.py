@@ -0,0 +1,82 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.sql_profile import sql_profiler
+
+# 连接 info 中暂存语句开始时间的键（嵌套执行时为栈）
+STARTED_KEY = "query_started"
+
+# 执行选项：语句每个连接执行一次属于预期（如事务开始、版本号核对），不计入重复语句检测
+EXPECTED_REPEAT = "expected_repeat"
+
+class RequestQueries:
+    """
+    单个请求内执行的 SQL 语句统计
+
+    语句文本使用占位符，参数不同的同一语句文本相同；同一语句重复执行多次通常是
+    逐行查询关联数据（N+1）的迹象。
+    """
+
+    def __init__(self, route: Optional[str] = None):
+        self.route = route
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, seconds: float, expected_repeat: bool = False) -> None:
+        self.count += 1
+        self.seconds += seconds
+        if not expected_repeat:
+            self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        列出执行次数达到阈值的语句
+
+        Args:
+            threshold: 次数阈值
+
+        Returns:
+            List[Tuple[str, int]]: (语句, 次数)，按次数降序
+        """
+        return [(statement, count) for statement, count in self.statements.most_common() if count >= threshold]
+
+# 当前请求的语句统计，由中间件设置；请求之外（后台任务、命令行脚本）为 None
+current_queries: ContextVar[Optional[RequestQueries]] = ContextVar("current_queries", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(STARTED_KEY, []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    seconds = time.perf_counter() - conn.info[STARTED_KEY].pop()
+    queries = current_queries.get()
+    if queries is not None:
+        expected_repeat = context is not None and context.execution_options.get(EXPECTED_REPEAT, False)
+        queries.record(statement, seconds, expected_repeat)
+    if settings.SQL_PROFILE_ENABLED:
+        sql_profiler.record(
+            conn, cursor, statement, parameters, executemany, seconds, queries.route if queries is not None else None
+        )
+
+def _handle_error(exception_context):
+    # 执行失败时不会触发 after_cursor_execute，丢弃对应的开始时间
+    conn = exception_context.connection
+    if conn is not None and conn.info.get(STARTED_KEY):
+        conn.info[STARTED_KEY].pop()
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    为引擎注册语句计时事件，统计计入当前请求和进程级的 SQL 剖析器
+
+    Args:
+        engine: 同步引擎（异步引擎传入其 sync_engine）
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,19 @@
+import asyncio
+
+from app.crud import statistics
+from app.db.migrate import upgrade_database
+from app.db.session import AsyncSessionLocal
+
+async def rebuild_statistics() -> None:
+    """
+    从任务表全量重建统计汇总表，用于首次部署或修复统计偏差
+    """
+    upgrade_database()
+    
+    async with AsyncSessionLocal() as db:
+        count = await statistics.rebuild(db)
+        print(f"Statistics rollup rebuilt: {count} rows")
+
+if __name__ == "__main__":
+    print("Rebuilding statistics rollup...")
+    asyncio.run(rebuild_statistics())
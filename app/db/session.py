@@ -1,20 +1,131 @@
-from sqlalchemy import create_engine
+from typing import AsyncGenerator, List
+
+from fastapi import Request
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+# 注册数据版本号的会话事件：所有会话（含命令行脚本）的写事务都会递增所改表的版本号
+from app.db import data_versions  # noqa: F401
+from app.db.pool_metrics import TimedAsyncAdaptedQueuePool, register_pool
+from app.db.query_counter import EXPECTED_REPEAT, instrument_engine
+
+# 使用只读连接池的请求方法
+READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+def sqlite_pragmas(read_only: bool = False) -> List[str]:
+    """
+    生成连接建立时执行的 SQLite PRAGMA 语句
+
+    Args:
+        read_only: 是否为只读连接；只读连接不修改日志模式，并开启 query_only
+
+    Returns:
+        List[str]: PRAGMA 语句列表
+    """
+    pragmas = [f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}"]
+    if not read_only:
+        pragmas.append(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    pragmas += [
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}",
+        f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}",
+        f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+def configure_sqlite(engine: Engine, read_only: bool = False) -> None:
+    """
+    为引擎注册连接事件，在每个新连接上应用生产环境 PRAGMA
+
+    Args:
+        engine: 同步引擎（异步引擎传入其 sync_engine）
+        read_only: 是否为只读连接池
+    """
+    pragmas = sqlite_pragmas(read_only)
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+def enable_read_snapshots(engine: Engine) -> None:
+    """
+    让只读连接上的事务从第一条查询开始就是一个一致的快照
 
+    sqlite3 驱动只在写语句前隐式发出 BEGIN，只读会话的每条 SELECT 各自看到最新提交的数据；
+    这里改为由 SQLAlchemy 在事务开始时显式发出 BEGIN，同一会话内的多条查询读取同一个 WAL 快照，
+    会话提交、回滚或关闭时结束。
+
+    Args:
+        engine: 同步引擎（异步引擎传入其 sync_engine）
+    """
+    @event.listens_for(engine, "connect")
+    def _disable_implicit_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN", execution_options={EXPECTED_REPEAT: True})
+
+# 同步引擎：仅用于建表和命令行脚本（初始化、重建统计等）
 engine = create_engine(
     settings.SQLITE_URL_WITH_ABS_PATH, connect_args={"check_same_thread": False}
 )
+configure_sqlite(engine)
+instrument_engine(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# 异步写引擎：单连接，所有写操作在池上排队而不是在 SQLite 上争锁
+async_engine = create_async_engine(
+    settings.ASYNC_SQLITE_URL,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    pool_size=1,
+    max_overflow=0,
+    pool_timeout=settings.SQLITE_WRITER_POOL_TIMEOUT
+)
+configure_sqlite(async_engine.sync_engine)
+instrument_engine(async_engine.sync_engine)
+register_pool("writer", async_engine.sync_engine)
+AsyncSessionLocal = sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+# 异步读引擎：多连接只读池，WAL 模式下读请求不会被写事务阻塞
+async_read_engine = create_async_engine(
+    settings.ASYNC_SQLITE_URL,
+    poolclass=TimedAsyncAdaptedQueuePool,
+    pool_size=settings.SQLITE_READER_POOL_SIZE,
+    max_overflow=0
+)
+configure_sqlite(async_read_engine.sync_engine, read_only=True)
+enable_read_snapshots(async_read_engine.sync_engine)
+instrument_engine(async_read_engine.sync_engine)
+register_pool("reader", async_read_engine.sync_engine)
+AsyncReadSessionLocal = sessionmaker(
+    bind=async_read_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
 # 依赖项
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    获取数据库会话：GET 等只读请求使用只读连接池，其余请求使用写连接
+    """
+    session_factory = AsyncReadSessionLocal if request.method in READ_METHODS else AsyncSessionLocal
+    async with session_factory() as db:
         yield db
-    finally:
-        db.close() 
\ No newline at end of file
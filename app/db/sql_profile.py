@@ -0,0 +1,270 @@
+import logging
+import random
+import re
+import threading
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+
+# 慢查询日志，SQL_SLOW_QUERY_LOG_FILE 不为空时同时写入该文件
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+# 指纹数达到上限后，新出现的语句合并计入此指纹
+OTHER_FINGERPRINT = "<other>"
+
+# 可以 EXPLAIN QUERY PLAN 的语句
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+
+# top() 支持的排序统计项
+PROFILE_ORDERS = ("total", "calls", "mean", "p95", "max", "rows")
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \(\?(?:, ?\?)*\)", re.IGNORECASE)
+_REPEATED_GROUP = re.compile(r"(\(\?(?:, ?\?)*\))(?:, ?\1)+")
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    把语句归一化为指纹：合并空白，字面量替换为 ?，IN 列表与多行 VALUES 折叠为一项
+
+    Args:
+        statement: SQL 语句
+
+    Returns:
+        str: 指纹
+    """
+    text = _WHITESPACE.sub(" ", statement).strip()
+    text = _STRING.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _IN_LIST.sub("IN (?...)", text)
+    return _REPEATED_GROUP.sub(r"\1, ...", text)
+
+def _rows_returned(cursor: Any) -> Optional[int]:
+    """
+    语句返回的行数（写语句为影响的行数），无法得知时为 None
+
+    aiosqlite 适配器执行查询时已取回全部结果行；同步引擎的查询结果尚未读取，行数未知。
+    """
+    if cursor.description is None:
+        return cursor.rowcount if cursor.rowcount >= 0 else None
+    rows = getattr(cursor, "_rows", None)
+    return len(rows) if rows is not None else None
+
+def _format_plan(rows: List[tuple]) -> str:
+    # EXPLAIN QUERY PLAN 的行为 (id, parent, notused, detail)，按父节点缩进
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + detail)
+    return "\n".join(lines)
+
+def explain_query_plan(conn: Any, statement: str, parameters: Any) -> Optional[str]:
+    """
+    在执行语句的同一连接上获取查询计划
+
+    直接使用 DBAPI 游标执行，不触发引擎事件。
+
+    Args:
+        conn: SQLAlchemy 连接
+        statement: SQL 语句
+        parameters: 语句参数
+
+    Returns:
+        Optional[str]: 查询计划，语句不支持或获取失败时为 None
+    """
+    if statement.lstrip().split(None, 1)[0].upper() not in EXPLAINABLE:
+        return None
+    try:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+            return _format_plan(cursor.fetchall())
+        finally:
+            cursor.close()
+    except Exception as exc:
+        return f"<explain failed: {exc}>"
+
+class FingerprintStats:
+    """
+    单个指纹的累计统计
+
+    耗时样本使用水塘抽样，样本数固定，分位数近似反映启动（或重置）以来的全部调用。
+    """
+
+    __slots__ = ("calls", "seconds", "max_seconds", "rows", "samples", "plan")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.rows = 0
+        self.samples: List[float] = []
+        self.plan: Optional[str] = None
+
+    def record(self, seconds: float, rows: Optional[int], max_samples: int) -> None:
+        self.calls += 1
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        if rows is not None:
+            self.rows += rows
+        if len(self.samples) < max_samples:
+            self.samples.append(seconds)
+        else:
+            slot = random.randrange(self.calls)
+            if slot < max_samples:
+                self.samples[slot] = seconds
+
+    def summary(self, fingerprint: str) -> Dict[str, Any]:
+        p50, p95, p99 = np.percentile(self.samples, [50, 95, 99]) * 1000 if self.samples else (0.0, 0.0, 0.0)
+        return {
+            "fingerprint": fingerprint,
+            "calls": self.calls,
+            "total_ms": round(self.seconds * 1000, 3),
+            "mean_ms": round(self.seconds * 1000 / self.calls, 3) if self.calls else 0.0,
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "rows": self.rows,
+            "plan": self.plan
+        }
+
+class SqlProfiler:
+    """
+    进程内的 SQL 剖析器：按语句指纹累计调用次数、耗时分布和返回行数，并记录慢查询
+
+    在所有引擎的语句执行事件中调用（见 app.db.query_counter），同步引擎可能在线程池中执行，
+    统计更新加锁。
+    """
+
+    def __init__(self, max_fingerprints: int, max_samples: int, slow_ms: float, keep_slow: int):
+        self.max_fingerprints = max_fingerprints
+        self.max_samples = max_samples
+        self.slow_seconds = slow_ms / 1000
+        self._lock = threading.Lock()
+        self._stats: Dict[str, FingerprintStats] = {}
+        self._slow: Deque[Dict[str, Any]] = deque(maxlen=keep_slow)
+        self._slow_count = 0
+        self._since = datetime.utcnow()
+
+    def record(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        executemany: bool,
+        seconds: float,
+        route: Optional[str]
+    ) -> None:
+        """
+        记录一次语句执行；超过慢查询阈值时获取查询计划并写入慢查询日志
+
+        Args:
+            conn: SQLAlchemy 连接
+            cursor: DBAPI 游标
+            statement: SQL 语句
+            parameters: 语句参数
+            executemany: 是否为批量执行
+            seconds: 耗时（秒）
+            route: 发起语句的请求（"方法 路径"），请求之外为 None
+        """
+        key = fingerprint(statement)
+        rows = _rows_returned(cursor)
+        slow = self.slow_seconds > 0 and seconds >= self.slow_seconds
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    key = OTHER_FINGERPRINT
+                stats = self._stats.setdefault(key, FingerprintStats())
+            stats.record(seconds, rows, self.max_samples)
+            need_plan = slow and stats.plan is None and key != OTHER_FINGERPRINT
+        if not slow:
+            return
+
+        # 同一指纹的计划只获取一次；批量执行取第一组参数
+        plan = stats.plan
+        if need_plan:
+            plan = explain_query_plan(conn, statement, parameters[0] if executemany else parameters)
+            stats.plan = plan
+        entry = {
+            "at": datetime.utcnow(),
+            "route": route,
+            "ms": round(seconds * 1000, 3),
+            "rows": rows,
+            "fingerprint": key,
+            "plan": plan
+        }
+        with self._lock:
+            self._slow.append(entry)
+            self._slow_count += 1
+        slow_query_logger.warning(
+            f"慢查询 {entry['ms']:.1f} ms, route={route or '-'}, rows={rows}: {key[:500]}\n{plan or ''}".rstrip()
+        )
+
+    def top(self, n: int = 20, order_by: str = "total") -> Dict[str, Any]:
+        """
+        按指定统计项列出前 N 个指纹
+
+        Args:
+            n: 条数
+            order_by: 排序统计项，见 PROFILE_ORDERS
+
+        Returns:
+            Dict[str, Any]: 统计开始时间 since、指纹数、前 N 个指纹 fingerprints 和最近的慢查询 slow_queries
+
+        Raises:
+            ValueError: 排序统计项无效
+        """
+        if order_by not in PROFILE_ORDERS:
+            raise ValueError(f"order_by must be one of: {', '.join(PROFILE_ORDERS)}")
+        with self._lock:
+            summaries = [stats.summary(key) for key, stats in self._stats.items() if stats.calls]
+            slow = list(self._slow)
+            slow_count = self._slow_count
+            since = self._since
+        field = {"total": "total_ms", "mean": "mean_ms", "p95": "p95_ms", "max": "max_ms"}.get(order_by, order_by)
+        summaries.sort(key=lambda item: item[field], reverse=True)
+        return {
+            "since": since,
+            "fingerprint_count": len(summaries),
+            "slow_query_ms": self.slow_seconds * 1000,
+            "slow_query_count": slow_count,
+            "fingerprints": summaries[:n],
+            "slow_queries": slow[::-1]
+        }
+
+    def reset(self) -> None:
+        """
+        清空全部统计和慢查询记录
+        """
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+            self._slow_count = 0
+            self._since = datetime.utcnow()
+
+def configure_slow_query_log() -> None:
+    """
+    配置了 SQL_SLOW_QUERY_LOG_FILE 时，把慢查询日志同时写入该文件
+    """
+    if settings.SQL_SLOW_QUERY_LOG_FILE and not slow_query_logger.handlers:
+        handler = logging.FileHandler(settings.SQL_SLOW_QUERY_LOG_FILE, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        slow_query_logger.addHandler(handler)
+
+sql_profiler = SqlProfiler(
+    max_fingerprints=settings.SQL_PROFILE_MAX_FINGERPRINTS,
+    max_samples=settings.SQL_PROFILE_SAMPLES,
+    slow_ms=settings.SQL_SLOW_QUERY_MS,
+    keep_slow=settings.SQL_SLOW_QUERY_KEEP
+)
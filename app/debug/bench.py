@@ -0,0 +1,435 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+from app.debug.dataset import BENCH_USERNAME, Distributions, Scale, build_dataset, dataset_ids
+
+API = "/api/v1"
+
+# 压测期间的统计区间，与数据集的时间范围一致
+RANGE_START = Distributions().start
+RANGE_END = str(np.datetime64(RANGE_START) + np.timedelta64(Distributions().days, "D"))
+
+class Context:
+    """
+    生成请求时共享的状态：随机数、各表的ID范围，以及创建接口产生、删除接口消费的ID
+    """
+
+    def __init__(self, ids: Dict[str, int], seed: int):
+        self.ids = ids
+        self.rng = random.Random(seed)
+        self.created: Dict[str, List[Any]] = {}
+        self.sequence = 0
+
+    def pick(self, table: str) -> int:
+        return self.rng.randint(1, max(self.ids[table], 1))
+
+    def unique(self) -> int:
+        self.sequence += 1
+        return self.sequence
+
+    def take(self, pool: str) -> Any:
+        return self.created[pool].pop()
+
+class Endpoint(NamedTuple):
+    """
+    压测的接口
+
+    make 返回请求参数：path（路径参数）以及 params、json、data、files；
+    produces 不为空时把响应中的ID（批量创建为ID列表）存入同名的池，供 consumes 同名池的删除接口使用。
+    """
+    method: str
+    path: str
+    make: Callable[[Context], Dict[str, Any]]
+    expected: int = 200
+    produces: Optional[str] = None
+    consumes: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {API}{self.path}"
+
+def _project_body(ctx: Context) -> Dict[str, Any]:
+    return {
+        "name": f"压测项目{ctx.unique()}", "description": "bench", "start_date": f"{RANGE_START}T00:00:00",
+        "end_date": "2024-12-31T00:00:00", "status": "IN_PROGRESS", "fixed_cost_monthly": 5000.0
+    }
+
+def _sprint_body(ctx: Context) -> Dict[str, Any]:
+    return {
+        "name": f"压测迭代{ctx.unique()}", "start_date": "2024-03-01T00:00:00", "end_date": "2024-03-14T00:00:00",
+        "status": "active", "project_id": ctx.pick("projects")
+    }
+
+def _task_body(ctx: Context) -> Dict[str, Any]:
+    return {
+        "title": f"压测任务{ctx.unique()}", "status": ctx.rng.choice(["todo", "in_progress", "done"]),
+        "priority": "medium", "project_id": ctx.pick("projects"), "assignee_id": ctx.pick("team_members"),
+        "estimated_hours": 3.0
+    }
+
+def _cost_body(ctx: Context) -> Dict[str, Any]:
+    return {
+        "project_id": ctx.pick("projects"), "record_date": "2024-06-01T00:00:00",
+        "cost_type": ctx.rng.choice(["fixed", "human", "other"]), "amount": round(ctx.rng.uniform(10, 1000), 2)
+    }
+
+def _member_body(ctx: Context) -> Dict[str, Any]:
+    return {"name": f"压测成员{ctx.unique()}", "role": "dev", "monthly_salary": 20000.0, "join_date": "2023-01-01T00:00:00"}
+
+def _import_file(ctx: Context) -> Dict[str, Any]:
+    # 内容不同才不会被当作重复导入
+    content = f"project_id,record_date,cost_type,amount\n{ctx.pick('projects')},2024-05-01,human,{ctx.unique()}\n"
+    return {"files": {"file": ("costs.csv", content.encode(), "text/csv")}}
+
+def _range(ctx: Context, **extra: Any) -> Dict[str, Any]:
+    return {"params": {"start_date": f"{RANGE_START}T00:00:00", "end_date": f"{RANGE_END}T00:00:00", **extra}}
+
+# 按顺序压测：读接口、创建、修改，最后删除前面创建的数据
+ENDPOINTS: List[Endpoint] = [
+    Endpoint("GET", "/auth/me", lambda ctx: {}),
+    Endpoint("GET", "/auth/cache-stats", lambda ctx: {}),
+    Endpoint("GET", "/projects/", lambda ctx: {"params": {"limit": 50}}),
+    Endpoint("GET", "/projects/{project_id}", lambda ctx: {"path": {"project_id": ctx.pick("projects")}}),
+    Endpoint("GET", "/projects/{project_id}/stats", lambda ctx: {"path": {"project_id": ctx.pick("projects")}}),
+    Endpoint("GET", "/projects/{project_id}/overview", lambda ctx: {"path": {"project_id": ctx.pick("projects")}}),
+    Endpoint("GET", "/projects/{project_id}/activities", lambda ctx: {"path": {"project_id": ctx.pick("projects")}}),
+    Endpoint("GET", "/sprints/", lambda ctx: {"params": {"limit": 50}}),
+    Endpoint("GET", "/sprints/{sprint_id}", lambda ctx: {"path": {"sprint_id": ctx.pick("sprints")}}),
+    Endpoint("GET", "/sprints/project/{project_id}", lambda ctx: {"path": {"project_id": ctx.pick("projects")}}),
+    Endpoint("GET", "/sprints/project/{project_id}/velocity", lambda ctx: {"path": {"project_id": ctx.pick("projects")}}),
+    Endpoint("GET", "/sprints/{sprint_id}/burndown", lambda ctx: {"path": {"sprint_id": ctx.pick("sprints")}}),
+    Endpoint("GET", "/team-members/", lambda ctx: {"params": {"limit": 50}}),
+    Endpoint("GET", "/team-members/{team_member_id}", lambda ctx: {"path": {"team_member_id": ctx.pick("team_members")}}),
+    Endpoint("GET", "/team-members/project-members/{project_id}", lambda ctx: {"path": {"project_id": ctx.pick("projects")}}),
+    Endpoint("GET", "/tasks/", lambda ctx: {"params": {"limit": 50}}),
+    Endpoint("GET", "/tasks/{task_id}", lambda ctx: {"path": {"task_id": ctx.pick("tasks")}}),
+    Endpoint("GET", "/tasks/sprint/{sprint_id}", lambda ctx: {"path": {"sprint_id": ctx.pick("sprints")}}),
+    Endpoint("GET", "/costs/", lambda ctx: {"params": {"limit": 50}}),
+    Endpoint("GET", "/costs/{cost_id}", lambda ctx: {"path": {"cost_id": ctx.pick("cost_records")}}),
+    Endpoint("GET", "/costs/project/{project_id}", lambda ctx: {"path": {"project_id": ctx.pick("projects")}}),
+    Endpoint("GET", "/costs/project/{project_id}/monthly",
+             lambda ctx: {"path": {"project_id": ctx.pick("projects")}, "params": {"year": 2024, "month": ctx.rng.randint(1, 12)}}),
+    Endpoint("GET", "/costs/project/{project_id}/stats", lambda ctx: {"path": {"project_id": ctx.pick("projects")}}),
+    Endpoint("GET", "/costs/monthly-series",
+             lambda ctx: {"params": {"start": "2024-01", "end": "2024-12", "project_ids": [ctx.pick("projects")]}}),
+    Endpoint("GET", "/costs/labor", lambda ctx: _range(ctx, project_ids=[ctx.pick("projects")])),
+    Endpoint("GET", "/costs/fixed-accruals", lambda ctx: _range(ctx, project_ids=[ctx.pick("projects")])),
+    Endpoint("GET", "/statistics", lambda ctx: {}),
+    Endpoint("GET", "/activities/", lambda ctx: {"params": {"limit": 50}}),
+    Endpoint("GET", "/activities/journal-stats", lambda ctx: {}),
+    Endpoint("GET", "/export/tasks", lambda ctx: {"params": {"project_id": ctx.pick("projects")}}),
+    Endpoint("GET", "/export/costs", lambda ctx: {"params": {"project_id": ctx.pick("projects")}}),
+    Endpoint("GET", "/export/activities", lambda ctx: {"params": {"project_id": ctx.pick("projects")}}),
+    Endpoint("GET", "/analytics/cumulative-flow", lambda ctx: _range(ctx, project_id=ctx.pick("projects"))),
+    Endpoint("GET", "/analytics/cycle-time", lambda ctx: _range(ctx, project_id=ctx.pick("projects"))),
+    Endpoint("GET", "/admin/sql-profile", lambda ctx: {}),
+
+    Endpoint("POST", "/auth/login", lambda ctx: {"data": {"username": BENCH_USERNAME, "password": BENCH_USERNAME}}),
+    Endpoint("POST", "/auth/register", lambda ctx: {"json": {
+        "username": f"bench{ctx.unique()}", "email": f"bench{ctx.sequence}@example.com", "password": "bench"
+    }}),
+    Endpoint("POST", "/projects/", lambda ctx: {"json": _project_body(ctx)}, produces="projects"),
+    Endpoint("POST", "/sprints/", lambda ctx: {"json": _sprint_body(ctx)}, produces="sprints"),
+    Endpoint("POST", "/team-members/", lambda ctx: {"json": _member_body(ctx)}, expected=201, produces="team_members"),
+    Endpoint("POST", "/team-members/project-members/", lambda ctx: {"json": {
+        "project_id": ctx.pick("projects"), "member_id": ctx.pick("team_members"),
+        "allocation_percentage": 10.0, "start_date": "2024-06-01T00:00:00"
+    }}),
+    Endpoint("POST", "/tasks/", lambda ctx: {"json": _task_body(ctx)}, produces="tasks"),
+    Endpoint("POST", "/tasks/bulk", lambda ctx: {"json": {"items": [_task_body(ctx) for _ in range(20)]}},
+             produces="task_batches"),
+    Endpoint("POST", "/costs/", lambda ctx: {"json": _cost_body(ctx)}, produces="cost_records"),
+    Endpoint("POST", "/costs/import", _import_file, expected=202, produces="cost_imports"),
+    Endpoint("GET", "/costs/imports/{import_id}", lambda ctx: {"path": {"import_id": ctx.rng.choice(ctx.created["cost_imports"])}}),
+    Endpoint("POST", "/activities/", lambda ctx: {"json": {"type": "note", "content": "bench", "user_id": 1}}),
+
+    Endpoint("PUT", "/projects/{project_id}",
+             lambda ctx: {"path": {"project_id": ctx.pick("projects")}, "json": _project_body(ctx)}),
+    Endpoint("PUT", "/sprints/{sprint_id}", lambda ctx: {"path": {"sprint_id": ctx.pick("sprints")}, "json": _sprint_body(ctx)}),
+    Endpoint("PUT", "/team-members/{team_member_id}",
+             lambda ctx: {"path": {"team_member_id": ctx.pick("team_members")}, "json": {"role": "lead"}}),
+    Endpoint("PUT", "/tasks/{task_id}", lambda ctx: {"path": {"task_id": ctx.pick("tasks")}, "json": _task_body(ctx)}),
+    Endpoint("PATCH", "/tasks/bulk", lambda ctx: {"json": {"items": [
+        {"id": ctx.pick("tasks"), "status": ctx.rng.choice(["todo", "in_progress", "done"])} for _ in range(20)
+    ]}}),
+    Endpoint("PUT", "/costs/{cost_id}", lambda ctx: {"path": {"cost_id": ctx.pick("cost_records")}, "json": _cost_body(ctx)}),
+
+    Endpoint("DELETE", "/tasks/bulk", lambda ctx: {"json": {"ids": ctx.take("task_batches")}}, consumes="task_batches"),
+    Endpoint("DELETE", "/tasks/{task_id}", lambda ctx: {"path": {"task_id": ctx.take("tasks")}}, consumes="tasks"),
+    Endpoint("DELETE", "/costs/{cost_id}", lambda ctx: {"path": {"cost_id": ctx.take("cost_records")}},
+             consumes="cost_records"),
+    Endpoint("DELETE", "/sprints/{sprint_id}", lambda ctx: {"path": {"sprint_id": ctx.take("sprints")}}, consumes="sprints"),
+    Endpoint("DELETE", "/team-members/{team_member_id}",
+             lambda ctx: {"path": {"team_member_id": ctx.take("team_members")}}, expected=204, consumes="team_members"),
+    Endpoint("DELETE", "/projects/{project_id}", lambda ctx: {"path": {"project_id": ctx.take("projects")}},
+             consumes="projects"),
+    Endpoint("DELETE", "/admin/sql-profile", lambda ctx: {}),
+]
+
+def _created_ids(body: Any) -> Any:
+    # 批量创建返回 {"results": [{"id": ...}]}，其余返回单个对象
+    if isinstance(body, dict) and "results" in body:
+        return [item["id"] for item in body["results"] if item.get("id") is not None]
+    return body["id"]
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    """
+    汇总一个接口的延迟分布与吞吐量
+    """
+    values = np.array(latencies) * 1000
+    p50, p95, p99 = np.percentile(values, [50, 95, 99]) if len(values) else (0.0, 0.0, 0.0)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(float(values.mean()), 3) if len(values) else 0.0,
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "max_ms": round(float(values.max()), 3) if len(values) else 0.0,
+    }
+
+async def bench_endpoint(client, headers: Dict[str, str], ctx: Context, endpoint: Endpoint,
+                         requests: int, warmup: int, concurrency: int) -> Dict[str, Any]:
+    """
+    以固定并发压测一个接口：先执行预热请求（不计入结果），再执行正式请求
+    """
+    latencies: List[float] = []
+    failures: List[str] = []
+
+    async def send(record: bool) -> None:
+        kwargs = endpoint.make(ctx)
+        path = (API + endpoint.path).format(**kwargs.pop("path", {}))
+        started = time.perf_counter()
+        response = await client.request(endpoint.method, path, headers=headers, **kwargs)
+        elapsed = time.perf_counter() - started
+        if response.status_code != endpoint.expected:
+            failures.append(f"{response.status_code}: {response.text[:200]}")
+        elif endpoint.produces:
+            ctx.created.setdefault(endpoint.produces, []).append(_created_ids(response.json()))
+        if record:
+            latencies.append(elapsed)
+
+    async def run(total: int, record: bool) -> None:
+        remaining = [total]
+
+        async def worker() -> None:
+            while remaining[0] > 0:
+                remaining[0] -= 1
+                await send(record)
+
+        await asyncio.gather(*(worker() for _ in range(min(concurrency, total))))
+
+    await run(warmup, record=False)
+    failures.clear()
+    started = time.perf_counter()
+    await run(requests, record=True)
+    result = summarize(latencies, len(failures), time.perf_counter() - started)
+    if failures:
+        result["first_error"] = failures[0]
+    return result
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def copy_database(source: str, target: str) -> None:
+    """
+    用 SQLite 在线备份复制数据库，包含尚未合并到主文件的 WAL 内容
+    """
+    source_conn = sqlite3.connect(source)
+    target_conn = sqlite3.connect(target)
+    try:
+        source_conn.backup(target_conn)
+    finally:
+        target_conn.close()
+        source_conn.close()
+
+def run_benchmark(args: argparse.Namespace) -> int:
+    """
+    准备数据集并压测所有接口，结果写入 JSON 文件
+
+    Returns:
+        int: 退出码，存在失败请求时为 1
+    """
+    # 压测会写入数据，始终在数据集的副本上运行，使同一数据集上的多次压测可以对比
+    work_path = os.path.join(tempfile.mkdtemp(prefix="bench_"), "bench.db")
+    # 必须在导入应用之前设置，使应用连接到压测数据库
+    os.environ["SQLITE_URL"] = f"sqlite:///{work_path}"
+
+    import httpx
+
+    from app.core.security import get_password_hash
+    from app.db.migrate import upgrade_database
+
+    if args.db and os.path.exists(args.db):
+        print(f"使用已有数据集 {args.db}")
+        copy_database(args.db, work_path)
+        upgrade_database()
+    else:
+        scale = Scale(
+            projects=args.projects, members=args.members, tasks=args.tasks, costs=args.costs, activities=args.activities
+        )
+        print(f"生成数据集: {dict(scale._asdict())}")
+        upgrade_database()
+        build_dataset(work_path, scale, get_password_hash, seed=args.seed)
+        if args.db:
+            copy_database(work_path, args.db)
+            print(f"数据集已保存到 {args.db}")
+    ids = dataset_ids(work_path)
+
+    from app.main import app
+
+    # 压测期间只输出错误，避免请求日志、慢查询和 N+1 日志淹没结果（部分模块导入时配置了 DEBUG 级别）
+    logging.getLogger().setLevel(logging.ERROR)
+    logging.getLogger("app").setLevel(logging.ERROR)
+    endpoints = [endpoint for endpoint in ENDPOINTS if not args.only or any(key in endpoint.name for key in args.only)]
+    routes = {
+        f"{method.upper()} {path}"
+        for path, operations in app.openapi()["paths"].items() if path.startswith(API)
+        for method in operations
+    }
+    for route in sorted(routes - {endpoint.name for endpoint in ENDPOINTS}):
+        print(f"警告: 未压测的路由 {route}")
+
+    async def main() -> Dict[str, Any]:
+        ctx = Context(ids, args.seed)
+        results: Dict[str, Any] = {}
+        transport = httpx.ASGITransport(app=app)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+                response = await client.post(f"{API}/auth/login", data={"username": BENCH_USERNAME, "password": BENCH_USERNAME})
+                headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+                for endpoint in endpoints:
+                    needed = args.requests + args.warmup
+                    if endpoint.consumes and len(ctx.created.get(endpoint.consumes, [])) < needed:
+                        print(f"跳过 {endpoint.name}: 没有足够的待删除数据（需要同时压测对应的创建接口）")
+                        continue
+                    if endpoint.path == "/costs/imports/{import_id}" and not ctx.created.get("cost_imports"):
+                        print(f"跳过 {endpoint.name}: 需要同时压测 POST {API}/costs/import")
+                        continue
+                    result = await bench_endpoint(
+                        client, headers, ctx, endpoint, args.requests, args.warmup, args.concurrency
+                    )
+                    results[endpoint.name] = result
+                    print(f"{endpoint.name:<58} {result['rps']:9.1f} req/s  p50 {result['p50_ms']:8.2f}"
+                          f"  p95 {result['p95_ms']:8.2f}  p99 {result['p99_ms']:8.2f} ms"
+                          + (f"  {result['errors']} 失败" if result["errors"] else ""))
+        return results
+
+    results = asyncio.run(main())
+    report = {
+        "meta": {
+            "created_at": datetime.utcnow().isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "dataset": ids,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "seed": args.seed,
+        },
+        "endpoints": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"结果已写入 {args.output}")
+    return 1 if any(result["errors"] for result in results.values()) else 0
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any], tolerance: float,
+                    min_delta_ms: float) -> List[str]:
+    """
+    对比两次压测结果，找出退化的接口
+
+    p95 延迟增加超过 tolerance 比例且绝对值超过 min_delta_ms，或吞吐量下降超过 tolerance 比例，
+    或失败请求数增加，视为退化。
+
+    Args:
+        baseline: 基准结果
+        current: 本次结果
+        tolerance: 允许的相对变化，如 0.1 表示 10%
+        min_delta_ms: p95 的最小绝对变化（毫秒），过滤亚毫秒接口的抖动
+
+    Returns:
+        List[str]: 退化说明
+    """
+    regressions = []
+    before_all, after_all = baseline["endpoints"], current["endpoints"]
+    for name in sorted(set(before_all) | set(after_all)):
+        before, after = before_all.get(name), after_all.get(name)
+        if before is None or after is None:
+            print(f"{name:<58} {'仅在本次结果中' if before is None else '仅在基准结果中'}")
+            continue
+        p95_change = after["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        rps_change = after["rps"] / before["rps"] - 1 if before["rps"] else 0.0
+        problems = []
+        if p95_change > tolerance and after["p95_ms"] - before["p95_ms"] >= min_delta_ms:
+            problems.append(f"p95 {before['p95_ms']:.2f} -> {after['p95_ms']:.2f} ms ({p95_change:+.0%})")
+        if rps_change < -tolerance:
+            problems.append(f"吞吐量 {before['rps']:.1f} -> {after['rps']:.1f} req/s ({rps_change:+.0%})")
+        if after["errors"] > before["errors"]:
+            problems.append(f"失败请求 {before['errors']} -> {after['errors']}")
+        print(f"{name:<58} p95 {p95_change:+7.1%}  吞吐量 {rps_change:+7.1%}" + ("  退化" if problems else ""))
+        regressions += [f"{name}: {problem}" for problem in problems]
+    return regressions
+
+def run_compare(args: argparse.Namespace) -> int:
+    """
+    对比两个结果文件，存在退化时返回 1
+    """
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.current, encoding="utf-8") as f:
+        current = json.load(f)
+    if baseline["meta"].get("dataset") != current["meta"].get("dataset"):
+        print("警告: 两次压测的数据集规模不同")
+    regressions = compare_results(baseline, current, args.tolerance, args.min_delta_ms)
+    for regression in regressions:
+        print(f"退化: {regression}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="接口延迟压测")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="生成数据集并压测所有接口")
+    run_parser.add_argument("--db", help="数据集文件；已存在时在其副本上压测，否则生成数据集并保存到此文件")
+    run_parser.add_argument("--projects", type=int, default=Scale._field_defaults["projects"])
+    run_parser.add_argument("--members", type=int, default=Scale._field_defaults["members"])
+    run_parser.add_argument("--tasks", type=int, default=Scale._field_defaults["tasks"])
+    run_parser.add_argument("--costs", type=int, default=Scale._field_defaults["costs"])
+    run_parser.add_argument("--activities", type=int, default=Scale._field_defaults["activities"])
+    run_parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    run_parser.add_argument("--requests", type=int, default=200, help="每个接口的正式请求数")
+    run_parser.add_argument("--warmup", type=int, default=10, help="每个接口的预热请求数")
+    run_parser.add_argument("--concurrency", type=int, default=8, help="并发请求数")
+    run_parser.add_argument("--only", nargs="*", help="只压测名称包含任一关键字的接口")
+    run_parser.add_argument("--output", default="bench.json", help="结果文件")
+
+    compare_parser = subparsers.add_parser("compare", help="对比两次压测结果")
+    compare_parser.add_argument("baseline", help="基准结果文件")
+    compare_parser.add_argument("current", help="本次结果文件")
+    compare_parser.add_argument("--tolerance", type=float, default=0.15, help="允许的相对变化")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=1.0, help="p95 的最小绝对变化（毫秒）")
+
+    args = parser.parse_args()
+    sys.exit(run_benchmark(args) if args.command == "run" else run_compare(args))
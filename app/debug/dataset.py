@@ -0,0 +1,661 @@
+import hashlib
+import json
+import sqlite3
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, NamedTuple, Sequence, Tuple
+
+import numpy as np
+
+# 每批生成和写入的行数
+BATCH_ROWS = 200_000
+
+# 写入数据集时的连接设置：回滚日志只保存在内存中且不同步到磁盘，崩溃时数据库可能损坏，不要用于生产库
+SEED_PRAGMAS = [
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA locking_mode=EXCLUSIVE",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-524288",
+]
+
+# 写入后递增版本号的表，使运行中的服务的缓存和 ETag 失效
+SEEDED_TABLES = (
+    "users", "team_members", "projects", "project_members", "sprints", "tasks", "task_status_events",
+    "project_task_stats", "cost_records", "cost_imports", "activities",
+)
+
+# 压测账号，密码与用户名相同
+BENCH_USERNAME = "bench"
+
+# 任务状态的流转顺序：任务从 todo 开始依次经过前面的状态到达当前状态，不在其中的状态直接由 todo 转入
+TASK_FLOW = ("todo", "in_progress", "review", "done")
+DONE_STATUS = "done"
+
+ENTITY_NAMES = {"project": "项目", "sprint": "迭代", "task": "任务"}
+ACTION_NAMES = {"created": "创建了", "updated": "更新了"}
+
+class Scale(NamedTuple):
+    """
+    数据集规模：各表新增的行数
+    """
+    users: int = 20
+    members: int = 200
+    projects: int = 100
+    sprints_per_project: int = 6
+    members_per_project: int = 5
+    tasks: int = 100_000
+    costs: int = 50_000
+    cost_imports: int = 20
+    activities: int = 200_000
+
+class Distributions(NamedTuple):
+    """
+    数据分布
+
+    字典类型的字段为 取值 -> 权重，权重不必归一化。可以用 JSON 文件覆盖任意字段，见 load_distributions。
+    """
+    # 数据的时间范围：起始日期和天数
+    start: str = "2024-01-01"
+    days: int = 366
+    # 任务、成本和活动在项目间的 Zipf 指数，0 为均匀分布，越大越集中在少数项目
+    project_skew: float = 1.0
+    project_statuses: Dict[str, float] = {"PLANNING": 0.1, "IN_PROGRESS": 0.6, "COMPLETED": 0.2, "ON_HOLD": 0.1}
+    # 项目工期（天）的范围
+    project_days: Tuple[int, int] = (90, 366)
+    project_fixed_cost: Tuple[float, float] = (0.0, 20_000.0)
+    roles: Dict[str, float] = {"dev": 0.5, "qa": 0.2, "pm": 0.1, "design": 0.1, "ops": 0.1}
+    salary: Tuple[float, float] = (8_000.0, 40_000.0)
+    member_leave_ratio: float = 0.05
+    allocations: Dict[str, float] = {"20": 0.2, "50": 0.3, "80": 0.2, "100": 0.3}
+    sprint_days: int = 14
+    # 属于迭代的任务比例
+    sprint_task_ratio: float = 0.8
+    task_statuses: Dict[str, float] = {"todo": 0.3, "in_progress": 0.25, "review": 0.1, "done": 0.35}
+    # 已完成迭代中任务为完成状态的比例，其余按 task_statuses 分布
+    closed_sprint_done_ratio: float = 0.9
+    task_priorities: Dict[str, float] = {"low": 0.3, "medium": 0.5, "high": 0.2}
+    task_hours: Dict[str, float] = {"1": 0.1, "2": 0.2, "3": 0.25, "5": 0.25, "8": 0.15, "13": 0.05}
+    # 相邻两次状态变更的平均间隔（小时，指数分布）
+    status_change_hours: float = 36.0
+    cost_types: Dict[str, float] = {"fixed": 0.3, "human": 0.5, "other": 0.2}
+    # 成本金额对数正态分布的 mu 和 sigma
+    cost_amount: Tuple[float, float] = (6.0, 1.0)
+    import_statuses: Dict[str, float] = {"completed": 0.85, "failed": 0.15}
+    import_rows: Tuple[int, int] = (10, 5_000)
+    activity_types: Dict[str, float] = {
+        "task_created": 0.3, "task_updated": 0.4, "project_created": 0.02, "project_updated": 0.08,
+        "sprint_created": 0.05, "sprint_updated": 0.15,
+    }
+    inactive_user_ratio: float = 0.05
+
+class _Parents(NamedTuple):
+    """
+    子表引用的父表数据，项目按ID升序，迭代和项目成员按项目排列
+
+    first/count 为每个项目的迭代（项目成员）在数组中的起始位置和数量。
+    """
+    users: np.ndarray
+    members: np.ndarray
+    projects: np.ndarray
+    project_start: np.ndarray
+    project_end: np.ndarray
+    project_weights: np.ndarray
+    sprints: np.ndarray
+    sprint_project: np.ndarray
+    sprint_start: np.ndarray
+    sprint_end: np.ndarray
+    sprint_closed: np.ndarray
+    sprint_first: np.ndarray
+    sprint_count: np.ndarray
+    assignees: np.ndarray
+    assignee_first: np.ndarray
+    assignee_count: np.ndarray
+
+def load_distributions(path: str) -> Distributions:
+    """
+    从 JSON 文件读取数据分布，未指定的字段使用默认值
+
+    Args:
+        path: JSON 文件路径，内容为 {字段名: 值}
+
+    Returns:
+        Distributions: 数据分布
+
+    Raises:
+        ValueError: 字段名未知
+    """
+    with open(path, encoding="utf-8") as f:
+        values = json.load(f)
+    unknown = set(values) - set(Distributions._fields)
+    if unknown:
+        raise ValueError(f"Unknown distribution fields: {', '.join(sorted(unknown))}")
+    defaults = Distributions._field_defaults
+    return Distributions(**{
+        name: tuple(value) if isinstance(defaults[name], tuple) else value for name, value in values.items()
+    })
+
+def _weights(mapping: Dict[str, float], field: str) -> Tuple[np.ndarray, np.ndarray]:
+    # 取值 -> 权重 转为取值数组和归一化的概率
+    keys = np.array(list(mapping))
+    weights = np.array(list(mapping.values()), dtype=float)
+    if not len(keys) or (weights < 0).any() or weights.sum() <= 0:
+        raise ValueError(f"{field} must map values to non-negative weights with a positive sum")
+    return keys, weights / weights.sum()
+
+def _timestamps(values: np.ndarray) -> List[str]:
+    # 与 SQLAlchemy 在 SQLite 中存储 DateTime 的格式一致（YYYY-MM-DD HH:MM:SS.ffffff）；
+    # 以字节视图把日期和时间之间的 T 替换为空格，比逐个字符串替换快得多
+    text = np.datetime_as_string(values.astype("datetime64[us]"), unit="us").astype("S26")
+    text.view(np.uint8).reshape(len(text), 26)[:, 10] = ord(" ")
+    return text.astype("U26").tolist()
+
+def _seconds(values: np.ndarray) -> np.ndarray:
+    return values.astype("int64") * np.timedelta64(1, "s")
+
+def _batches(start: int, total: int) -> Iterator[np.ndarray]:
+    # 按批生成 start..start+total-1 的ID
+    end = start + total
+    for first in range(start, end, BATCH_ROWS):
+        yield np.arange(first, min(first + BATCH_ROWS, end))
+
+def _insert(conn: sqlite3.Connection, table: str, columns: Sequence[str], rows: Iterator[tuple]) -> None:
+    placeholders = ", ".join("?" for _ in columns)
+    conn.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})", rows)
+
+def _columns(conn: sqlite3.Connection, sql: str, params: tuple, dtypes: Sequence[str]) -> List[np.ndarray]:
+    # 查询结果按列转为指定类型的数组，日期列（字符串）使用 datetime64[us]
+    rows = conn.execute(sql, params).fetchall()
+    columns = list(zip(*rows)) if rows else [()] * len(dtypes)
+    return [np.array(values, dtype=dtype) for values, dtype in zip(columns, dtypes)]
+
+def _take(mask: np.ndarray, values: np.ndarray, index: np.ndarray, default) -> np.ndarray:
+    # mask 为真时取 values[index]，否则取 default；values 为空时 mask 必然全为假
+    if not len(values):
+        return np.broadcast_to(default, mask.shape).copy()
+    return np.where(mask, values[np.minimum(index, len(values) - 1)], default)
+
+def _group(project_ids: np.ndarray, owner: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # owner 按项目ID升序排列，返回每个项目在其中的起始位置和数量
+    first = np.searchsorted(owner, project_ids, side="left")
+    return first, np.searchsorted(owner, project_ids, side="right") - first
+
+def table_offsets(conn: sqlite3.Connection) -> Dict[str, int]:
+    """
+    读取各表当前的最大ID，新增的行从最大ID之后连续编号
+    """
+    tables = ("users", "team_members", "projects", "project_members", "sprints", "tasks", "task_status_events",
+              "cost_records", "cost_imports", "activities")
+    return {table: conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0] for table in tables}
+
+def _load_parents(
+    conn: sqlite3.Connection,
+    rng: np.random.Generator,
+    dist: Distributions,
+    offsets: Dict[str, int]
+) -> _Parents:
+    """
+    读取子表引用的父表：本次新增了行的表只引用新增的行，否则引用已有的全部行
+    """
+    def cut(table: str) -> int:
+        return offsets[table] if conn.execute(f"SELECT 1 FROM {table} WHERE id > ?", (offsets[table],)).fetchone() else 0
+
+    users, = _columns(conn, "SELECT id FROM users WHERE id > ? ORDER BY id", (cut("users"),), ("int64",))
+    members, = _columns(conn, "SELECT id FROM team_members WHERE id > ? ORDER BY id", (cut("team_members"),), ("int64",))
+    project_cut = cut("projects")
+    projects, project_start, project_end = _columns(
+        conn, "SELECT id, start_date, end_date FROM projects WHERE id > ? ORDER BY id", (project_cut,),
+        ("int64", "datetime64[us]", "datetime64[us]")
+    )
+    if np.isnat(project_start).any() or np.isnat(project_end).any():
+        raise ValueError("Projects without start_date or end_date cannot be used as parents")
+
+    # 按随机排名的 Zipf 权重，热门项目随机分布
+    ranks = rng.permutation(len(projects)) + 1
+    weights = 1.0 / ranks ** dist.project_skew
+
+    sprints, sprint_project, sprint_start, sprint_end, sprint_status = _columns(
+        conn, "SELECT id, project_id, start_date, end_date, status FROM sprints WHERE project_id > ? ORDER BY project_id, id",
+        (project_cut,), ("int64", "int64", "datetime64[us]", "datetime64[us]", "U32")
+    )
+    sprint_first, sprint_count = _group(projects, sprint_project)
+    pm_project, assignees = _columns(
+        conn, "SELECT project_id, member_id FROM project_members WHERE project_id > ? ORDER BY project_id, id",
+        (project_cut,), ("int64", "int64")
+    )
+    assignee_first, assignee_count = _group(projects, pm_project)
+    return _Parents(
+        users, members, projects, project_start, project_end, weights / weights.sum() if len(weights) else weights,
+        sprints, np.searchsorted(projects, sprint_project), sprint_start, sprint_end, sprint_status == "completed",
+        sprint_first, sprint_count, assignees, assignee_first, assignee_count
+    )
+
+def _seed_users(
+    conn: sqlite3.Connection,
+    rng: np.random.Generator,
+    dist: Distributions,
+    scale: Scale,
+    offsets: Dict[str, int],
+    admin: Tuple[str, str],
+    user_password: str
+) -> int:
+    """
+    写入管理员（不存在时）和普通用户，普通用户使用相同的密码哈希，返回写入的行数
+    """
+    first_id = next_id = offsets["users"] + 1
+    now = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S.%f")
+    username, admin_hash = admin
+    if not conn.execute("SELECT 1 FROM users WHERE username = ?", (username,)).fetchone():
+        conn.execute(
+            "INSERT INTO users (id, username, email, hashed_password, is_active, is_superuser, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, 1, 1, ?, ?)",
+            (next_id, username, f"{username}@example.com", admin_hash, now, now)
+        )
+        next_id += 1
+    ids = np.arange(next_id, next_id + scale.users)
+    created = _timestamps(np.datetime64(dist.start, "us") - _seconds(rng.integers(0, 365 * 86_400, scale.users)))
+    active = (rng.random(scale.users) >= dist.inactive_user_ratio).tolist()
+    _insert(conn, "users", ["id", "username", "email", "hashed_password", "is_active", "is_superuser", "created_at", "updated_at"],
+            zip(ids.tolist(), (f"user{i}" for i in ids.tolist()), (f"user{i}@example.com" for i in ids.tolist()),
+                (user_password for _ in range(scale.users)), active, (False for _ in range(scale.users)), created, created))
+    return next_id - first_id + scale.users
+
+def _seed_members(conn: sqlite3.Connection, rng: np.random.Generator, dist: Distributions, scale: Scale,
+                  offsets: Dict[str, int]) -> int:
+    n = scale.members
+    ids = np.arange(offsets["team_members"] + 1, offsets["team_members"] + n + 1)
+    start = np.datetime64(dist.start, "us")
+    join = start - rng.integers(0, 3 * 365, n) * np.timedelta64(1, "D")
+    leave = start + rng.integers(0, dist.days, n) * np.timedelta64(1, "D")
+    leave_text = [value if left else None
+                  for value, left in zip(_timestamps(leave), (rng.random(n) < dist.member_leave_ratio).tolist())]
+    roles, role_p = _weights(dist.roles, "roles")
+    join_text = _timestamps(join)
+    _insert(conn, "team_members", ["id", "name", "role", "monthly_salary", "join_date", "leave_date", "created_at"],
+            zip(ids.tolist(), (f"成员{i}" for i in ids.tolist()), rng.choice(roles, n, p=role_p).tolist(),
+                np.round(rng.uniform(*dist.salary, n), 2).tolist(), join_text, leave_text, join_text))
+    return n
+
+def _seed_projects(conn: sqlite3.Connection, rng: np.random.Generator, dist: Distributions, scale: Scale,
+                   offsets: Dict[str, int], members: np.ndarray) -> int:
+    """
+    写入项目、项目成员和迭代，返回写入的行数
+    """
+    n = scale.projects
+    ids = np.arange(offsets["projects"] + 1, offsets["projects"] + n + 1)
+    start = np.datetime64(dist.start, "us") + rng.integers(0, max(dist.days // 2, 1), n) * np.timedelta64(1, "D")
+    end = start + rng.integers(dist.project_days[0], dist.project_days[1] + 1, n) * np.timedelta64(1, "D")
+    start_text, end_text = _timestamps(start), _timestamps(end)
+    statuses, status_p = _weights(dist.project_statuses, "project_statuses")
+    _insert(conn, "projects",
+            ["id", "name", "description", "start_date", "end_date", "status", "fixed_cost_monthly", "created_at", "updated_at"],
+            zip(ids.tolist(), (f"项目{i}" for i in ids.tolist()), ("seed" for _ in range(n)), start_text, end_text,
+                rng.choice(statuses, n, p=status_p).tolist(), np.round(rng.uniform(*dist.project_fixed_cost, n), 2).tolist(),
+                start_text, start_text))
+
+    # 每个项目从随机位置起取连续的 k 个成员，同一项目内不重复
+    k = min(scale.members_per_project, len(members))
+    allocations, allocation_p = _weights(dist.allocations, "allocations")
+    if k:
+        member_index = (rng.integers(0, len(members), n)[:, None] + np.arange(k)) % len(members)
+        _insert(conn, "project_members", ["id", "project_id", "member_id", "allocation_percentage", "start_date"],
+                zip(range(offsets["project_members"] + 1, offsets["project_members"] + n * k + 1),
+                    np.repeat(ids, k).tolist(), members[member_index.ravel()].tolist(),
+                    rng.choice(allocations.astype(float), n * k, p=allocation_p).tolist(), np.repeat(start_text, k).tolist()))
+
+    # 每个项目的最后一个迭代覆盖项目结束日期与数据时间范围终点中较早的一天，之前的迭代依次向前排列：
+    # 在范围终点之前结束的已完成，覆盖范围终点的进行中
+    s = scale.sprints_per_project
+    range_end = np.datetime64(dist.start, "us") + np.timedelta64(dist.days, "D")
+    last_start = np.minimum(end, range_end) - rng.integers(0, dist.sprint_days, n) * np.timedelta64(1, "D")
+    offset = np.tile(np.arange(s), n)
+    sprint_start = np.repeat(last_start, s) - (s - 1 - offset) * np.timedelta64(dist.sprint_days, "D")
+    sprint_end = sprint_start + np.timedelta64(dist.sprint_days - 1, "D")
+    status = np.where(sprint_end < range_end, "completed", "active")
+    _insert(conn, "sprints", ["id", "project_id", "name", "start_date", "end_date", "status", "created_at"],
+            zip(range(offsets["sprints"] + 1, offsets["sprints"] + n * s + 1), np.repeat(ids, s).tolist(),
+                (f"迭代{i + 1}" for i in offset.tolist()), _timestamps(sprint_start), _timestamps(sprint_end),
+                status.tolist(), _timestamps(sprint_start)))
+    return n * (1 + k + s)
+
+def _status_paths(statuses: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    每个状态从 todo 开始的流转路径，返回补齐为矩阵的路径（状态编号）和路径长度
+    """
+    codes = {status: index for index, status in enumerate(statuses.tolist())}
+    paths = []
+    for status in statuses.tolist():
+        if status in TASK_FLOW:
+            path = TASK_FLOW[:TASK_FLOW.index(status) + 1]
+        else:
+            path = (TASK_FLOW[0], status)
+        paths.append([codes[step] for step in path if step in codes])
+    width = max(len(path) for path in paths)
+    table = np.array([path + [path[-1]] * (width - len(path)) for path in paths])
+    return table, np.array([len(path) for path in paths])
+
+def _seed_tasks(conn: sqlite3.Connection, rng: np.random.Generator, dist: Distributions, scale: Scale,
+                offsets: Dict[str, int], parents: _Parents, progress: Callable[[str], None]) -> Tuple[int, np.ndarray]:
+    """
+    写入任务及每个任务的状态流转事件，返回写入的行数和每个任务所属的项目ID
+    """
+    statuses, status_p = _weights(dist.task_statuses, "task_statuses")
+    if DONE_STATUS not in statuses:
+        statuses, status_p = np.append(statuses, DONE_STATUS), np.append(status_p, 0.0)
+    done_code = int(np.flatnonzero(statuses == DONE_STATUS)[0])
+    paths, path_length = _status_paths(statuses)
+    priorities, priority_p = _weights(dist.task_priorities, "task_priorities")
+    hours, hours_p = _weights(dist.task_hours, "task_hours")
+    hours = hours.astype(float)
+    status_list = statuses.tolist()
+    mean_gap = dist.status_change_hours * 3600
+
+    task_project = np.empty(scale.tasks, dtype=np.int64)
+    event_id = offsets["task_status_events"] + 1
+    events = 0
+    for ids in _batches(offsets["tasks"] + 1, scale.tasks):
+        n = len(ids)
+        p = rng.choice(len(parents.projects), n, p=parents.project_weights)
+        project = parents.projects[p]
+        task_project[ids[0] - offsets["tasks"] - 1:ids[-1] - offsets["tasks"]] = project
+
+        # 任务在所属迭代（或项目工期）内随机时间创建
+        in_sprint = (parents.sprint_count[p] > 0) & (rng.random(n) < dist.sprint_task_ratio)
+        sprint_index = parents.sprint_first[p] + (rng.random(n) * parents.sprint_count[p]).astype(np.int64)
+        window_start = _take(in_sprint, parents.sprint_start, sprint_index, parents.project_start[p])
+        window_end = _take(in_sprint, parents.sprint_end, sprint_index, parents.project_end[p])
+        span = (window_end - window_start).astype("timedelta64[s]").astype(np.int64)
+        created = window_start + _seconds(rng.random(n) * np.maximum(span, 1))
+
+        # 已完成迭代中的任务大多已完成
+        code = rng.choice(len(statuses), n, p=status_p)
+        closed = _take(in_sprint, parents.sprint_closed, sprint_index, False)
+        code = np.where(closed & (rng.random(n) < dist.closed_sprint_done_ratio), done_code, code)
+
+        estimated = rng.choice(hours, n, p=hours_p)
+        progress_ratio = np.where(code == done_code, rng.lognormal(0, 0.3, n),
+                                  np.where(code == paths[code, 0], 0.0, rng.random(n)))
+        actual = np.round(estimated * progress_ratio, 1)
+
+        # 状态事件：沿流转路径逐个状态，相邻事件间隔服从指数分布
+        steps = path_length[code]
+        owner = np.repeat(np.arange(n), steps)
+        step = np.arange(len(owner)) - np.repeat(np.cumsum(steps) - steps, steps)
+        gaps = np.where(step == 0, 0, rng.exponential(mean_gap, len(owner))).astype(np.int64)
+        elapsed = np.cumsum(gaps)
+        elapsed -= np.repeat(elapsed[np.cumsum(steps) - steps], steps)
+        at = created[owner] + _seconds(elapsed)
+        updated = at[np.cumsum(steps) - 1]
+
+        sprint = _take(in_sprint, parents.sprints, sprint_index, 0)
+        sprint_ids = [value if member else None for value, member in zip(sprint.tolist(), in_sprint.tolist())]
+        due = np.where(in_sprint, window_end, created + np.timedelta64(14, "D"))
+        # 优先分配给项目成员，项目没有成员时随机分配
+        assignee = None
+        if len(parents.members):
+            pick = parents.assignee_first[p] + (rng.random(n) * parents.assignee_count[p]).astype(np.int64)
+            assignee = _take(parents.assignee_count[p] > 0, parents.assignees, pick,
+                             parents.members[rng.integers(0, len(parents.members), n)])
+
+        created_text = _timestamps(created)
+        _insert(conn, "tasks",
+                ["id", "project_id", "sprint_id", "title", "description", "status", "priority", "assignee_id",
+                 "estimated_hours", "actual_hours", "due_date", "created_at", "updated_at"],
+                zip(ids.tolist(), project.tolist(), sprint_ids, (f"任务{i}" for i in ids.tolist()), ("seed" for _ in range(n)),
+                    statuses[code].tolist(), rng.choice(priorities, n, p=priority_p).tolist(),
+                    assignee.tolist() if assignee is not None else (None for _ in range(n)),
+                    estimated.tolist(), actual.tolist(), _timestamps(due), created_text, _timestamps(updated)))
+
+        to_code = paths[code[owner], step]
+        from_status = [status_list[value] if index else None
+                       for value, index in zip(paths[code[owner], np.maximum(step - 1, 0)].tolist(), step.tolist())]
+        event_sprints = [sprint_ids[index] for index in owner.tolist()]
+        _insert(conn, "task_status_events",
+                ["id", "task_id", "project_id", "sprint_id", "from_status", "to_status", "estimated_hours", "at"],
+                zip(range(event_id, event_id + len(owner)), ids[owner].tolist(), project[owner].tolist(), event_sprints,
+                    from_status, statuses[to_code].tolist(), estimated[owner].tolist(), _timestamps(at)))
+        event_id += len(owner)
+        events += len(owner)
+        progress(f"    tasks {ids[-1] - offsets['tasks']:,}/{scale.tasks:,}")
+
+    return scale.tasks + events, task_project
+
+def _summarize_tasks(conn: sqlite3.Connection, offsets: Dict[str, int]) -> int:
+    """
+    从任务表重建任务统计汇总，并按完成的预估工时计算本次写入任务的已完成迭代的速度
+
+    在任务表的索引重建之后执行，返回写入的汇总行数。
+    """
+    conn.execute("DELETE FROM project_task_stats")
+    rows = conn.execute(
+        "INSERT INTO project_task_stats (project_id, status, task_count, estimated_hours, actual_hours)"
+        " SELECT project_id, COALESCE(status, ''), COUNT(*), COALESCE(SUM(estimated_hours), 0), COALESCE(SUM(actual_hours), 0)"
+        " FROM tasks GROUP BY project_id, COALESCE(status, '')"
+    ).rowcount
+    conn.execute(
+        "UPDATE sprints SET velocity = COALESCE((SELECT SUM(estimated_hours) FROM tasks"
+        " WHERE tasks.sprint_id = sprints.id AND tasks.status = ?), 0)"
+        " WHERE status = 'completed' AND id IN (SELECT DISTINCT sprint_id FROM tasks WHERE id > ?)",
+        (DONE_STATUS, offsets["tasks"])
+    )
+    return rows
+
+def _seed_costs(conn: sqlite3.Connection, rng: np.random.Generator, dist: Distributions, scale: Scale,
+                offsets: Dict[str, int], parents: _Parents) -> int:
+    cost_types, cost_p = _weights(dist.cost_types, "cost_types")
+    for ids in _batches(offsets["cost_records"] + 1, scale.costs):
+        n = len(ids)
+        p = rng.choice(len(parents.projects), n, p=parents.project_weights)
+        # 成本记录落在项目工期内
+        span = (parents.project_end[p] - parents.project_start[p]).astype("timedelta64[s]").astype(np.int64)
+        recorded = _timestamps(parents.project_start[p] + _seconds(rng.random(n) * np.maximum(span, 1)))
+        _insert(conn, "cost_records", ["id", "project_id", "record_date", "cost_type", "amount", "description", "created_at"],
+                zip(ids.tolist(), parents.projects[p].tolist(), recorded, rng.choice(cost_types, n, p=cost_p).tolist(),
+                    np.round(rng.lognormal(*dist.cost_amount, n), 2).tolist(), ("seed" for _ in range(n)), recorded))
+    return scale.costs
+
+def _seed_cost_imports(conn: sqlite3.Connection, rng: np.random.Generator, dist: Distributions, scale: Scale,
+                       offsets: Dict[str, int], parents: _Parents) -> int:
+    n = scale.cost_imports
+    ids = np.arange(offsets["cost_imports"] + 1, offsets["cost_imports"] + n + 1)
+    statuses, status_p = _weights(dist.import_statuses, "import_statuses")
+    status = rng.choice(statuses, n, p=status_p)
+    total = rng.integers(dist.import_rows[0], dist.import_rows[1] + 1, n)
+    # 失败的导入在中途停止
+    processed = np.where(status == "failed", (total * rng.random(n)).astype(np.int64), total)
+    failed = rng.binomial(processed, 0.02)
+    created = np.datetime64(dist.start, "us") + _seconds(rng.integers(0, dist.days * 86_400, n))
+    finished = created + _seconds(rng.integers(1, 600, n))
+    errors = [
+        json.dumps([{"row": None, "error": "import interrupted"}] if value == "failed" else [], ensure_ascii=False)
+        for value in status.tolist()
+    ]
+    users = parents.users if len(parents.users) else np.array([None])
+    _insert(conn, "cost_imports",
+            ["id", "filename", "content_hash", "status", "total_rows", "processed_rows", "imported_rows", "failed_rows",
+             "errors", "created_by", "created_at", "finished_at"],
+            zip(ids.tolist(), (f"costs_{i}.csv" for i in ids.tolist()),
+                (hashlib.sha256(f"seed:{i}".encode()).hexdigest() for i in ids.tolist()), status.tolist(),
+                total.tolist(), processed.tolist(), (processed - failed).tolist(), failed.tolist(), errors,
+                users[rng.integers(0, len(users), n)].tolist(), _timestamps(created), _timestamps(finished)))
+    return n
+
+def _seed_activities(conn: sqlite3.Connection, rng: np.random.Generator, dist: Distributions, scale: Scale,
+                     offsets: Dict[str, int], parents: _Parents, task_ids: np.ndarray, task_project: np.ndarray) -> int:
+    """
+    写入活动：任务和迭代活动引用具体的任务和迭代，项目与之一致；没有可引用的任务或迭代时记为项目活动
+    """
+    types, type_p = _weights(dist.activity_types, "activity_types")
+    entity = np.char.partition(types, "_")[:, 0]
+    action = np.char.partition(types, "_")[:, 2]
+    users = parents.users if len(parents.users) else np.array([None])
+    for ids in _batches(offsets["activities"] + 1, scale.activities):
+        n = len(ids)
+        code = rng.choice(len(types), n, p=type_p)
+        kind = entity[code]
+        p = rng.choice(len(parents.projects), n, p=parents.project_weights)
+        project = parents.projects[p]
+        entity_id = project.copy()
+        if len(task_ids):
+            is_task = kind == "task"
+            pick = rng.integers(0, len(task_ids), n)
+            entity_id = np.where(is_task, task_ids[pick], entity_id)
+            project = np.where(is_task, task_project[pick], project)
+        else:
+            kind = np.where(kind == "task", "project", kind)
+        if len(parents.sprints):
+            is_sprint = kind == "sprint"
+            pick = rng.integers(0, len(parents.sprints), n)
+            entity_id = np.where(is_sprint, parents.sprints[pick], entity_id)
+            project = np.where(is_sprint, parents.projects[parents.sprint_project[pick]], project)
+        else:
+            kind = np.where(kind == "sprint", "project", kind)
+        kind_list, verbs, entity_ids = kind.tolist(), action[code].tolist(), entity_id.tolist()
+        content = [f"{ACTION_NAMES.get(verb, verb)}{ENTITY_NAMES.get(name, name)} #{value}"
+                   for verb, name, value in zip(verbs, kind_list, entity_ids)]
+        created = np.datetime64(dist.start, "us") + _seconds(rng.integers(0, dist.days * 86_400, n))
+        _insert(conn, "activities", ["id", "user_id", "type", "content", "project_id", "entity_type", "entity_id", "created_at"],
+                zip(ids.tolist(), users[rng.integers(0, len(users), n)].tolist(),
+                    [f"{name}_{verb}" for name, verb in zip(kind_list, verbs)], content, project.tolist(),
+                    kind_list, entity_ids, _timestamps(created)))
+    return scale.activities
+
+def _defer_indexes(conn: sqlite3.Connection, table: str, existing: int, added: int) -> List[str]:
+    """
+    新增行数不少于已有行数时删除表的二级索引并返回其建表语句
+
+    随机顺序逐行维护 B 树远慢于写入后一次排序建索引；已有数据很多而新增较少时重建反而更慢，保留索引。
+    """
+    if not added or added < existing:
+        return []
+    rows = conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (table,)
+    ).fetchall()
+    for name, _ in rows:
+        conn.execute(f'DROP INDEX "{name}"')
+    return [sql for _, sql in rows]
+
+def build_dataset(
+    db_path: str,
+    scale: Scale,
+    password_hash: Callable[[str], str],
+    dist: Distributions = Distributions(),
+    seed: int = 0,
+    admin: Tuple[str, str] = (BENCH_USERNAME, BENCH_USERNAME),
+    user_password: str = "password",
+    progress: Callable[[str], None] = print
+) -> Dict[str, int]:
+    """
+    向已迁移的数据库写入生成的数据
+
+    数据由随机种子和数据库中已有的数据确定，同一规模、分布和种子在相同的数据库上生成的数据完全相同。
+    新增的行从各表当前最大ID之后连续编号，可以向已有数据的数据库追加；子表只引用本次新增的父表行，
+    父表没有新增时引用已有的行（如只追加任务时分配给已有的项目和迭代）。
+    每个表在一个事务中批量写入，写入期间使用 SEED_PRAGMAS，大量写入时先删除二级索引、写入后重建。
+
+    Args:
+        db_path: 数据库文件路径
+        scale: 各表新增的行数
+        password_hash: 计算密码哈希的函数，只对管理员和普通用户各调用一次
+        dist: 数据分布
+        seed: 随机种子
+        admin: 管理员的用户名和密码，用户名已存在时不创建
+        user_password: 普通用户（user<ID>）共用的密码
+        progress: 进度输出
+
+    Returns:
+        Dict[str, int]: 步骤 -> 写入的行数
+
+    Raises:
+        ValueError: 分布无效，或需要引用的父表没有数据
+    """
+    rng = np.random.default_rng(seed)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        for pragma in SEED_PRAGMAS:
+            conn.execute(pragma)
+        offsets = table_offsets(conn)
+        if not scale.projects and not offsets["projects"] and (scale.tasks or scale.costs or scale.activities):
+            raise ValueError("Tasks, cost records and activities need at least one project")
+        written: Dict[str, int] = {}
+
+        def timed(name: str, step: Callable[[], int], tables: Sequence[str] = (), added: int = 0):
+            started = time.perf_counter()
+            conn.execute("BEGIN")
+            try:
+                indexes = [sql for table in tables for sql in _defer_indexes(conn, table, offsets[table], added)]
+                rows = step()
+                for sql in indexes:
+                    conn.execute(sql)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            elapsed = time.perf_counter() - started
+            written[name] = rows
+            progress(f"  {name}: {rows:,} rows in {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+
+        timed("users", lambda: _seed_users(
+            conn, rng, dist, scale, offsets, (admin[0], password_hash(admin[1])),
+            password_hash(user_password) if scale.users else ""
+        ))
+        timed("team_members", lambda: _seed_members(conn, rng, dist, scale, offsets))
+        members, = _columns(conn, "SELECT id FROM team_members WHERE id > ? ORDER BY id",
+                            (offsets["team_members"] if scale.members else 0,), ("int64",))
+        timed("projects", lambda: _seed_projects(conn, rng, dist, scale, offsets, members))
+        parents = _load_parents(conn, rng, dist, offsets)
+
+        task_project = np.zeros(0, dtype=np.int64)
+        if scale.tasks:
+            def tasks() -> int:
+                nonlocal task_project
+                rows, task_project = _seed_tasks(conn, rng, dist, scale, offsets, parents, progress)
+                return rows
+            timed("tasks", tasks, ("tasks", "task_status_events"), scale.tasks)
+            timed("project_task_stats", lambda: _summarize_tasks(conn, offsets))
+        task_ids = np.arange(offsets["tasks"] + 1, offsets["tasks"] + scale.tasks + 1)
+        if scale.costs:
+            timed("cost_records", lambda: _seed_costs(conn, rng, dist, scale, offsets, parents), ("cost_records",), scale.costs)
+        if scale.cost_imports:
+            timed("cost_imports", lambda: _seed_cost_imports(conn, rng, dist, scale, offsets, parents))
+        if scale.activities:
+            if not len(task_ids):
+                task_ids, task_project = _columns(conn, "SELECT id, project_id FROM tasks ORDER BY id", (), ("int64", "int64"))
+            timed("activities", lambda: _seed_activities(conn, rng, dist, scale, offsets, parents, task_ids, task_project),
+                  ("activities",), scale.activities)
+
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT INTO data_versions (name, version) VALUES (?, 1)"
+            " ON CONFLICT (name) DO UPDATE SET version = version + 1",
+            [(table,) for table in SEEDED_TABLES]
+        )
+        conn.execute("COMMIT")
+        # 只采样部分行收集统计信息，大表上也很快
+        conn.execute("PRAGMA analysis_limit=1000")
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA locking_mode=NORMAL")
+        conn.execute(f"PRAGMA journal_mode={journal_mode}")
+        return written
+    finally:
+        conn.close()
+
+def dataset_ids(db_path: str) -> Dict[str, int]:
+    """
+    读取各表的最大ID，压测在 1..最大ID 范围内随机取样
+
+    Args:
+        db_path: 数据库文件路径
+
+    Returns:
+        Dict[str, int]: 表名 -> 最大ID
+    """
+    conn = sqlite3.connect(db_path)
+    try:
+        return {
+            table: conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}").fetchone()[0]
+            for table in ("projects", "team_members", "sprints", "tasks", "cost_records", "activities")
+        }
+    finally:
+        conn.close()
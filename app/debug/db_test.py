@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from app.core.deps import get_db
+from app.db.session import SessionLocal
 from app.models import models
 import logging
 
@@ -17,7 +17,7 @@ def test_db_connection():
     3. 检查数据一致性
     """
     try:
-        db = next(get_db())
+        db = SessionLocal()
         logger.info("Database connection established")
         
         # 测试查询所有用户
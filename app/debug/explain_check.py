@@ -0,0 +1,269 @@
+import logging
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+# 配置日志
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 允许的全表扫描：(路由, 表名) -> 原因
+ALLOWED_SCANS: Dict[Tuple[str, str], str] = {
+    ("GET /api/v1/statistics", "projects"): "统计面板按项目状态计数，代价为 O(项目数)",
+    ("GET /api/v1/statistics", "project_task_stats"): "全局统计由汇总表按状态再汇总，代价为 O(项目数×状态数)",
+    ("GET /api/v1/costs/labor", "project_members"): "未指定项目时计算全部项目的人力成本，需要读取所有分配记录",
+    ("GET /api/v1/costs/monthly-series", "projects"): "未指定项目时读取所有项目的ID及固定成本计提参数，代价为 O(项目数)",
+    ("GET /api/v1/costs/fixed-accruals", "projects"): "未指定项目时计提全部项目的固定成本，代价为 O(项目数)",
+}
+
+# EXPLAIN QUERY PLAN 中表示扫描的行，如 "SCAN tasks"、"SCAN TABLE tasks"、"SCAN tasks USING INDEX ix"
+SCAN_PATTERN = re.compile(r"^SCAN (?:TABLE )?(\w+)")
+
+class StatementRecorder:
+    """
+    记录各路由执行过的SQL语句及其参数
+    """
+
+    def __init__(self):
+        self.route: Optional[str] = None
+        self.statements: Dict[Tuple[str, str], tuple] = {}
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if executemany or self.route is None:
+            return
+        if statement.lstrip().split(None, 1)[0].upper() in ("SELECT", "UPDATE", "DELETE"):
+            self.statements.setdefault((self.route, statement), tuple(parameters or ()))
+
+def find_scans(db_path: str, recorder: StatementRecorder) -> List[str]:
+    """
+    对记录的每条语句执行 EXPLAIN QUERY PLAN，返回不被允许的全表扫描
+
+    Args:
+        db_path: 数据库文件路径
+        recorder: 语句记录器
+
+    Returns:
+        List[str]: 违规说明列表
+    """
+    violations = []
+    conn = sqlite3.connect(db_path)
+    try:
+        for (route, statement), parameters in recorder.statements.items():
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            # 不带过滤条件的分页列表必然顺序读取，由 LIMIT 限定读取行数
+            normalized = " ".join(statement.upper().split())
+            bounded_listing = " WHERE " not in normalized and " LIMIT " in normalized
+            for row in plan:
+                match = SCAN_PATTERN.match(row[-1])
+                if not match or bounded_listing:
+                    continue
+                table = match.group(1)
+                if (route, table) in ALLOWED_SCANS:
+                    continue
+                violations.append(f"{route}: {row[-1]}\n    {' '.join(statement.split())}")
+    finally:
+        conn.close()
+    return violations
+
+def exercise_routes(client, recorder: StatementRecorder) -> set:
+    """
+    依次调用所有接口，覆盖每条路由的查询
+
+    Args:
+        client: 测试客户端
+        recorder: 语句记录器
+
+    Returns:
+        set: 已覆盖的 "方法 路由" 集合
+    """
+    from app.core.middleware import SQL_BUDGET_HEADER
+    from app.crud.pagination import NEXT_CURSOR_HEADER
+
+    covered = set()
+    headers = {}
+
+    def call(method: str, template: str, expected: int = 200, **kwargs):
+        path_params = kwargs.pop("path", {})
+        recorder.route = f"{method} {template}"
+        covered.add(recorder.route)
+        response = client.request(method, template.format(**path_params), headers=headers, **kwargs)
+        recorder.route = None
+        if response.status_code != expected:
+            raise RuntimeError(f"{method} {template} -> {response.status_code}: {response.text}")
+        # 写请求超出语句预算时不返回 500，只带响应头
+        if SQL_BUDGET_HEADER in response.headers:
+            raise RuntimeError(f"{method} {template}: SQL statement budget exceeded ({response.headers[SQL_BUDGET_HEADER]})")
+        return response
+
+    api = "/api/v1"
+    call("POST", f"{api}/auth/register", json={
+        "username": "explain", "email": "explain@example.com", "password": "explain", "is_superuser": True
+    })
+    token = call("POST", f"{api}/auth/login", data={"username": "explain", "password": "explain"}).json()
+    headers["Authorization"] = f"Bearer {token['access_token']}"
+    call("GET", f"{api}/auth/me")
+    call("GET", f"{api}/auth/cache-stats")
+    call("GET", f"{api}/activities/journal-stats")
+    call("GET", f"{api}/admin/sql-profile")
+    call("DELETE", f"{api}/admin/sql-profile")
+
+    project_body = {
+        "name": "Explain", "description": "explain check", "start_date": "2024-01-01T00:00:00",
+        "end_date": "2024-12-31T00:00:00", "status": "PLANNING", "fixed_cost_monthly": 100.0
+    }
+    project = call("POST", f"{api}/projects/", json=project_body).json()
+    call("POST", f"{api}/projects/", json={**project_body, "name": "Explain 2"})
+    pid = project["id"]
+    member = call("POST", f"{api}/team-members/", expected=201, json={
+        "name": "Explain", "role": "dev", "monthly_salary": 1000.0
+    }).json()
+    mid = member["id"]
+    call("POST", f"{api}/team-members/project-members/", json={
+        "project_id": pid, "member_id": mid, "allocation_percentage": 50.0, "start_date": "2024-01-01T00:00:00"
+    })
+    sprint_body = {
+        "name": "Sprint", "start_date": "2024-01-01T00:00:00", "end_date": "2024-01-14T00:00:00",
+        "status": "active", "project_id": pid
+    }
+    sprint = call("POST", f"{api}/sprints/", json=sprint_body).json()
+    sid = sprint["id"]
+    task_body = {
+        "title": "Task", "status": "todo", "priority": "high", "project_id": pid,
+        "assignee_id": mid, "estimated_hours": 2.0, "sprint_id": sid
+    }
+    task = call("POST", f"{api}/tasks/", json=task_body).json()
+    call("POST", f"{api}/tasks/", json={**task_body, "title": "Task 2"})
+    tid = task["id"]
+    cost_body = {"project_id": pid, "record_date": "2024-02-01T00:00:00", "cost_type": "fixed", "amount": 10.0}
+    cost = call("POST", f"{api}/costs/", json=cost_body).json()
+    cid = cost["id"]
+    call("POST", f"{api}/activities/", json={"type": "note", "content": "explain", "user_id": 1})
+    csv_body = f"project_id,record_date,cost_type,amount\n{pid},2024-03-01,human,5\n{pid},bad,fixed,1\n"
+    job = call("POST", f"{api}/costs/import", expected=202,
+               files={"file": ("costs.csv", csv_body.encode(), "text/csv")}).json()
+    call("GET", f"{api}/costs/imports/{{import_id}}", path={"import_id": job["id"]})
+
+    # 列表接口：首页、偏移分页、游标分页
+    for template in ["/projects/", "/sprints/", "/team-members/", "/costs/", "/activities/", "/tasks/"]:
+        first = call("GET", f"{api}{template}", params={"limit": 1})
+        call("GET", f"{api}{template}", params={"limit": 1, "skip": 1})
+        if NEXT_CURSOR_HEADER in first.headers:
+            call("GET", f"{api}{template}", params={"limit": 1, "cursor": first.headers[NEXT_CURSOR_HEADER]})
+    first = call("GET", f"{api}/tasks/", params={"project_id": pid, "limit": 1})
+    call("GET", f"{api}/tasks/", params={"project_id": pid, "limit": 1, "cursor": first.headers[NEXT_CURSOR_HEADER]})
+
+    call("GET", f"{api}/projects/{{project_id}}", path={"project_id": pid})
+    call("GET", f"{api}/projects/{{project_id}}/stats", path={"project_id": pid})
+    call("GET", f"{api}/projects/{{project_id}}/overview", path={"project_id": pid})
+    first = call("GET", f"{api}/projects/{{project_id}}/activities", path={"project_id": pid}, params={"limit": 1})
+    call("GET", f"{api}/projects/{{project_id}}/activities", path={"project_id": pid},
+         params={"limit": 1, "cursor": first.headers[NEXT_CURSOR_HEADER]})
+    call("GET", f"{api}/sprints/{{sprint_id}}", path={"sprint_id": sid})
+    call("GET", f"{api}/sprints/project/{{project_id}}", path={"project_id": pid})
+    call("GET", f"{api}/tasks/{{task_id}}", path={"task_id": tid})
+    call("GET", f"{api}/tasks/sprint/{{sprint_id}}", path={"sprint_id": sid})
+    call("GET", f"{api}/team-members/{{team_member_id}}", path={"team_member_id": mid})
+    call("GET", f"{api}/team-members/project-members/{{project_id}}", path={"project_id": pid})
+    call("GET", f"{api}/costs/{{cost_id}}", path={"cost_id": cid})
+    call("GET", f"{api}/costs/project/{{project_id}}", path={"project_id": pid})
+    call("GET", f"{api}/costs/project/{{project_id}}/monthly", path={"project_id": pid},
+         params={"year": 2024, "month": 2})
+    call("GET", f"{api}/costs/project/{{project_id}}/stats", path={"project_id": pid})
+    # 第一次全部查询，第二次已结束月份命中缓存，只查询当月
+    current_month = datetime.utcnow().strftime("%Y-%m")
+    for _ in range(2):
+        call("GET", f"{api}/costs/monthly-series", params={"start": "2024-01", "end": current_month})
+    call("GET", f"{api}/costs/monthly-series", params={"start": "2024-01", "end": "2024-06", "project_ids": [pid]})
+    call("GET", f"{api}/costs/labor", params={"start_date": "2024-01-01T00:00:00", "end_date": "2025-01-01T00:00:00"})
+    call("GET", f"{api}/costs/fixed-accruals", params={"start_date": "2024-01-01T00:00:00", "end_date": "2025-01-01T00:00:00"})
+    call("GET", f"{api}/costs/fixed-accruals", params={
+        "start_date": "2024-01-01T00:00:00", "end_date": "2024-02-01T00:00:00", "project_ids": [pid], "granularity": "day"
+    })
+    call("GET", f"{api}/costs/labor", params={
+        "start_date": "2024-01-01T00:00:00", "end_date": "2024-02-01T00:00:00", "project_ids": [pid],
+        "granularity": "day", "by_member": True
+    })
+    call("GET", f"{api}/statistics")
+    for template in ["/export/tasks", "/export/costs", "/export/activities"]:
+        call("GET", f"{api}{template}", params={"project_id": pid, "start_date": "2024-01-01T00:00:00"})
+    call("GET", f"{api}/export/costs", params={"project_id": pid, "format": "xlsx"})
+
+    call("PUT", f"{api}/projects/{{project_id}}", path={"project_id": pid}, json={**project_body, "name": "Renamed"})
+    call("PUT", f"{api}/sprints/{{sprint_id}}", path={"sprint_id": sid}, json={**sprint_body, "name": "Renamed"})
+    call("PUT", f"{api}/tasks/{{task_id}}", path={"task_id": tid}, json={**task_body, "status": "done"})
+    call("PUT", f"{api}/team-members/{{team_member_id}}", path={"team_member_id": mid}, json={"role": "lead"})
+    call("PUT", f"{api}/costs/{{cost_id}}", path={"cost_id": cid}, json={**cost_body, "amount": 20.0})
+
+    bulk = call("POST", f"{api}/tasks/bulk", json={"items": [task_body, {**task_body, "title": "Bulk 2"}]}).json()
+    bulk_ids = [result["id"] for result in bulk["results"]]
+    call("PATCH", f"{api}/tasks/bulk", json={"items": [
+        {"id": bulk_ids[0], "status": "done"}, {"id": bulk_ids[1], "priority": "low", "sprint_id": None}
+    ]})
+    # 任务状态已变更，范围覆盖今天，使周期时间读取完成任务的历史
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    for scope in [{"project_id": pid}, {"sprint_id": sid}]:
+        range_params = {
+            **scope, "start_date": (today - timedelta(days=30)).isoformat(), "end_date": (today + timedelta(days=1)).isoformat()
+        }
+        call("GET", f"{api}/analytics/cumulative-flow", params=range_params)
+        call("GET", f"{api}/analytics/cycle-time", params=range_params)
+    call("GET", f"{api}/sprints/{{sprint_id}}/burndown", path={"sprint_id": sid})
+    # 关闭迭代时自动计算速度
+    call("PUT", f"{api}/sprints/{{sprint_id}}", path={"sprint_id": sid}, json={**sprint_body, "status": "completed"})
+    call("GET", f"{api}/sprints/project/{{project_id}}/velocity", path={"project_id": pid})
+    call("DELETE", f"{api}/tasks/bulk", json={"ids": bulk_ids})
+
+    call("DELETE", f"{api}/tasks/{{task_id}}", path={"task_id": tid})
+    call("DELETE", f"{api}/costs/{{cost_id}}", path={"cost_id": cid})
+    call("DELETE", f"{api}/sprints/{{sprint_id}}", path={"sprint_id": sid})
+    call("DELETE", f"{api}/team-members/{{team_member_id}}", path={"team_member_id": mid}, expected=204)
+    call("DELETE", f"{api}/projects/{{project_id}}", path={"project_id": pid})
+    return covered
+
+def run_check() -> int:
+    """
+    在临时数据库上调用所有接口，检查其查询是否存在全表扫描
+
+    Returns:
+        int: 退出码，存在违规时为 1
+    """
+    db_dir = tempfile.mkdtemp(prefix="explain_check_")
+    db_path = os.path.join(db_dir, "explain_check.db")
+    # 必须在导入应用之前设置，使应用连接到临时数据库
+    os.environ["SQLITE_URL"] = f"sqlite:///{db_path}"
+    # 测试模式：语句数超出 SQL_STATEMENT_BUDGET 的只读请求返回 500，写请求带响应头，检查随之失败
+    os.environ["SQL_BUDGET_ENFORCE"] = "true"
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+
+    from app.db.session import async_engine, async_read_engine
+    from app.main import app
+
+    recorder = StatementRecorder()
+    for engine in (async_engine, async_read_engine):
+        event.listen(engine.sync_engine, "before_cursor_execute", recorder)
+
+    with TestClient(app) as client:
+        covered = exercise_routes(client, recorder)
+
+    routes = {
+        f"{method.upper()} {path}"
+        for path, operations in app.openapi()["paths"].items()
+        for method in operations
+    }
+    for route in sorted(routes - covered):
+        logger.warning(f"未覆盖的路由: {route}")
+
+    violations = find_scans(db_path, recorder)
+    logger.info(f"已检查 {len(recorder.statements)} 条语句，覆盖 {len(covered & routes)}/{len(routes)} 条路由")
+    for violation in violations:
+        logger.error(f"全表扫描: {violation}")
+    return 1 if violations else 0
+
+if __name__ == "__main__":
+    sys.exit(run_check())
@@ -0,0 +1,126 @@
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List
+
+def seed(db_path: str, n_tasks: int, n_projects: int = 20, n_members: int = 50) -> None:
+    """
+    向临时数据库批量写入项目、成员和任务
+    """
+    now = datetime(2024, 1, 1)
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executemany(
+            "INSERT INTO projects (id, name, description, start_date, end_date, status, fixed_cost_monthly, created_at, updated_at)"
+            " VALUES (?, ?, ?, ?, ?, 'IN_PROGRESS', 1000.0, ?, ?)",
+            [(i, f"项目{i}", "benchmark", now, now + timedelta(days=365), now, now) for i in range(1, n_projects + 1)]
+        )
+        conn.executemany(
+            "INSERT INTO team_members (id, name, role, monthly_salary, join_date, created_at) VALUES (?, ?, 'dev', 20000.0, ?, ?)",
+            [(i, f"成员{i}", now, now) for i in range(1, n_members + 1)]
+        )
+        conn.executemany(
+            "INSERT INTO tasks (id, project_id, title, description, status, priority, assignee_id, estimated_hours,"
+            " actual_hours, due_date, created_at, updated_at) VALUES (?, ?, ?, ?, 'todo', 'high', ?, 8.0, 2.5, ?, ?, ?)",
+            [
+                (i, i % n_projects + 1, f"任务{i}", "benchmark task", i % n_members + 1,
+                 now + timedelta(days=i % 90), now + timedelta(seconds=i), now + timedelta(seconds=i, microseconds=1))
+                for i in range(1, n_tasks + 1)
+            ]
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+async def orm_pipeline(db, limit: int) -> bytes:
+    """
+    原实现：ORM 对象 + joinedload，经 pydantic from_attributes 校验，再由标准库 json 编码
+    """
+    from pydantic import TypeAdapter
+    from sqlalchemy import select
+    from sqlalchemy.orm import joinedload
+
+    from app.models import Task
+    from app.schemas import schemas
+
+    result = await db.execute(
+        select(Task).options(joinedload(Task.project), joinedload(Task.assignee)).order_by(Task.id).limit(limit)
+    )
+    tasks = result.scalars().all()
+    adapter = TypeAdapter(List[schemas.Task])
+    content = adapter.dump_python(adapter.validate_python(tasks, from_attributes=True), mode="json")
+    # 与 FastAPI JSONResponse 的编码参数一致
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+async def fast_pipeline(db, limit: int) -> bytes:
+    """
+    快速路径：按列读取元组，直接组装字典，由 orjson 编码
+    """
+    from app.core.responses import FastJSONResponse
+    from app.crud import task
+
+    result = await db.execute(task.task_list_query().order_by(task.TASK_ORDER[0]).limit(limit))
+    return FastJSONResponse(task.task_list_items(result.all())).body
+
+async def measure(pipeline: Callable, limit: int, repeat: int) -> Dict[str, float]:
+    """
+    重复执行一条流水线，返回最快一次的耗时与每秒行数
+    """
+    from app.db.session import AsyncReadSessionLocal
+
+    timings = []
+    for _ in range(repeat):
+        async with AsyncReadSessionLocal() as db:
+            started = time.perf_counter()
+            body = await pipeline(db, limit)
+            timings.append(time.perf_counter() - started)
+    best = min(timings)
+    return {"seconds": best, "rows_per_second": limit / best, "bytes": len(body)}
+
+def run_bench(rows: int, repeat: int) -> int:
+    """
+    对比任务列表原实现与快速路径的吞吐量
+
+    Returns:
+        int: 退出码，两条流水线输出不一致时为 1
+    """
+    db_dir = tempfile.mkdtemp(prefix="list_bench_")
+    db_path = os.path.join(db_dir, "list_bench.db")
+    # 必须在导入应用之前设置，使应用连接到临时数据库
+    os.environ["SQLITE_URL"] = f"sqlite:///{db_path}"
+
+    from app.db.migrate import upgrade_database
+    from app.db.session import async_read_engine
+
+    upgrade_database()
+    seed(db_path, rows)
+
+    async def main() -> int:
+        from app.db.session import AsyncReadSessionLocal
+
+        async with AsyncReadSessionLocal() as db:
+            same = json.loads(await orm_pipeline(db, rows)) == json.loads(await fast_pipeline(db, rows))
+        before = await measure(orm_pipeline, rows, repeat)
+        after = await measure(fast_pipeline, rows, repeat)
+        await async_read_engine.dispose()
+
+        print(f"任务列表 {rows} 行，各执行 {repeat} 次取最快一次")
+        for name, stats in (("ORM + pydantic + json", before), ("列元组 + orjson", after)):
+            print(f"  {name:<22} {stats['seconds'] * 1000:8.1f} ms  {stats['rows_per_second']:10.0f} 行/秒  {stats['bytes']} 字节")
+        print(f"  加速 {before['seconds'] / after['seconds']:.1f} 倍，输出{'一致' if same else '不一致'}")
+        return 0 if same else 1
+
+    return asyncio.run(main())
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="任务列表序列化吞吐量基准")
+    parser.add_argument("--rows", type=int, default=5000, help="任务行数")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数")
+    args = parser.parse_args()
+    sys.exit(run_bench(args.rows, args.repeat))
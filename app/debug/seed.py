@@ -0,0 +1,71 @@
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+from app.debug.dataset import Distributions, Scale, build_dataset, load_distributions, table_offsets
+
+def seed_database(args: argparse.Namespace) -> int:
+    """
+    迁移数据库并写入生成的测试数据
+
+    Returns:
+        int: 退出码，数据库已有数据而未指定 --append、分布无效或缺少父表数据时为 1
+    """
+    if args.db:
+        # 必须在导入配置之前设置
+        os.environ["SQLITE_URL"] = f"sqlite:///{os.path.abspath(args.db)}"
+
+    from sqlalchemy.engine import make_url
+
+    from app.core.config import settings
+    from app.core.security import get_password_hash
+    from app.db.migrate import upgrade_database
+
+    db_path = make_url(settings.SQLITE_URL_WITH_ABS_PATH).database
+    try:
+        dist = load_distributions(args.distributions) if args.distributions else Distributions()
+    except ValueError as exc:
+        print(f"数据分布无效: {exc}")
+        return 1
+    scale = Scale(**{field: getattr(args, field) for field in Scale._fields})
+
+    upgrade_database()
+    conn = sqlite3.connect(db_path)
+    try:
+        existing = {table: rows for table, rows in table_offsets(conn).items() if rows}
+    finally:
+        conn.close()
+    if existing and not args.append:
+        print(f"数据库 {db_path} 已有数据（{', '.join(existing)}），追加数据请使用 --append")
+        return 1
+
+    print(f"{'追加' if existing else '生成'}数据 {db_path}: {dict(scale._asdict())}")
+    started = time.perf_counter()
+    try:
+        written = build_dataset(
+            db_path, scale, get_password_hash, dist=dist, seed=args.seed,
+            admin=(args.admin_username, args.admin_password), user_password=args.user_password
+        )
+    except ValueError as exc:
+        print(f"生成失败: {exc}")
+        return 1
+    elapsed = time.perf_counter() - started
+    total = sum(written.values())
+    print(f"共写入 {total:,} 行，用时 {elapsed:.1f}s（{total / elapsed:,.0f} 行/秒）")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="生成测试数据")
+    parser.add_argument("--db", help="数据库文件（默认使用配置中的 SQLITE_URL）")
+    parser.add_argument("--append", action="store_true", help="向已有数据的数据库追加")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    parser.add_argument("--distributions", help="数据分布 JSON 文件，覆盖 Distributions 中的字段")
+    for field, default in Scale._field_defaults.items():
+        parser.add_argument(f"--{field.replace('_', '-')}", dest=field, type=int, default=default)
+    parser.add_argument("--admin-username", default="admin", help="管理员用户名，已存在时不创建")
+    parser.add_argument("--admin-password", default="admin123", help="管理员密码")
+    parser.add_argument("--user-password", default="password", help="普通用户 user<ID> 共用的密码")
+    args = parser.parse_args()
+    sys.exit(seed_database(args))
@@ -2,12 +2,21 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.db.session import engine
-from app.models import models
-from app.core.middleware import public_routes_middleware
+from app.db.migrate import upgrade_database
+from app.db.session import async_engine, async_read_engine
+from app.core.middleware import public_routes_middleware, sql_timing_middleware
+from app.core.activity_journal import activity_journal
+from app.core.password_executor import password_executor
+from app.core.etag import NotModified, not_modified_handler
+from app.core.metrics import MetricsMiddleware
+from app.crud.pagination import NEXT_CURSOR_HEADER
+from app.db.sql_profile import configure_slow_query_log
 
-# 创建数据库表
-models.Base.metadata.create_all(bind=engine)
+# 将数据库结构迁移到最新版本
+upgrade_database()
+
+# 慢查询日志写入 SQL_SLOW_QUERY_LOG_FILE（如已配置）
+configure_slow_query_log()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -22,15 +31,42 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
+# 条件请求命中时返回不带响应体的 304
+app.add_exception_handler(NotModified, not_modified_handler)
+
 # 添加公开路由中间件
 app.middleware("http")(public_routes_middleware)
 
+# 统计每个请求的 SQL 语句数和耗时，写入 Server-Timing 响应头
+app.middleware("http")(sql_timing_middleware)
+
+# 请求耗时与状态码指标；最后添加，位于最外层，耗时包含其它中间件
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # 导入路由
 from app.api.v1 import api_router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+if settings.METRICS_ENABLED:
+    from app.api import metrics
+    app.include_router(metrics.router)
+
+@app.on_event("startup")
+async def start_background_tasks():
+    activity_journal.start()
+
+@app.on_event("shutdown")
+async def shutdown_resources():
+    # 先写入缓冲中的活动记录，再释放连接池
+    await activity_journal.stop()
+    password_executor.shutdown()
+    await async_engine.dispose()
+    await async_read_engine.dispose()
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to Project Management System"} 
\ No newline at end of file
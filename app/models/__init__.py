@@ -6,7 +6,11 @@ from .models import (
     ProjectMember,
     Task,
     CostRecord,
-    Activity
+    CostImport,
+    Activity,
+    ProjectTaskStats,
+    TaskStatusEvent,
+    DataVersion
 )
 
 __all__ = [
@@ -17,5 +21,9 @@ __all__ = [
     'ProjectMember',
     'Task',
     'CostRecord',
-    'Activity'
+    'CostImport',
+    'Activity',
+    'ProjectTaskStats',
+    'TaskStatusEvent',
+    'DataVersion'
 ] 
\ No newline at end of file
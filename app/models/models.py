@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, DateTime, Float, Text
+from sqlalchemy import Boolean, Column, ForeignKey, Index, Integer, String, DateTime, Float, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
 from passlib.context import CryptContext
@@ -59,7 +59,7 @@ class Sprint(Base):
     __tablename__ = "sprints"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"))
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
     name = Column(String)
     start_date = Column(DateTime)
     end_date = Column(DateTime)
@@ -88,8 +88,8 @@ class ProjectMember(Base):
     __tablename__ = "project_members"
 
     id = Column(Integer, primary_key=True, index=True)
-    project_id = Column(Integer, ForeignKey("projects.id"))
-    member_id = Column(Integer, ForeignKey("team_members.id"))
+    project_id = Column(Integer, ForeignKey("projects.id"), index=True)
+    member_id = Column(Integer, ForeignKey("team_members.id"), index=True)
     allocation_percentage = Column(Float)
     start_date = Column(DateTime)
     end_date = Column(DateTime, nullable=True)
@@ -102,12 +102,12 @@ class Task(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
-    sprint_id = Column(Integer, ForeignKey("sprints.id"))
+    sprint_id = Column(Integer, ForeignKey("sprints.id"), index=True)
     title = Column(String)
     description = Column(Text)
     status = Column(String)
     priority = Column(String)
-    assignee_id = Column(Integer, ForeignKey("team_members.id"))
+    assignee_id = Column(Integer, ForeignKey("team_members.id"), index=True)
     estimated_hours = Column(Float, default=0.0)
     actual_hours = Column(Float, default=0.0)
     due_date = Column(DateTime)
@@ -118,6 +118,13 @@ class Task(Base):
     sprint = relationship("Sprint", back_populates="tasks")
     assignee = relationship("TeamMember", back_populates="tasks")
 
+    __table_args__ = (
+        # 按项目分页读取任务：WHERE project_id = ? AND id > ? ORDER BY id
+        Index("ix_tasks_project_id_id", "project_id", "id"),
+        # 按项目、状态汇总任务（统计重建、项目看板）
+        Index("ix_tasks_project_id_status", "project_id", "status"),
+    )
+
 class CostRecord(Base):
     __tablename__ = "cost_records"
 
@@ -131,6 +138,33 @@ class CostRecord(Base):
 
     project = relationship("Project", back_populates="costs")
 
+    __table_args__ = (
+        # 按项目、日期范围和成本类型查询/汇总成本
+        Index("ix_cost_records_project_id_record_date_cost_type", "project_id", "record_date", "cost_type"),
+    )
+
+class CostImport(Base):
+    """
+    成本记录导入批次
+
+    以文件内容的 SHA-256 去重：同一文件已导入或正在导入时拒绝再次导入；
+    导入中断（failed）后重新上传同一文件，从 processed_rows 之后继续导入。
+    """
+    __tablename__ = "cost_imports"
+
+    id = Column(Integer, primary_key=True, index=True)
+    filename = Column(String)
+    content_hash = Column(String, unique=True, index=True)
+    status = Column(String)  # pending/running/completed/failed
+    total_rows = Column(Integer, default=0)  # 已读取的数据行数
+    processed_rows = Column(Integer, default=0)  # 已提交的数据行数（含校验失败的行）
+    imported_rows = Column(Integer, default=0)
+    failed_rows = Column(Integer, default=0)
+    errors = Column(Text)  # 行级错误（JSON，最多保留 IMPORT_MAX_ERRORS 条）
+    created_by = Column(Integer, ForeignKey("users.id"))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime)
+
 class Activity(Base):
     __tablename__ = "activities"
 
@@ -138,6 +172,72 @@ class Activity(Base):
     user_id = Column(Integer, ForeignKey("users.id"))
     type = Column(String)  # 活动类型：task_created, task_updated, project_created 等
     content = Column(String)  # 活动内容
+    project_id = Column(Integer, ForeignKey("projects.id"))  # 活动所属项目
+    entity_type = Column(String)  # 活动对象类型：project, sprint, task
+    entity_id = Column(Integer)  # 活动对象ID
     created_at = Column(DateTime, default=datetime.utcnow)
     
-    user = relationship("User", back_populates="activities") 
\ No newline at end of file
+    user = relationship("User", back_populates="activities")
+
+    __table_args__ = (
+        # 活动流按 (created_at, id) 倒序做 keyset 分页
+        Index("ix_activities_created_at_id", "created_at", "id"),
+        # 项目活动流按项目范围扫描，索引隐含 rowid，可直接按 (created_at, id) 倒序读取
+        Index("ix_activities_project_id_created_at", "project_id", "created_at"),
+    )
+
+class ProjectTaskStats(Base):
+    """
+    项目任务统计汇总表
+
+    按 (项目, 任务状态) 预先汇总任务数量和工时，随任务写入在同一事务中增量维护，
+    供统计面板直接读取。全局统计由本表按状态再汇总得到。
+    """
+    __tablename__ = "project_task_stats"
+
+    project_id = Column(Integer, ForeignKey("projects.id"), primary_key=True)
+    status = Column(String, primary_key=True)
+    task_count = Column(Integer, nullable=False, default=0)
+    estimated_hours = Column(Float, nullable=False, default=0.0)
+    actual_hours = Column(Float, nullable=False, default=0.0)
+
+class TaskStatusEvent(Base):
+    """
+    任务状态变更事件（只追加）
+
+    任务创建、状态变更、删除，以及移入移出项目或迭代时各写入一条，与任务写入在同一事务中提交。
+    from_status 为空表示任务进入该范围（创建或移入），to_status 为空表示离开（删除或移出）。
+    project_id、sprint_id 为事件发生时任务所属的项目和迭代，累积流图、周期时间按此范围统计。
+    estimated_hours 为事件发生时任务的预估工时，燃尽图按此计算；只修改预估工时时也写入一条
+    from_status 与 to_status 相同的事件。
+    """
+    __tablename__ = "task_status_events"
+
+    id = Column(Integer, primary_key=True)
+    task_id = Column(Integer, nullable=False)  # 不设外键：任务删除后仍保留历史
+    project_id = Column(Integer)
+    sprint_id = Column(Integer)
+    from_status = Column(String)
+    to_status = Column(String)
+    estimated_hours = Column(Float)
+    at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        # 按项目、迭代的时间范围读取事件（累积流图、周期时间）
+        Index("ix_task_status_events_project_id_at", "project_id", "at"),
+        Index("ix_task_status_events_sprint_id_at", "sprint_id", "at"),
+        # 读取指定任务的完整历史（周期时间需要任务开始处理的时间）
+        Index("ix_task_status_events_task_id_at", "task_id", "at"),
+    )
+
+class DataVersion(Base):
+    """
+    数据表版本号
+
+    每个写事务提交前，对本事务修改过的表各递增一次版本号（与修改在同一事务中提交），
+    读接口以相关表的版本号生成 ETag，不需要读取数据行即可判断内容是否变化。
+    """
+    __tablename__ = "data_versions"
+
+    name = Column(String, primary_key=True)  # 表名
+    version = Column(Integer, nullable=False, default=0)
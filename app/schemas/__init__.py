@@ -19,10 +19,27 @@ from .schemas import (
     ProjectMemberCreate,
     Task,
     TaskCreate,
+    TaskBulkCreate,
+    TaskBulkUpdateItem,
+    TaskBulkUpdate,
+    TaskBulkDelete,
+    TaskBulkItemResult,
+    TaskBulkResult,
     CostRecord,
     CostRecordCreate,
+    CostMonthlyTotal,
+    CostAccrualItem,
+    CostAccrualReport,
+    CostImportError,
+    CostImport,
     Activity,
-    ActivityCreate
+    ActivityCreate,
+    CumulativeFlow,
+    DurationStats,
+    CycleTimeReport,
+    SprintBurndown,
+    SprintVelocityItem,
+    SprintVelocityReport
 )
 
 __all__ = [
@@ -46,8 +63,25 @@ __all__ = [
     'ProjectMemberCreate',
     'Task',
     'TaskCreate',
+    'TaskBulkCreate',
+    'TaskBulkUpdateItem',
+    'TaskBulkUpdate',
+    'TaskBulkDelete',
+    'TaskBulkItemResult',
+    'TaskBulkResult',
     'CostRecord',
     'CostRecordCreate',
+    'CostMonthlyTotal',
+    'CostAccrualItem',
+    'CostAccrualReport',
+    'CostImportError',
+    'CostImport',
     'Activity',
-    'ActivityCreate'
+    'ActivityCreate',
+    'CumulativeFlow',
+    'DurationStats',
+    'CycleTimeReport',
+    'SprintBurndown',
+    'SprintVelocityItem',
+    'SprintVelocityReport'
 ] 
\ No newline at end of file
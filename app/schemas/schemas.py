@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+import json
+from pydantic import BaseModel, EmailStr, Field
+from typing import Dict, Optional, List
 from datetime import datetime
 from pydantic import validator
 
@@ -137,6 +138,39 @@ class Task(TaskBase):
     class Config:
         from_attributes = True
 
+# 批量任务操作单次最多处理的条目数
+TASK_BULK_MAX_ITEMS = 1000
+
+class TaskBulkCreate(BaseModel):
+    items: List[TaskCreate] = Field(..., min_length=1, max_length=TASK_BULK_MAX_ITEMS)
+
+class TaskBulkUpdateItem(BaseModel):
+    """
+    批量修改任务的单条内容，只修改请求中出现的字段
+    """
+    id: int
+    status: Optional[str] = None
+    priority: Optional[str] = None
+    sprint_id: Optional[int] = None
+    assignee_id: Optional[int] = None
+
+class TaskBulkUpdate(BaseModel):
+    items: List[TaskBulkUpdateItem] = Field(..., min_length=1, max_length=TASK_BULK_MAX_ITEMS)
+
+class TaskBulkDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=TASK_BULK_MAX_ITEMS)
+
+class TaskBulkItemResult(BaseModel):
+    index: int  # 条目在请求中的位置
+    id: Optional[int] = None
+    status: str  # created, updated, deleted, failed
+    detail: Optional[str] = None
+
+class TaskBulkResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[TaskBulkItemResult]
+
 # CostRecord schemas
 class CostRecordBase(BaseModel):
     record_date: datetime
@@ -155,6 +189,50 @@ class CostRecord(CostRecordBase):
     class Config:
         from_attributes = True
 
+class CostMonthlyTotal(BaseModel):
+    month: str  # YYYY-MM
+    fixed: float  # 含计提的固定成本
+    fixed_accrued: float  # 按项目 fixed_cost_monthly 计提的部分
+    human: float
+    other: float
+    total: float
+
+class CostAccrualItem(BaseModel):
+    project_id: int
+    member_id: Optional[int] = None  # 按成员分组时为成员ID
+    total: float
+    amounts: List[float]  # 与 periods 一一对应
+
+class CostAccrualReport(BaseModel):
+    granularity: str
+    periods: List[str]  # YYYY-MM 或 YYYY-MM-DD
+    items: List[CostAccrualItem]
+
+class CostImportError(BaseModel):
+    row: Optional[int] = None  # 数据行序号（不含表头和空行），为空表示整个批次的错误
+    error: str
+
+class CostImport(BaseModel):
+    id: int
+    filename: Optional[str] = None
+    status: str
+    total_rows: int
+    processed_rows: int
+    imported_rows: int
+    failed_rows: int
+    errors: List[CostImportError] = []
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    @validator('errors', pre=True)
+    def parse_errors(cls, v):
+        if isinstance(v, str):
+            return json.loads(v)
+        return v or []
+
+    class Config:
+        from_attributes = True
+
 # User schemas
 class UserBase(BaseModel):
     """
@@ -254,6 +332,9 @@ class UserUpdatePassword(BaseModel):
 class ActivityBase(BaseModel):
     type: str
     content: str
+    project_id: Optional[int] = None
+    entity_type: Optional[str] = None
+    entity_id: Optional[int] = None
 
 class ActivityCreate(ActivityBase):
     user_id: int
@@ -264,4 +345,42 @@ class Activity(ActivityBase):
     created_at: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+class CumulativeFlow(BaseModel):
+    dates: List[str]  # YYYY-MM-DD
+    statuses: List[str]
+    counts: Dict[str, List[int]]  # 状态 -> 每天结束时的任务数，与 dates 一一对应
+
+class DurationStats(BaseModel):
+    mean: Optional[float] = None  # 天
+    p50: Optional[float] = None
+    p75: Optional[float] = None
+    p85: Optional[float] = None
+    p95: Optional[float] = None
+
+class CycleTimeReport(BaseModel):
+    count: int  # 范围内完成的任务数
+    cycle_time: DurationStats
+    lead_time: DurationStats
+
+class SprintBurndown(BaseModel):
+    sprint_id: int
+    dates: List[str]  # YYYY-MM-DD，迭代开始到结束（含）
+    remaining: List[Optional[float]]  # 每天结束时的剩余预估工时，未到的日期为 null
+    completed: List[Optional[float]]  # 每天结束时已完成的预估工时
+    ideal: List[float]  # 理想燃尽线
+    committed: float  # 迭代开始时的剩余预估工时
+    velocity: Optional[float] = None  # 迭代关闭时为完成的预估工时
+
+class SprintVelocityItem(BaseModel):
+    sprint_id: int
+    name: str
+    start_date: datetime
+    end_date: datetime
+    committed: float
+    completed: float
+
+class SprintVelocityReport(BaseModel):
+    project_id: int
+    sprints: List[SprintVelocityItem]
+    average: Optional[float] = None
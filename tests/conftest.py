@@ -0,0 +1,60 @@
+import os
+import tempfile
+
+# 必须在导入应用配置之前设置：测试使用独立的临时数据库，bcrypt 使用最低成本
+_db_dir = tempfile.mkdtemp(prefix="pm-test-")
+os.environ["SQLITE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+API = "/api/v1"
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture(scope="session")
+def auth_headers(client: TestClient) -> Dict[str, str]:
+    client.post(f"{API}/auth/register", json={
+        "username": "tester", "email": "tester@example.com", "password": "secret", "is_superuser": True
+    })
+    response = client.post(f"{API}/auth/login", data={"username": "tester", "password": "secret"})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+@pytest.fixture
+def create(client: TestClient, auth_headers: Dict[str, str]) -> Callable[..., Dict[str, Any]]:
+    """
+    通过接口创建记录，返回响应内容
+
+    create("projects") 等使用合理的默认字段，关键字参数覆盖默认值。
+    """
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    defaults = {
+        "projects": {
+            "name": "项目", "description": "测试", "status": "IN_PROGRESS", "fixed_cost_monthly": 0,
+            "start_date": (today - timedelta(days=60)).isoformat(), "end_date": (today + timedelta(days=60)).isoformat()
+        },
+        "team-members": {
+            "name": "成员", "role": "dev", "monthly_salary": 3000, "join_date": (today - timedelta(days=90)).isoformat()
+        },
+        "sprints": {
+            "name": "迭代", "status": "active",
+            "start_date": (today - timedelta(days=2)).isoformat(), "end_date": (today + timedelta(days=5)).isoformat()
+        },
+        "tasks": {"title": "任务", "status": "TODO", "priority": "MEDIUM", "estimated_hours": 8}
+    }
+
+    def _create(path: str, **fields: Any) -> Dict[str, Any]:
+        response = client.post(f"{API}/{path}/", headers=auth_headers, json={**defaults.get(path, {}), **fields})
+        assert response.status_code in (200, 201), response.text
+        return response.json()
+    return _create
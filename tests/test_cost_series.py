@@ -0,0 +1,62 @@
+import sqlite3
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+from app.core.cost_cache import monthly_cost_cache
+
+from conftest import API
+
+def _series(client, auth_headers, project_id):
+    response = client.get(f"{API}/costs/monthly-series", headers=auth_headers,
+                          params={"start": "2024-03", "end": "2024-03", "project_ids": [project_id]})
+    assert response.status_code == 200, response.text
+    return response.json()[0]
+
+def test_closed_months_refresh_after_write_outside_this_process(client, auth_headers, create):
+    project = create("projects", start_date="2024-01-01T00:00:00")
+    create("costs", project_id=project["id"], record_date="2024-03-10T00:00:00", cost_type="other", amount=100)
+
+    assert _series(client, auth_headers, project["id"])["other"] == 100
+    hits = monthly_cost_cache.stats()["hits"]
+    assert _series(client, auth_headers, project["id"])["other"] == 100
+    assert monthly_cost_cache.stats()["hits"] > hits
+
+    # 模拟其他进程的写入：不经过本进程的会话事件，只递增持久化的版本号（与会话提交时相同）
+    conn = sqlite3.connect(make_url(settings.SQLITE_URL_WITH_ABS_PATH).database)
+    with conn:
+        conn.execute(
+            "INSERT INTO cost_records (project_id, record_date, cost_type, amount, created_at)"
+            " VALUES (?, '2024-03-20 00:00:00', 'other', 50, CURRENT_TIMESTAMP)", (project["id"],)
+        )
+        conn.execute(
+            "INSERT INTO data_versions (name, version) VALUES ('cost_records', 1)"
+            " ON CONFLICT (name) DO UPDATE SET version = version + 1"
+        )
+    conn.close()
+    assert _series(client, auth_headers, project["id"])["other"] == 150
+
+def test_fixed_accrual_stops_today_in_stats_and_series(client, auth_headers, create):
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    project = create("projects", fixed_cost_monthly=3000,
+                     start_date=(today - timedelta(days=90)).isoformat(),
+                     end_date=(today + timedelta(days=90)).isoformat())
+    create("costs", project_id=project["id"], record_date=today.isoformat(), cost_type="fixed", amount=500)
+
+    response = client.get(f"{API}/costs/project/{project['id']}/stats", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    stats = response.json()
+    assert stats["fixed_recorded"] == 500
+    assert stats["fixed"] == pytest.approx(stats["fixed_recorded"] + stats["fixed_accrued"])
+
+    response = client.get(f"{API}/costs/monthly-series", headers=auth_headers, params={
+        "start": (today - timedelta(days=90)).strftime("%Y-%m"),
+        "end": (today + timedelta(days=90)).strftime("%Y-%m"),
+        "project_ids": [project["id"]]
+    })
+    assert response.status_code == 200, response.text
+    series = response.json()
+    assert sum(row["fixed_accrued"] for row in series) == pytest.approx(stats["fixed_accrued"], abs=0.05)
+    assert all(row["fixed_accrued"] == 0 for row in series if row["month"] > today.strftime("%Y-%m"))
@@ -0,0 +1,56 @@
+from app.core.etag import _matches
+
+from conftest import API
+
+def _get(client, auth_headers, path, etag=None, **params):
+    headers = {**auth_headers, "If-None-Match": etag} if etag else auth_headers
+    return client.get(f"{API}/{path}", headers=headers, params=params)
+
+def test_if_none_match_comparison():
+    assert _matches('"a"', '"a"')
+    assert _matches('W/"a"', '"a"')
+    assert _matches('"b", W/"a"', '"a"')
+    assert _matches("*", '"a"')
+    assert not _matches('"b"', '"a"')
+
+def test_revalidation_returns_304_until_a_dependent_table_changes(client, auth_headers, create):
+    project = create("projects")
+    path = f"projects/{project['id']}"
+
+    response = _get(client, auth_headers, path)
+    assert response.status_code == 200, response.text
+    etag = response.headers["ETag"]
+    assert response.headers["Cache-Control"] == "private, no-cache"
+
+    response = _get(client, auth_headers, path, etag)
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+    # 与响应无关的表变化不影响 ETag
+    create("team-members")
+    assert _get(client, auth_headers, path, etag).status_code == 304
+
+    body = {key: project[key] for key in ("name", "description", "start_date", "end_date", "status", "fixed_cost_monthly")}
+    response = client.put(f"{API}/{path}", headers=auth_headers, json={**body, "name": "改名"})
+    assert response.status_code == 200, response.text
+
+    response = _get(client, auth_headers, path, etag)
+    assert response.status_code == 200
+    assert response.json()["name"] == "改名"
+    assert response.headers["ETag"] != etag
+    assert _get(client, auth_headers, path, response.headers["ETag"]).status_code == 304
+
+def test_etag_depends_on_query_and_every_listed_table(client, auth_headers, create):
+    project = create("projects")
+    first = _get(client, auth_headers, "projects/", limit=1).headers["ETag"]
+    second = _get(client, auth_headers, "projects/", limit=2).headers["ETag"]
+    assert first != second
+    assert _get(client, auth_headers, "projects/", second, limit=1).status_code == 200
+
+    # 项目统计依赖成本记录：新增成本后重新返回内容
+    path = f"projects/{project['id']}/stats"
+    etag = _get(client, auth_headers, path).headers["ETag"]
+    assert _get(client, auth_headers, path, etag).status_code == 304
+    create("costs", project_id=project["id"], record_date="2024-03-10T00:00:00", cost_type="other", amount=10)
+    assert _get(client, auth_headers, path, etag).status_code == 200
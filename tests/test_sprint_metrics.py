@@ -0,0 +1,135 @@
+import asyncio
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.core.sprint_cache import sprint_burndown_cache
+from app.crud import sprint_metrics
+from app.models import models
+
+from conftest import API
+
+def _burndown(client, auth_headers, sprint_id):
+    response = client.get(f"{API}/sprints/{sprint_id}/burndown", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def _today(burndown, series):
+    return burndown[series][burndown["dates"].index(str(datetime.utcnow().date()))]
+
+def test_burndown_with_frontend_statuses(client, auth_headers, create):
+    project = create("projects")
+    member = create("team-members")
+    sprint = create("sprints", project_id=project["id"])
+    task = create("tasks", project_id=project["id"], sprint_id=sprint["id"], assignee_id=member["id"],
+                  status="TODO", estimated_hours=8)
+    create("tasks", project_id=project["id"], sprint_id=sprint["id"], assignee_id=member["id"],
+           status="IN_PROGRESS", estimated_hours=5)
+    assert _today(_burndown(client, auth_headers, sprint["id"]), "remaining") == 13
+
+    body = {key: task[key] for key in ("title", "priority", "project_id", "sprint_id", "assignee_id", "estimated_hours")}
+    response = client.put(f"{API}/tasks/{task['id']}", headers=auth_headers, json={**body, "status": "DONE"})
+    assert response.status_code == 200, response.text
+
+    burndown = _burndown(client, auth_headers, sprint["id"])
+    assert _today(burndown, "remaining") == 5
+    assert _today(burndown, "completed") == 8
+
+    response = client.put(f"{API}/sprints/{sprint['id']}", headers=auth_headers, json={
+        key: sprint[key] for key in ("name", "start_date", "end_date", "project_id")
+    } | {"status": "COMPLETED"})
+    assert response.status_code == 200, response.text
+    assert response.json()["velocity"] == 8
+
+def test_velocity_of_uncommitted_close_is_not_cached(client, auth_headers, create):
+    project = create("projects")
+    member = create("team-members")
+    sprint = create("sprints", project_id=project["id"])
+    create("tasks", project_id=project["id"], sprint_id=sprint["id"], assignee_id=member["id"],
+           status="DONE", estimated_hours=3)
+
+    async def close_and_roll_back():
+        # 独立的引擎：应用连接池中的连接属于测试客户端的事件循环
+        engine = create_async_engine(settings.ASYNC_SQLITE_URL)
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as db:
+                db_sprint = await db.get(models.Sprint, sprint["id"])
+                db_sprint.status = "completed"
+                velocity = await sprint_metrics.sprint_velocity(db, db_sprint)
+                await db.rollback()
+            return velocity
+        finally:
+            await engine.dispose()
+
+    sprint_burndown_cache.clear()
+    assert asyncio.run(close_and_roll_back()) == 3
+    assert sprint_burndown_cache.get(sprint["id"]) is None
+    # 回滚后迭代仍在进行中
+    burndown = _burndown(client, auth_headers, sprint["id"])
+    assert burndown["velocity"] is None
+    assert sprint_burndown_cache.get(sprint["id"]).closed is False
+
+def _empty_state(n_days):
+    return sprint_metrics.BurndownState(
+        first=np.datetime64("2024-01-01", "D"), n_days=n_days, closed=False, last_event_id=0,
+        remaining=np.zeros(n_days + 1), completed=np.zeros(n_days + 1), tasks={}
+    )
+
+def test_incremental_events_match_full_recompute():
+    # (事件ID, 任务ID, 新状态, 时间, 预估工时)
+    rows = [
+        (1, 1, "TODO", datetime(2024, 1, 1, 9), 8.0),
+        (2, 2, "IN_PROGRESS", datetime(2024, 1, 1, 10), 5.0),
+        (3, 1, "TODO", datetime(2024, 1, 2, 9), 6.0),      # 只改预估工时
+        (4, 1, "DONE", datetime(2024, 1, 3, 9), 6.0),
+        (5, 2, None, datetime(2024, 1, 3, 10), 5.0),       # 移出迭代
+        (6, 3, "todo", datetime(2024, 1, 4, 9), 3.0),
+    ]
+    full = sprint_metrics._apply_events(_empty_state(5), rows)
+    assert np.cumsum(full.remaining)[1:].tolist() == [13, 11, 0, 3, 3]
+    assert np.cumsum(full.completed)[1:].tolist() == [0, 0, 6, 6, 6]
+    assert full.last_event_id == 6
+
+    for split in range(1, len(rows)):
+        state = sprint_metrics._apply_events(_empty_state(5), rows[:split])
+        state = sprint_metrics._apply_events(state, rows[split:])
+        assert state.remaining.tolist() == full.remaining.tolist()
+        assert state.completed.tolist() == full.completed.tolist()
+        assert state.tasks == full.tasks
+        assert state.last_event_id == full.last_event_id
+
+def test_cached_burndown_matches_recompute_after_edits(client, auth_headers, create):
+    project = create("projects")
+    member = create("team-members")
+    sprint = create("sprints", project_id=project["id"])
+    other = create("sprints", project_id=project["id"])
+    tasks = [
+        create("tasks", project_id=project["id"], sprint_id=sprint["id"], assignee_id=member["id"],
+               estimated_hours=hours)
+        for hours in (8, 5, 3)
+    ]
+    _burndown(client, auth_headers, sprint["id"])
+
+    def edit(task, **fields):
+        body = {key: task[key] for key in (
+            "title", "status", "priority", "project_id", "sprint_id", "assignee_id", "estimated_hours"
+        )}
+        response = client.put(f"{API}/tasks/{task['id']}", headers=auth_headers, json={**body, **fields})
+        assert response.status_code == 200, response.text
+        # 每次修改后读取，缓存中的状态按新增事件增量更新
+        return _burndown(client, auth_headers, sprint["id"])
+
+    edit(tasks[0], estimated_hours=6)
+    edit(tasks[1], status="DONE")
+    edit(tasks[2], sprint_id=other["id"])
+    assert client.delete(f"{API}/tasks/{tasks[0]['id']}", headers=auth_headers).status_code == 200
+    create("tasks", project_id=project["id"], sprint_id=sprint["id"], assignee_id=member["id"], estimated_hours=2)
+    incremental = _burndown(client, auth_headers, sprint["id"])
+    assert sprint_burndown_cache.get(sprint["id"]).last_event_id > 0
+
+    sprint_burndown_cache.clear()
+    assert _burndown(client, auth_headers, sprint["id"]) == incremental
+    assert _today(incremental, "remaining") == 2
+    assert _today(incremental, "completed") == 5
@@ -0,0 +1,44 @@
+import pytest
+
+from app.core.config import settings
+from app.core.middleware import SQL_BUDGET_HEADER
+
+from conftest import API
+
+@pytest.fixture
+def tight_budget(monkeypatch):
+    # 预算为 0：任何执行了语句的请求都超出预算
+    monkeypatch.setattr(settings, "SQL_STATEMENT_BUDGET", 0)
+    monkeypatch.setattr(settings, "SQL_BUDGET_ENFORCE", True)
+
+def test_within_budget_has_no_header(client, auth_headers):
+    response = client.get(f"{API}/projects/", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert SQL_BUDGET_HEADER not in response.headers
+    assert "queries" in response.headers["Server-Timing"]
+
+def test_over_budget_read_fails_in_test_mode(client, auth_headers, tight_budget):
+    response = client.get(f"{API}/projects/", headers=auth_headers)
+    assert response.status_code == 500
+    assert "SQL statement budget exceeded" in response.json()["detail"]
+    count, budget = response.headers[SQL_BUDGET_HEADER].split("/")
+    assert int(count) > 0 and int(budget) == 0
+
+def test_over_budget_read_is_only_flagged_outside_test_mode(client, auth_headers, monkeypatch):
+    monkeypatch.setattr(settings, "SQL_STATEMENT_BUDGET", 0)
+    response = client.get(f"{API}/projects/", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert SQL_BUDGET_HEADER in response.headers
+
+def test_over_budget_write_keeps_committed_response(client, auth_headers, tight_budget, monkeypatch):
+    # 写请求已提交，不替换为 500，只以响应头标记
+    response = client.post(f"{API}/team-members/", headers=auth_headers, json={
+        "name": "预算", "role": "dev", "monthly_salary": 3000, "join_date": "2024-01-01T00:00:00"
+    })
+    assert response.status_code == 201, response.text
+    assert SQL_BUDGET_HEADER in response.headers
+
+    monkeypatch.setattr(settings, "SQL_BUDGET_ENFORCE", False)
+    response = client.get(f"{API}/team-members/{response.json()['id']}", headers=auth_headers)
+    assert response.status_code == 200, response.text
+    assert response.json()["name"] == "预算"
@@ -0,0 +1,78 @@
+from conftest import API
+
+MISSING_ID = 999999
+
+def _results(response):
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["succeeded"] + report["failed"] == len(report["results"])
+    return [(item["index"], item["status"], item["detail"]) for item in report["results"]], report["results"]
+
+def _get(client, auth_headers, task_id):
+    return client.get(f"{API}/tasks/{task_id}", headers=auth_headers)
+
+def test_bulk_create_reports_each_item(client, auth_headers, create):
+    project = create("projects")
+    member = create("team-members")
+    sprint = create("sprints", project_id=project["id"])
+    item = {"status": "TODO", "priority": "LOW", "project_id": project["id"], "assignee_id": member["id"]}
+    items = [
+        {**item, "title": "a"},
+        {**item, "title": "b", "project_id": MISSING_ID},
+        {**item, "title": "c", "assignee_id": MISSING_ID},
+        {**item, "title": "d", "sprint_id": MISSING_ID},
+        {**item, "title": "e", "sprint_id": sprint["id"]},
+    ]
+    summary, results = _results(client.post(f"{API}/tasks/bulk", headers=auth_headers, json={"items": items}))
+    assert summary == [
+        (0, "created", None),
+        (1, "failed", "Project not found"),
+        (2, "failed", "Assignee not found"),
+        (3, "failed", "Sprint not found"),
+        (4, "created", None),
+    ]
+    # 每条返回的 id 对应该条自己的内容
+    for result in results:
+        if result["status"] == "created":
+            task = _get(client, auth_headers, result["id"]).json()
+            assert task["title"] == items[result["index"]]["title"]
+    assert results[1]["id"] is None
+
+def test_bulk_update_and_delete_report_each_item(client, auth_headers, create):
+    project = create("projects")
+    member = create("team-members")
+    first, second = (create("tasks", project_id=project["id"], assignee_id=member["id"]) for _ in range(2))
+
+    items = [
+        {"id": first["id"], "status": "DONE"},
+        {"id": first["id"], "priority": "HIGH"},
+        {"id": MISSING_ID, "status": "DONE"},
+        {"id": second["id"], "status": None},
+        {"id": second["id"], "sprint_id": MISSING_ID},
+        {"id": second["id"], "priority": "HIGH", "sprint_id": None},
+    ]
+    summary, _ = _results(client.patch(f"{API}/tasks/bulk", headers=auth_headers, json={"items": items}))
+    assert summary == [
+        (0, "updated", None),
+        (1, "failed", "Duplicate task id"),
+        (2, "failed", "Task not found"),
+        (3, "failed", "status cannot be null"),
+        (4, "failed", "Sprint not found"),
+        (5, "updated", None),
+    ]
+    # 失败的条目不生效，成功的条目只修改出现的字段
+    assert _get(client, auth_headers, first["id"]).json()["status"] == "DONE"
+    assert _get(client, auth_headers, first["id"]).json()["priority"] == first["priority"]
+    assert _get(client, auth_headers, second["id"]).json()["status"] == second["status"]
+    assert _get(client, auth_headers, second["id"]).json()["priority"] == "HIGH"
+
+    ids = [first["id"], MISSING_ID, first["id"], second["id"]]
+    summary, _ = _results(client.request("DELETE", f"{API}/tasks/bulk", headers=auth_headers, json={"ids": ids}))
+    assert summary == [
+        (0, "deleted", None),
+        (1, "failed", "Task not found"),
+        (2, "failed", "Duplicate task id"),
+        (3, "deleted", None),
+    ]
+    assert _get(client, auth_headers, first["id"]).status_code == 404
+    assert _get(client, auth_headers, second["id"]).status_code == 404
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+
+from app.crud.task_events import TaskScope, is_done, normalize_status, status_events
+
+from conftest import API
+
+def _range(days_back: int = 1, days_ahead: int = 2):
+    today = datetime.utcnow().date()
+    return {"start_date": str(today - timedelta(days=days_back)), "end_date": str(today + timedelta(days=days_ahead))}
+
+def test_status_helpers_ignore_case():
+    assert is_done("DONE") and is_done("done") and is_done("Completed")
+    assert not is_done("IN_PROGRESS") and not is_done(None)
+    assert normalize_status("TODO") == "todo"
+    assert normalize_status(None) == ""
+
+def test_analytics_with_frontend_statuses(client, auth_headers, create):
+    # 前端写入的状态为大写：'TODO'、'IN_PROGRESS'、'DONE'
+    project = create("projects")
+    member = create("team-members")
+    task = create("tasks", project_id=project["id"], assignee_id=member["id"], status="TODO")
+    body = {key: task[key] for key in ("title", "priority", "project_id", "assignee_id", "estimated_hours")}
+    for status in ("IN_PROGRESS", "DONE"):
+        response = client.put(f"{API}/tasks/{task['id']}", headers=auth_headers, json={**body, "status": status})
+        assert response.status_code == 200, response.text
+
+    response = client.get(f"{API}/analytics/cycle-time", headers=auth_headers,
+                          params={"project_id": project["id"], **_range()})
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["count"] == 1
+    # TODO 不算开始处理，周期时间存在且不超过前置时间
+    assert report["cycle_time"]["mean"] is not None
+    assert report["cycle_time"]["mean"] <= report["lead_time"]["mean"]
+
+    response = client.get(f"{API}/analytics/cumulative-flow", headers=auth_headers,
+                          params={"project_id": project["id"], **_range()})
+    assert response.status_code == 200, response.text
+    flow = response.json()
+    # 按 STATUS_ORDER 排序，而不是按名称（名称排序时 DONE 会排在最前）
+    assert flow["statuses"] == ["TODO", "IN_PROGRESS", "DONE"]
+    assert flow["counts"]["DONE"][-1] == 1
+
+def test_status_events_for_scope_and_hours_changes():
+    at = datetime(2024, 1, 1)
+    before = TaskScope(task_id=1, project_id=1, sprint_id=10, status="TODO", estimated_hours=8.0)
+
+    # 未变化：不生成事件
+    assert status_events(before, before, at) == []
+
+    # 只改预估工时：一条前后状态相同的事件，记录新的工时
+    [event] = status_events(before, before._replace(estimated_hours=5.0), at)
+    assert (event["from_status"], event["to_status"], event["estimated_hours"]) == ("TODO", "TODO", 5.0)
+    assert (event["project_id"], event["sprint_id"]) == (1, 10)
+
+    # 换迭代：原迭代生成离开事件，新迭代生成进入事件，状态不变
+    leave, enter = status_events(before, before._replace(sprint_id=11), at)
+    assert (leave["sprint_id"], leave["from_status"], leave["to_status"]) == (10, "TODO", None)
+    assert (enter["sprint_id"], enter["from_status"], enter["to_status"]) == (11, None, "TODO")
+
+    # 换项目（同时移出迭代）：同样拆成离开和进入
+    leave, enter = status_events(before, before._replace(project_id=2, sprint_id=None), at)
+    assert (leave["project_id"], leave["sprint_id"], leave["to_status"]) == (1, 10, None)
+    assert (enter["project_id"], enter["sprint_id"], enter["to_status"]) == (2, None, "TODO")
+
+def test_moving_task_between_sprints_updates_both_flows(client, auth_headers, create):
+    project = create("projects")
+    member = create("team-members")
+    first = create("sprints", project_id=project["id"])
+    second = create("sprints", project_id=project["id"])
+    task = create("tasks", project_id=project["id"], assignee_id=member["id"], sprint_id=first["id"])
+    body = {key: task[key] for key in ("title", "status", "priority", "project_id", "assignee_id", "estimated_hours")}
+    response = client.put(f"{API}/tasks/{task['id']}", headers=auth_headers, json={**body, "sprint_id": second["id"]})
+    assert response.status_code == 200, response.text
+
+    def todo_today(sprint_id):
+        response = client.get(f"{API}/analytics/cumulative-flow", headers=auth_headers,
+                              params={"sprint_id": sprint_id, **_range()})
+        assert response.status_code == 200, response.text
+        return response.json()["counts"].get("TODO", [0])[-1]
+
+    assert todo_today(first["id"]) == 0
+    assert todo_today(second["id"]) == 1